@@ -1,11 +1,11 @@
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-import numpy as np
+from games.aquecimento import iniciar_aquecimento
 
 st.set_page_config(page_title='Portfólio Profissional', page_icon='🎮', layout='wide')
 
+# Primeira visita ao servidor: a análise de dados começa a ser preparada em segundo plano
+iniciar_aquecimento()
+
 st.sidebar.title("Navegação")
 
 st.title('🎮 Portfólio Profissional - Rafael Oliveira')
@@ -82,6 +82,9 @@ with tabs[2]:
         'Metodologias Ágeis': 60
     }
 
+    # Só esta aba desenha gráficos, e plotly.graph_objects basta (sem plotly.express, pandas e numpy)
+    import plotly.graph_objects as go
+
     col1, col2 = st.columns(2)
 
     # Radar Chart
@@ -106,22 +109,18 @@ with tabs[2]:
 
     # Gráfico de Barras
     with col2:
-        df_skills = pd.DataFrame({
-            'Skill': list(skills.keys()),
-            'Nível': list(skills.values())
-        })
-        fig_bar = px.bar(
-            df_skills,
-            x='Skill',
-            y='Nível',
-            text='Nível',
-            color='Skill',
-            color_discrete_sequence=['#636EFA', '#EF553B', '#00CC96', '#AB63FA']
-        )
+        cores = ['#636EFA', '#EF553B', '#00CC96', '#AB63FA']
+        fig_bar = go.Figure([
+            go.Bar(x=[skill], y=[nivel], text=[nivel], name=skill, marker_color=cores[i % len(cores)])
+            for i, (skill, nivel) in enumerate(skills.items())
+        ])
         fig_bar.update_traces(textposition='outside')
         fig_bar.update_layout(
             title='Comparação de Habilidades',
-            yaxis=dict(range=[0, 100]),
+            xaxis_title='Skill',
+            yaxis=dict(range=[0, 100], title='Nível'),
+            legend_title_text='Skill',
+            barmode='relative',
             template='plotly_dark'
         )
         st.plotly_chart(fig_bar, use_container_width=True)
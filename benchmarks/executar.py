@@ -0,0 +1,231 @@
+# Suíte de desempenho sobre bases sintéticas (benchmarks/sintetico.py): tempos de load_data, máscara
+# dos filtros, materialização do df_f e de cada análise da página, com o Streamlit substituído por um
+# módulo que não desenha nada. Cada tamanho roda em um processo novo, com diretório de cache próprio.
+#
+#   python benchmarks/executar.py                        # 10k e 1M, tabela no terminal
+#   python benchmarks/executar.py 10k 1M 10M --json resultado.json
+#   python benchmarks/executar.py --comparar resultado.json   # sai com código 1 se algo regrediu
+import argparse
+import json
+import os
+import platform
+import runpy
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+import sintetico  # noqa: E402
+
+PAGINA = os.path.join(RAIZ, 'pages', '1_📊_Analise_de_Dados.py')
+ANALISES = [
+    'tendencia_lancamentos', 'generos_populares', 'lancamentos_plataformas', 'vendas_globais',
+    'mais_vendidos_por_grupo', 'vendas_regiao', 'correlacao_notas', 'discrepancias_criticos_usuarios',
+    'vendas_classificacao_etaria', 'publicadoras_desenvolvedoras',
+    'medidas_centrais',
+    'teste_acao_vs_rpg', 'teste_jogos_antigos_vs_atuais', 'comparacoes_multiplas', 'visao_geral',
+]
+# Diferenças abaixo disso são ruído de medição, não regressão
+PISO_REGRESSAO_S = 0.002
+
+
+class StreamlitNulo(types.ModuleType):
+    # Substitui o streamlit: widgets devolvem o valor padrão e o resto (gráficos, textos) não faz nada
+    def __init__(self):
+        super().__init__('streamlit')
+        self.sidebar = self
+        self.session_state = {}
+
+    def __getattr__(self, nome):
+        return lambda *args, **kwargs: None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def expander(self, *args, **kwargs):
+        return self
+
+    def columns(self, spec, *args, **kwargs):
+        return [self] * (spec if isinstance(spec, int) else len(spec))
+
+    def tabs(self, nomes, *args, **kwargs):
+        return [self] * len(nomes)
+
+    def slider(self, label, min_value=None, max_value=None, value=None, *args, **kwargs):
+        return value
+
+    def multiselect(self, label, options, default=None, *args, **kwargs):
+        return list(default or [])
+
+    def radio(self, label, options, index=0, *args, **kwargs):
+        return options[index]
+
+    def selectbox(self, label, options, index=0, *args, **kwargs):
+        return options[index]
+
+    def number_input(self, label, min_value=None, max_value=None, value=None, *args, **kwargs):
+        return value
+
+    def text_input(self, label, value='', *args, **kwargs):
+        return value
+
+    def checkbox(self, label, value=False, *args, **kwargs):
+        return value
+
+    toggle = checkbox
+
+    def button(self, *args, **kwargs):
+        return False
+
+
+def medir(funcao, repeticoes: int, preparar=None) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {'mediana_s': round(statistics.median(tempos), 6), 'min_s': round(min(tempos), 6)}
+
+
+def medir_base(caminho: str, repeticoes: int) -> dict:
+    # Roda dentro do processo filho: GAMES_DB/GAMES_CACHE_DIR já apontam para a base e um diretório temporário
+    sys.modules['streamlit'] = StreamlitNulo()
+    import plotly.express  # noqa: F401  (importações fora da medição)
+    import plotly.graph_objects  # noqa: F401
+    import scipy.stats  # noqa: F401
+    from games import carga, cubo, esbocos, filtros, navegacao
+    from games.cache import CACHE_FILTROS
+    from games.graficos import CACHE_FIGURAS
+
+    def sem_apoio():
+        carga._datasets.clear()
+        shutil.rmtree(carga.DIRETORIO_CACHE, ignore_errors=True)
+
+    def sem_caches():
+        CACHE_FILTROS.limpar()
+        CACHE_FIGURAS.limpar()
+
+    etapas = {
+        'load_data:csv': medir(lambda: carga.load_data(caminho), repeticoes, sem_apoio),
+        'load_data:apoio': medir(lambda: carga.load_data(caminho), repeticoes, carga._datasets.clear),
+        'load_data:memoria': medir(lambda: carga.load_data(caminho), repeticoes),
+    }
+    df = carga.load_data(caminho)
+    anos = df['Year_of_Release'].dropna()
+    plataformas, generos = filtros.opcoes(df, 'Platform'), filtros.opcoes(df, 'Genre')
+    padrao = filtros.Filtro.normalizar((anos.min(), anos.max()), plataformas, generos)
+    estreito = filtros.Filtro.normalizar((2005, 2009), plataformas[:3], generos[:2])
+    etapas['indice_filtros'] = medir(lambda: filtros.IndiceFiltros(df), repeticoes)
+    etapas['mascara'] = medir(lambda: filtros._selecionar(df, padrao), repeticoes)
+    etapas['mascara:estreita'] = medir(lambda: filtros._selecionar(df, estreito), repeticoes)
+    etapas['cubo'] = medir(lambda: cubo.construir(df), repeticoes)
+    etapas['esbocos'] = medir(lambda: esbocos.construir(df), repeticoes)
+    etapas['indice_busca:Name'] = medir(lambda: navegacao.IndiceBusca(df['Name']), repeticoes)
+    # consultas com os índices de busca e a ordem global já construídos (como depois do aquecimento)
+    for c in navegacao.CAMPOS_BUSCA:
+        navegacao.indice_busca(df, c)
+    navegacao.ordem(df, 'Global_Sales', crescente=False)
+    etapas['navegacao:busca'] = medir(lambda: navegacao.pagina(filtros.VisaoFiltrada(df, padrao), texto='jogo 001'),
+                                      repeticoes, sem_caches)
+    etapas['navegacao:ordenar'] = medir(
+        lambda: navegacao.pagina(filtros.VisaoFiltrada(df, padrao), 10, coluna='Global_Sales', crescente=False),
+        repeticoes, sem_caches)
+    etapas['df_f'] = medir(lambda: filtros.VisaoFiltrada(df, padrao)[list(df.columns)], repeticoes, sem_caches)
+    etapas['df_f:estreito'] = medir(
+        lambda: filtros.VisaoFiltrada(df, estreito)[list(df.columns)], repeticoes, sem_caches)
+
+    pagina = runpy.run_path(PAGINA, run_name='__main__')
+    df_f = pagina['df_f']
+    for nome in ANALISES:
+        analise = pagina[nome]
+        etapas[f'analise:{nome}'] = medir(lambda: analise(df_f), repeticoes, sem_caches)
+        etapas[f'analise:{nome}:cache'] = medir(lambda: analise(df_f), repeticoes)
+    return {'linhas': len(df), 'etapas': etapas}
+
+
+def executar_tamanho(tamanho: str, repeticoes: int) -> dict:
+    caminho = sintetico.garantir(tamanho)
+    with tempfile.TemporaryDirectory() as tmp:
+        # sem aquecimento em segundo plano: ele disputaria a CPU com as medições
+        env = dict(os.environ, PYTHONPATH=RAIZ, GAMES_DB=caminho, GAMES_AQUECIMENTO='0',
+                   GAMES_CACHE_DIR=os.path.join(tmp, 'cache'), GAMES_DELTAS_DIR=os.path.join(tmp, 'deltas'))
+        proc = subprocess.run([sys.executable, __file__, '--interno', caminho, '--repeticoes', str(repeticoes)],
+                              cwd=RAIZ, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f'falha no tamanho {tamanho}:\n{proc.stderr}')
+    return {'tamanho': tamanho, 'arquivo': os.path.relpath(caminho, RAIZ), **json.loads(proc.stdout)}
+
+
+def relatorio(tamanhos: list[str], repeticoes: int) -> dict:
+    import numpy
+    import pandas
+    return {
+        'python': sys.version.split()[0],
+        'pandas': pandas.__version__,
+        'numpy': numpy.__version__,
+        'plataforma': platform.platform(),
+        'repeticoes': repeticoes,
+        'bases': [executar_tamanho(t, repeticoes) for t in tamanhos],
+    }
+
+
+def regressoes(atual: dict, anterior: dict, tolerancia: float) -> list[str]:
+    # Etapas cuja mediana piorou além da tolerância relativa (e do piso absoluto) em relação ao resultado anterior
+    antes = {(b['tamanho'], e): v['mediana_s'] for b in anterior['bases'] for e, v in b['etapas'].items()}
+    piores = []
+    for base in atual['bases']:
+        for etapa, v in base['etapas'].items():
+            ref = antes.get((base['tamanho'], etapa))
+            if ref is not None and v['mediana_s'] > ref * (1 + tolerancia) and v['mediana_s'] - ref > PISO_REGRESSAO_S:
+                piores.append(f"{base['tamanho']:>5s} {etapa:45s} {ref:9.4f}s -> {v['mediana_s']:9.4f}s")
+    return piores
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Suíte de desempenho do dashboard sobre bases sintéticas')
+    parser.add_argument('tamanhos', nargs='*', default=['10k', '1M'],
+                        help=f"tamanhos das bases ({', '.join(sintetico.TAMANHOS)} ou nº de linhas)")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--json', metavar='ARQUIVO', help="grava o resultado em JSON ('-' para stdout)")
+    parser.add_argument('--comparar', metavar='ARQUIVO', help='resultado anterior para detectar regressões')
+    parser.add_argument('--tolerancia', type=float, default=0.25, help='piora relativa aceita (padrão: 25%%)')
+    parser.add_argument('--interno', metavar='CSV', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        json.dump(medir_base(args.interno, args.repeticoes), sys.stdout)
+        return
+
+    r = relatorio(args.tamanhos, args.repeticoes)
+    if args.json == '-':
+        json.dump(r, sys.stdout, ensure_ascii=False, indent=2)
+    else:
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(r, f, ensure_ascii=False, indent=2)
+        for base in r['bases']:
+            print(f"\n{base['tamanho']} ({base['linhas']:,} linhas)")
+            for etapa, v in base['etapas'].items():
+                print(f"  {etapa:50s} {v['mediana_s'] * 1e3:10.2f} ms")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            piores = regressoes(r, json.load(f), args.tolerancia)
+        for linha in piores:
+            print(f'REGRESSÃO {linha}', file=sys.stderr)
+        sys.exit(1 if piores else 0)
+
+
+if __name__ == '__main__':
+    main()
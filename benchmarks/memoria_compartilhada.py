@@ -0,0 +1,100 @@
+# Memória por processo com a base copiada em cada processo (padrão) e mapeada em memória (GAMES_MMAP=1):
+# sobe N processos como os workers do Streamlit atrás de um balanceador, cada um carrega a base, o cubo e os
+# esboços e lê todas as colunas; com todos vivos, mede o acréscimo de memória de cada um em relação a antes
+# da carga. USS = memória só do processo, PSS = com as páginas compartilhadas divididas entre os processos.
+#
+#   python benchmarks/memoria_compartilhada.py                    # base 1M, 1, 2 e 4 processos
+#   python benchmarks/memoria_compartilhada.py 10k --processos 1 8 --json
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+import sintetico  # noqa: E402
+
+
+def trabalhador(caminho: str):
+    # Processo filho: mede antes e depois de carregar, e de novo quando o pai pede (todos já carregaram)
+    import numpy as np
+
+    from games import carga, cubo, esbocos, mapeado
+
+    antes = mapeado.memoria_processo()
+    df = carga.load_data(caminho)
+    cubo.cubo(df)
+    esbocos.esbocos(df)
+    for c in df.columns:  # toca todas as páginas, como fariam as análises
+        a = df[c].to_numpy() if df[c].dtype.kind in 'fi' else df[c].isna().to_numpy()
+        np.asarray(a).sum()
+    print('pronto', flush=True)
+    sys.stdin.readline()
+    depois = mapeado.memoria_processo()
+    print(json.dumps({k: depois[k] - antes[k] for k in antes}), flush=True)
+    sys.stdin.readline()
+
+
+def medir(caminho: str, processos: int, mapeado: bool, diretorio_cache: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=RAIZ, GAMES_MMAP='1' if mapeado else '0', GAMES_AQUECIMENTO='0',
+               GAMES_CACHE_DIR=diretorio_cache)
+    # um processo grava o arquivo de apoio (e as estruturas mapeadas) antes dos demais
+    subprocess.run([sys.executable, __file__, '--interno', caminho], cwd=RAIZ, env=env, input='\n\n',
+                   capture_output=True, text=True, check=True)
+    filhos = [subprocess.Popen([sys.executable, __file__, '--interno', caminho], cwd=RAIZ, env=env, text=True,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE) for _ in range(processos)]
+    try:
+        for f in filhos:
+            if f.stdout.readline().strip() != 'pronto':
+                raise RuntimeError('processo de medição falhou')
+        medidas = []
+        for f in filhos:
+            f.stdin.write('\n')
+            f.stdin.flush()
+            medidas.append(json.loads(f.stdout.readline()))
+    finally:
+        for f in filhos:
+            f.stdin.close()
+            f.wait()
+    mb = 2**20
+    return {
+        'modo': 'mapeado' if mapeado else 'copia',
+        'processos': processos,
+        **{f'{k}_mb': round(statistics.mean(m[k] for m in medidas) / mb, 1) for k in ('rss', 'pss', 'uss')},
+        'total_pss_mb': round(sum(m['pss'] for m in medidas) / mb, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memória por worker com a base copiada e mapeada')
+    parser.add_argument('tamanho', nargs='?', default='1M',
+                        help=f"tamanho da base ({', '.join(sintetico.TAMANHOS)} ou nº de linhas)")
+    parser.add_argument('--processos', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--json', action='store_true', help='imprime o resultado em JSON')
+    parser.add_argument('--interno', metavar='CSV', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        trabalhador(args.interno)
+        return
+
+    caminho = sintetico.garantir(args.tamanho)
+    resultados = []
+    for modo in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            resultados += [medir(caminho, n, modo, tmp) for n in args.processos]
+    if args.json:
+        json.dump({'base': os.path.relpath(caminho, RAIZ), 'resultados': resultados}, sys.stdout, indent=2)
+        return
+    print(f"{'modo':10s} {'processos':>9s} {'RSS/proc':>10s} {'PSS/proc':>10s} {'USS/proc':>10s} {'PSS total':>10s}")
+    for r in resultados:
+        print(f"{r['modo']:10s} {r['processos']:9d} {r['rss_mb']:8.1f}MB {r['pss_mb']:8.1f}MB "
+              f"{r['uss_mb']:8.1f}MB {r['total_pss_mb']:8.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# Relatório de partida a frio: tempo de importação por módulo e por página, medido em interpretadores novos
+# com `python -X importtime`.
+#
+#   python benchmarks/partida_fria.py            # tabela no terminal
+#   python benchmarks/partida_fria.py --json     # resultado legível por máquina
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGINAS = ['0_🏠_Portifolio_Profissional.py', 'pages/1_📊_Analise_de_Dados.py']
+MODULOS = [
+    'streamlit', 'pandas', 'numpy', 'pyarrow', 'plotly.graph_objects', 'plotly.express', 'scipy.stats',
+    'games.carga', 'games.filtros', 'games.cubo', 'games.graficos',
+]
+
+
+def _executar(argumentos: list[str]) -> tuple[float, str]:
+    env = dict(os.environ, PYTHONPATH=RAIZ, PYTHONDONTWRITEBYTECODE='1')
+    inicio = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', *argumentos],
+                          cwd=RAIZ, env=env, capture_output=True, text=True)
+    return time.perf_counter() - inicio, proc.stderr
+
+
+def _ler_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    # (módulo, próprio µs, acumulado µs) das importações de primeiro nível
+    linhas = []
+    for linha in stderr.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, acumulado, nome = linha[len('import time:'):].split('|', 2)
+        if len(nome) - len(nome.lstrip()) == 1:  # nível 0: um espaço depois do '|'
+            linhas.append((nome.strip(), int(proprio), int(acumulado)))
+    return linhas
+
+
+def perfil(argumentos: list[str], repeticoes: int = 3, top: int = 10) -> dict:
+    tempos, importacoes = [], None
+    for _ in range(repeticoes):
+        tempo, stderr = _executar(argumentos)
+        tempos.append(tempo)
+        importacoes = _ler_importtime(stderr)
+    importacoes.sort(key=lambda i: i[2], reverse=True)
+    return {
+        'comando': ' '.join(argumentos),
+        'tempo_total_s': round(statistics.median(tempos), 4),
+        'importacao_s': round(sum(i[2] for i in importacoes) / 1e6, 4),
+        'maiores_importacoes': [{'modulo': m, 'acumulado_ms': round(a / 1e3, 1)} for m, _, a in importacoes[:top]],
+    }
+
+
+def relatorio(repeticoes: int = 3) -> dict:
+    return {
+        'python': sys.version.split()[0],
+        'modulos': [perfil(['-c', f'import {m}'], repeticoes) for m in MODULOS],
+        # páginas em "bare mode" (sem servidor): executa o script inteiro como no primeiro acesso
+        'paginas': [perfil([p], repeticoes) for p in PAGINAS],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tempo de importação/partida a frio dos módulos e páginas')
+    parser.add_argument('--json', action='store_true', help='imprime o resultado em JSON')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    r = relatorio(args.repeticoes)
+    if args.json:
+        json.dump(r, sys.stdout, ensure_ascii=False, indent=2)
+        return
+    print(f"{'alvo':45s} {'total (s)':>10s} {'imports (s)':>12s}  maiores importações")
+    for p in r['modulos'] + r['paginas']:
+        maiores = ', '.join(f"{i['modulo']} {i['acumulado_ms']:.0f}ms" for i in p['maiores_importacoes'][:4])
+        print(f"{p['comando']:45s} {p['tempo_total_s']:10.3f} {p['importacao_s']:12.3f}  {maiores}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+# Gerador de bases sintéticas no esquema do games_db.csv, com distribuições ajustadas à base real:
+# vendas globais assimétricas (log-normal), notas ausentes, 'tbd' em User_Score, centenas de publishers
+# com cauda longa. Gravado em blocos, então 10M linhas não precisam caber na memória de uma vez.
+#
+#   python benchmarks/sintetico.py 1M                      # -> benchmarks/dados/games_1M.csv
+#   python benchmarks/sintetico.py 250000 --saida base.csv --seed 7
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REFERENCIA = os.path.join(RAIZ, 'games_db.csv')
+DIRETORIO_DADOS = os.path.join(RAIZ, 'benchmarks', 'dados')
+
+TAMANHOS = {'10k': 10_000, '1M': 1_000_000, '10M': 10_000_000}
+BLOCO = 500_000
+PUBLISHERS_EXTRAS = 400     # cauda longa além dos publishers reais
+FRACAO_NEGATIVOS = 1e-4     # vendas negativas, para exercitar a limpeza
+REGIOES = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales']
+COLUNAS = ['Name', 'Platform', 'Year_of_Release', 'Genre', 'Publisher', *REGIOES, 'Global_Sales',
+           'Critic_Score', 'Critic_Count', 'User_Score', 'User_Count', 'Developer', 'Rating']
+
+
+def linhas(tamanho: str) -> int:
+    return TAMANHOS[tamanho] if tamanho in TAMANHOS else int(tamanho)
+
+
+def caminho_padrao(tamanho: str) -> str:
+    return os.path.join(DIRETORIO_DADOS, f'games_{tamanho}.csv')
+
+
+def _frequencias(s: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    # valores (NaN incluído) e suas proporções na base real
+    f = s.value_counts(normalize=True, dropna=False)
+    return f.index.to_numpy(dtype=object), f.to_numpy()
+
+
+def modelo(referencia: str = REFERENCIA) -> dict:
+    ref = pd.read_csv(referencia, na_values={'User_Score': ['tbd']}, keep_default_na=True)
+    tbd = pd.read_csv(referencia, usecols=['User_Score'], dtype=str)['User_Score'].eq('tbd').mean()
+    vendas = ref['Global_Sales'].clip(lower=0.01)
+    pubs, p_pubs = _frequencias(ref['Publisher'])
+    # cauda longa de publishers sintéticos com peso Zipf (5% das linhas)
+    extras = np.array([f'Publisher {i:04d}' for i in range(PUBLISHERS_EXTRAS)], dtype=object)
+    zipf = 1.0 / np.arange(1, PUBLISHERS_EXTRAS + 1)
+    return {
+        'plataforma': _frequencias(ref['Platform']),
+        'genero': _frequencias(ref['Genre']),
+        'classificacao': _frequencias(ref['Rating']),
+        'ano': _frequencias(ref['Year_of_Release']),
+        'developer': _frequencias(ref['Developer']),
+        'publisher': (np.concatenate([pubs, extras]), np.concatenate([p_pubs * 0.95, zipf / zipf.sum() * 0.05])),
+        'log_vendas': (float(np.log(vendas).mean()), float(np.log(vendas).std())),
+        'fatias_regiao': (ref[REGIOES].sum() / ref['Global_Sales'].sum()).to_numpy(),
+        'p_critica': float(ref['Critic_Score'].notna().mean()),
+        'critica': (float(ref['Critic_Score'].mean()), float(ref['Critic_Score'].std())),
+        'p_usuario': float(ref['User_Score'].notna().mean()),
+        'p_tbd': float(tbd),
+    }
+
+
+def _escolher(rng, freq, n):
+    valores, p = freq
+    return valores[rng.choice(len(valores), size=n, p=p / p.sum())]
+
+
+def gerar_bloco(m: dict, n: int, inicio: int, rng: np.random.Generator) -> pd.DataFrame:
+    # ~70% de nomes distintos: o restante são relançamentos do mesmo jogo em outras plataformas
+    nomes = rng.integers(0, max(int((inicio + n) * 0.7), 1), size=n)
+    globais = np.exp(rng.normal(*m['log_vendas'], size=n))
+    fatias = rng.dirichlet(m['fatias_regiao'] * 2.0, size=n)
+    regioes = np.round(globais[:, None] * fatias, 2)
+    negativos = rng.random(n) < FRACAO_NEGATIVOS
+    regioes[negativos, 0] = -regioes[negativos, 0]
+
+    tem_critica = rng.random(n) < m['p_critica']
+    critica = np.clip(np.round(rng.normal(*m['critica'], size=n)), 13, 98)
+    # nota de usuário correlacionada com a da crítica quando ambas existem
+    usuario = np.where(tem_critica, critica / 10.0 + rng.normal(0.2, 1.1, size=n), rng.normal(7.1, 1.5, size=n))
+    usuario = np.round(np.clip(usuario, 0.0, 9.7), 1)
+    sorteio = rng.random(n)
+    com_nota = sorteio < m['p_usuario']
+    tbd = (sorteio >= m['p_usuario']) & (sorteio < m['p_usuario'] + m['p_tbd'])
+
+    return pd.DataFrame({
+        'Name': pd.Series(nomes).map('Jogo {:07d}'.format),
+        'Platform': _escolher(rng, m['plataforma'], n),
+        'Year_of_Release': _escolher(rng, m['ano'], n),
+        'Genre': _escolher(rng, m['genero'], n),
+        'Publisher': _escolher(rng, m['publisher'], n),
+        **{r: regioes[:, i] for i, r in enumerate(REGIOES)},
+        'Global_Sales': np.maximum(np.round(np.abs(regioes).sum(axis=1), 2), 0.01),
+        'Critic_Score': np.where(tem_critica, critica, np.nan),
+        'Critic_Count': np.where(tem_critica, np.round(rng.lognormal(3.0, 0.7, size=n)), np.nan),
+        'User_Score': np.where(com_nota, usuario.astype(str), np.where(tbd, 'tbd', '')),
+        'User_Count': np.where(com_nota, np.round(rng.lognormal(3.3, 1.5, size=n)) + 4, np.nan),
+        'Developer': _escolher(rng, m['developer'], n),
+        'Rating': _escolher(rng, m['classificacao'], n),
+    }, columns=COLUNAS)
+
+
+def gerar(n: int, saida: str, seed: int = 0, referencia: str = REFERENCIA) -> str:
+    m = modelo(referencia)
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    tmp = f'{saida}.{os.getpid()}.tmp'
+    for inicio in range(0, n, BLOCO):
+        bloco = gerar_bloco(m, min(BLOCO, n - inicio), inicio, rng)
+        bloco.to_csv(tmp, mode='w' if inicio == 0 else 'a', header=inicio == 0, index=False)
+    os.replace(tmp, saida)
+    return saida
+
+
+def garantir(tamanho: str, seed: int = 0) -> str:
+    # Reaproveita o arquivo já gerado (mesmo tamanho e seed produzem sempre o mesmo conteúdo)
+    caminho = caminho_padrao(tamanho) if seed == 0 else caminho_padrao(f'{tamanho}-s{seed}')
+    if not os.path.exists(caminho):
+        gerar(linhas(tamanho), caminho, seed)
+    return caminho
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera uma base sintética no esquema do games_db.csv')
+    parser.add_argument('tamanho', help=f"número de linhas ou um de {', '.join(TAMANHOS)}")
+    parser.add_argument('--saida', help='arquivo CSV de saída (padrão: benchmarks/dados/games_<tamanho>.csv)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--referencia', default=REFERENCIA, help='base real usada para ajustar as distribuições')
+    args = parser.parse_args()
+
+    saida = args.saida or caminho_padrao(args.tamanho)
+    gerar(linhas(args.tamanho), saida, args.seed, args.referencia)
+    print(saida, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
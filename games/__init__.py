@@ -0,0 +1 @@
+# Núcleo de dados do dashboard de games (sem dependência do Streamlit)
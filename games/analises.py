@@ -0,0 +1,247 @@
+# Núcleo das análises sem interface: o que a página mostra, em dados (Series, DataFrames, dicionários),
+# a partir da base limpa (carga), do filtro (filtros) e das agregações do cubo. A página, as figuras e os
+# relatórios em lote (games.relatorio) usam as mesmas funções.
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from games.cubo import fatia, jogos_por, kpis, lancamentos_por_ano, vendas_por_classificacao, vendas_por_regiao
+from games.destaques import GRUPOS_VENDAS, discrepancias, mais_vendidos
+from games.esbocos import fatia_esbocos
+from games.estatistica import Ajuste, SomasGrupos, SomasPares, TesteT
+from games.filtros import Filtro, VisaoFiltrada, opcoes, resultado
+from games.ranking import MINIMO_LANCAMENTOS, ranking
+from games.reamostragem import Reamostragem, bootstrap, permutacao
+
+REGIOES = ['NA_Sales', 'EU_Sales', 'JP_Sales', 'Other_Sales']
+NIVEL = 0.05
+PERCENTIS = [0.25, 0.5, 0.75, 0.9]
+# Testes de hipótese da página: H₁ = média de vendas do primeiro grupo maior que a do segundo
+HIPOTESES = {
+    'acao_vs_rpg': ('Genre', 'Action', 'Role-Playing'),
+    'antigos_vs_atuais': ('Era2010', 'Até 2010', 'Após 2010'),
+}
+
+
+def filtro_padrao(df: pd.DataFrame) -> Filtro:
+    # O mesmo estado inicial dos widgets da página de análise
+    anos = df['Year_of_Release'].dropna()
+    periodo = (1980, 2025) if anos.empty else (int(anos.min()), int(anos.max()))
+    return Filtro.normalizar(periodo, opcoes(df, 'Platform'), opcoes(df, 'Genre'))
+
+
+def filtro_de(df: pd.DataFrame, estado: dict) -> Filtro:
+    # Filtro descrito em JSON ({"periodo": [a, b], "plataformas": [...], "generos": [...], "publishers": [...]});
+    # campos ausentes ficam como no estado inicial da página
+    padrao = filtro_padrao(df)
+    return Filtro.normalizar(
+        estado.get('periodo', padrao.periodo),
+        estado.get('plataformas', padrao.plataformas),
+        estado.get('generos', padrao.generos),
+        estado.get('publishers', ()),
+    )
+
+
+def somas_notas(visao: VisaoFiltrada) -> SomasPares:
+    # Somas suficientes de (Críticos 0–10, Usuários) do filtro, somadas a partir do cubo
+    return SomasPares.de_cubo(fatia(visao.df, visao.filtro))
+
+
+def ajuste_notas(visao: VisaoFiltrada) -> Ajuste | None:
+    return somas_notas(visao).ajuste()
+
+
+def _anos(c: pd.DataFrame) -> np.ndarray:
+    return c['Year_of_Release'].to_numpy(dtype='int64', na_value=0)
+
+
+# Agrupamentos das células do cubo para os testes de hipótese: chave -> (rótulo, grupo de cada célula,
+# nome de cada grupo). Grupos numéricos só viram texto depois de somados (o cubo pode ter milhões de células).
+AGRUPAMENTOS = {
+    'Genre': ('Gênero', lambda c: c['Genre'], None),
+    'Platform': ('Plataforma', lambda c: c['Platform'], None),
+    'Decada': ('Década', lambda c: _anos(c) // 10 * 10, lambda d: f'{d}s'),
+    'Era2010': ('Período', lambda c: _anos(c) > 2010, lambda atual: 'Após 2010' if atual else 'Até 2010'),
+}
+
+
+def grupos_vendas(visao: VisaoFiltrada, agrupamento: str) -> SomasGrupos:
+    # n, Σ e Σ² das vendas globais por grupo, somados do cubo do filtro (sem passar pelas linhas)
+    def construir():
+        _, chave, nomear = AGRUPAMENTOS[agrupamento]
+        c = fatia(visao.df, visao.filtro)
+        g = SomasGrupos.de_cubo(c, chave(c))
+        if nomear is not None:
+            g = replace(g, rotulos=np.array([nomear(r) for r in g.rotulos], dtype=object))
+        return g
+    return resultado(visao.df, visao.filtro, f'grupos:{agrupamento}', construir)
+
+
+def pares_vendas(visao: VisaoFiltrada, agrupamento: str, correcao: str) -> pd.DataFrame:
+    return resultado(visao.df, visao.filtro, f'pares:{agrupamento}:{correcao}',
+                     lambda: grupos_vendas(visao, agrupamento).pares(correcao))
+
+
+def amostra_vendas(visao: VisaoFiltrada, agrupamento: str, grupo: str) -> np.ndarray:
+    # Vendas globais (linha a linha) de um grupo do filtro, para os testes por reamostragem
+    def construir():
+        _, chave, nomear = AGRUPAMENTOS[agrupamento]
+        k = np.asarray(chave(visao))  # a visão responde como o cubo: só reúne as colunas usadas
+        if nomear is None:
+            m = k == grupo
+        else:
+            m = np.isin(k, [u for u in pd.unique(k) if nomear(u) == grupo])
+        vendas = visao['Global_Sales'].to_numpy(dtype=float, na_value=np.nan)[m]
+        return vendas[~np.isnan(vendas)]
+    return resultado(visao.df, visao.filtro, f'amostra:{agrupamento}:{grupo}', construir)
+
+
+def reamostragem_vendas(visao: VisaoFiltrada, agrupamento: str, a: str, b: str, metodo: str,
+                        estatistica: str, n: int, seed: int, orcamento_s: float | None) -> Reamostragem:
+    # Permutação (H₁: a > b) ou bootstrap da diferença a − b; mesmos parâmetros = mesmo resultado (ver reamostragem)
+    def construir():
+        xa, xb = amostra_vendas(visao, agrupamento, a), amostra_vendas(visao, agrupamento, b)
+        if metodo == 'permutacao':
+            return permutacao(xa, xb, estatistica, n, 'greater', seed, orcamento_s)
+        return bootstrap(xa, xb, estatistica, n, seed=seed, orcamento_s=orcamento_s)
+    chave = f'{metodo}:{agrupamento}:{a}:{b}:{estatistica}:{n}:{seed}:{orcamento_s}'
+    return resultado(visao.df, visao.filtro, chave, construir)
+
+
+def indicadores(visao: VisaoFiltrada) -> dict:
+    return kpis(fatia(visao.df, visao.filtro))
+
+
+def lancamentos(visao: VisaoFiltrada) -> pd.Series:
+    return lancamentos_por_ano(fatia(visao.df, visao.filtro))
+
+
+def jogos_por_genero(visao: VisaoFiltrada) -> pd.Series:
+    return jogos_por(fatia(visao.df, visao.filtro), 'Genre')
+
+
+def jogos_por_plataforma(visao: VisaoFiltrada) -> pd.Series:
+    return jogos_por(fatia(visao.df, visao.filtro), 'Platform')
+
+
+def top_vendas(visao: VisaoFiltrada, n: int = 10) -> pd.DataFrame:
+    return (visao[['Name','Platform','Global_Sales']]
+            .dropna(subset=['Global_Sales'])
+            .sort_values('Global_Sales', ascending=False)
+            .head(n)
+            .reset_index(drop=True))
+
+
+def vendas_regiao(visao: VisaoFiltrada) -> pd.Series:
+    return vendas_por_regiao(fatia(visao.df, visao.filtro))
+
+
+def vendas_classificacao(visao: VisaoFiltrada) -> pd.Series | None:
+    c = fatia(visao.df, visao.filtro)
+    if 'Rating' not in c.columns or c['Rating'].dropna().empty:
+        return None
+    return vendas_por_classificacao(c)
+
+
+def colunas_regioes(visao: VisaoFiltrada) -> list[str]:
+    return [c for c in REGIOES if c in visao.columns]
+
+
+def medias_regioes(visao: VisaoFiltrada) -> pd.Series:
+    # Média de vendas por jogo em cada região (ordem das colunas; ver ordem_regioes)
+    return visao[colunas_regioes(visao)].mean()
+
+
+def ordem_regioes(medias: pd.Series) -> list[str]:
+    return medias.sort_values(ascending=False).index.tolist()
+
+
+def notas(visao: VisaoFiltrada, aproximado: bool = False) -> dict | None:
+    # Medidas centrais das notas dos pares completos, com a nota dos críticos na escala 0–10. Média, desvio e
+    # correlação saem das somas suficientes do cubo; as medianas são exatas ou dos esboços de quantis
+    somas = somas_notas(visao)
+    if somas.n == 0:
+        return None
+    esbocos = fatia_esbocos(visao.df, visao.filtro) if aproximado else None
+    if esbocos is not None:
+        medianas = esbocos['Critic_Score'].mediana() / 10.0, esbocos['User_Score'].mediana()
+    else:
+        pares = visao[['Critic_Score','User_Score']].dropna()
+        medianas = (pares['Critic_Score'] / 10.0).median(), pares['User_Score'].median()
+    ajuste = somas.ajuste()
+    (media_c, media_u), (desvio_c, desvio_u) = somas.media(), somas.desvio()
+    return {
+        'n': int(somas.n), 'aproximado': esbocos is not None,
+        'media_criticos': media_c, 'media_usuarios': media_u,
+        'mediana_criticos': float(medianas[0]), 'mediana_usuarios': float(medianas[1]),
+        'desvio_criticos': desvio_c, 'desvio_usuarios': desvio_u,
+        'correlacao': ajuste.r if ajuste else float('nan'),
+    }
+
+
+def percentis_vendas(visao: VisaoFiltrada, aproximado: bool = False, percentis=PERCENTIS) -> pd.DataFrame:
+    # Percentis das vendas por jogo (linhas) em cada região e no total (colunas)
+    colunas = [*colunas_regioes(visao), 'Global_Sales']
+    esbocos = fatia_esbocos(visao.df, visao.filtro) if aproximado else None
+    if esbocos is not None:
+        tabela = pd.DataFrame({c: esbocos[c].quantil(percentis) for c in colunas}, index=percentis)
+    else:
+        tabela = visao[colunas].quantile(percentis)
+    return tabela.rename_axis('percentil')
+
+
+def teste_medias(visao: VisaoFiltrada, agrupamento: str, a: str, b: str,
+                 alternativa: str = 'greater') -> TesteT | None:
+    # Welch a partir das somas do cubo; None se algum dos grupos não está no filtro
+    grupos = grupos_vendas(visao, agrupamento)
+    if a not in grupos or b not in grupos:
+        return None
+    return grupos.teste(a, b, alternativa=alternativa)
+
+
+def ranking_empresas(visao: VisaoFiltrada, coluna: str = 'Publisher', metrica: str = 'vendas_total', k: int = 10,
+                     minimo: int = MINIMO_LANCAMENTOS) -> pd.DataFrame:
+    # Top-k publishers ou developers pela métrica (ver games.ranking)
+    return ranking(visao, coluna, metrica, k, minimo)
+
+
+def discrepancias_notas(visao: VisaoFiltrada, direcao: str = 'ambos', k: int = 10) -> pd.DataFrame:
+    # Jogos com maior diferença entre críticos e usuários, ponderada pelo nº de avaliações (ver games.destaques)
+    return discrepancias(visao, direcao, k)
+
+
+def mais_vendidos_por(visao: VisaoFiltrada, coluna: str = 'Genre') -> pd.DataFrame:
+    # O jogo mais vendido de cada gênero ou plataforma
+    return mais_vendidos(visao, coluna)
+
+
+def significativos(pares: pd.DataFrame, nivel: float = NIVEL) -> pd.DataFrame:
+    # Pares com p ajustado abaixo do nível, do mais ao menos significativo, com o grupo de maior média
+    s = pares[pares['p_ajustado'] < nivel].sort_values('p_ajustado')
+    return s.assign(maior=np.where(s['media_a'] > s['media_b'], s['grupo_a'], s['grupo_b']))
+
+
+# Tudo o que o relatório em lote calcula para cada filtro (parâmetros = estado inicial dos widgets)
+ANALISES = {
+    'indicadores': indicadores,
+    'lancamentos_por_ano': lancamentos,
+    'jogos_por_genero': jogos_por_genero,
+    'jogos_por_plataforma': jogos_por_plataforma,
+    'top_vendas': top_vendas,
+    'vendas_por_regiao': vendas_regiao,
+    'vendas_por_classificacao': vendas_classificacao,
+    'notas': notas,
+    'medias_regioes': medias_regioes,
+    'percentis_vendas': percentis_vendas,
+    **{f'teste_{nome}': (lambda v, h=h: teste_medias(v, *h)) for nome, h in HIPOTESES.items()},
+    **{f'pares_{ag.lower()}': (lambda v, ag=ag: pares_vendas(v, ag, 'holm')) for ag in AGRUPAMENTOS},
+    **{f'ranking_{c.lower()}_{m}': (lambda v, c=c, m=m: ranking_empresas(v, c, m))
+       for c in ('Publisher', 'Developer') for m in ('vendas_total', 'nota_criticos')},
+    'discrepancias_notas': discrepancias_notas,
+    **{f'mais_vendidos_{c.lower()}': (lambda v, c=c: mais_vendidos_por(v, c)) for c in GRUPOS_VENDAS},
+}
+
+
+def calcular(visao: VisaoFiltrada, nomes=None) -> dict:
+    return {nome: ANALISES[nome](visao) for nome in (nomes or ANALISES)}
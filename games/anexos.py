@@ -0,0 +1,110 @@
+# Tabela que cresce por anexos sem copiar as linhas que já tem: cada coluna vive num buffer com folga
+# (como um vetor dinâmico) e o DataFrame de cada versão é uma visão das n primeiras linhas. Anexar escreve
+# o delta na folga e devolve uma visão maior; só quando a folga acaba os buffers são realocados com
+# CRESCIMENTO × o tamanho, então o custo médio por linha anexada é constante, não proporcional à base.
+# Versões anteriores continuam válidas: a parte que elas enxergam nunca é reescrita.
+#
+# Por tipo de coluna:
+#   category           códigos num buffer; categorias novas vão para o fim da tabela, e os códigos já
+#                      escritos continuam valendo. A ordem alfabética volta na próxima realocação.
+#   Int64 (anulável)   valores + máscara
+#   float/int/bool     valores
+#   string (Arrow)     lista de blocos Arrow (juntar blocos não copia)
+# Outros tipos guardam os pedaços e são concatenados a cada versão (cópia só dessa coluna).
+import math
+
+import numpy as np
+import pandas as pd
+
+CRESCIMENTO = 1.5
+
+
+def _tipo_codigos(n_categorias: int) -> np.dtype:
+    # O mesmo tipo que o pandas usa para os códigos (outro tipo faria o Categorical copiá-los)
+    for tipo in (np.int8, np.int16, np.int32):
+        if n_categorias < np.iinfo(tipo).max:
+            return np.dtype(tipo)
+    return np.dtype(np.int64)
+
+
+class TabelaCrescente:
+    def __init__(self, df: pd.DataFrame, capacidade: int):
+        self.n = 0
+        self.capacidade = max(capacidade, len(df))
+        self.colunas = {}
+        for nome in df.columns:
+            s = df[nome]
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                categorias = s.cat.categories.sort_values()
+                self.colunas[nome] = ['category', np.empty(self.capacidade, _tipo_codigos(len(categorias))),
+                                      categorias]
+            elif isinstance(s.dtype, pd.Int64Dtype):
+                self.colunas[nome] = ['Int64', np.empty(self.capacidade, np.int64),
+                                      np.empty(self.capacidade, bool)]
+            elif isinstance(s.array, pd.arrays.ArrowStringArray):
+                self.colunas[nome] = ['arrow', [], s.dtype]
+            elif isinstance(s.dtype, np.dtype) and s.dtype.kind in 'fiub':
+                self.colunas[nome] = ['numpy', np.empty(self.capacidade, s.dtype)]
+            else:
+                self.colunas[nome] = ['outro', [], s.dtype]
+        self.escrever(df)
+
+    @classmethod
+    def para(cls, df: pd.DataFrame, linhas_novas: int) -> 'TabelaCrescente':
+        # Cópia de df com folga para as linhas novas e outros anexos (a única cópia da base)
+        return cls(df, math.ceil((len(df) + linhas_novas) * CRESCIMENTO))
+
+    def cabe(self, delta: pd.DataFrame) -> bool:
+        return self.n + len(delta) <= self.capacidade and list(delta.columns) == list(self.colunas)
+
+    def escrever(self, delta: pd.DataFrame):
+        i, j = self.n, self.n + len(delta)
+        for nome, col in self.colunas.items():
+            s = delta[nome]
+            tipo = col[0]
+            if tipo == 'category':
+                if not isinstance(s.dtype, pd.CategoricalDtype):
+                    s = s.astype('category')
+                novas = s.cat.categories.difference(col[2])
+                if len(novas):
+                    col[2] = col[2].append(novas.sort_values())
+                    if _tipo_codigos(len(col[2])) != col[1].dtype:
+                        col[1] = col[1].astype(_tipo_codigos(len(col[2])))  # raro: a tabela mudou de faixa
+                # código do delta -> código da tabela: uma consulta por categoria do delta, não por linha
+                mapa = np.append(col[2].get_indexer(s.cat.categories), -1)
+                col[1][i:j] = mapa[s.cat.codes.to_numpy()]
+            elif tipo == 'Int64':
+                col[1][i:j] = s.to_numpy(dtype='int64', na_value=0)
+                col[2][i:j] = s.isna().to_numpy()
+            elif tipo == 'arrow':
+                import pyarrow as pa
+
+                bloco = pa.array(s.astype(col[2]).array)
+                col[1].append(bloco if not col[1] else bloco.cast(col[1][0].type))
+            elif tipo == 'numpy':
+                col[1][i:j] = s.to_numpy(dtype=col[1].dtype)
+            else:
+                col[1].append(s.array)
+        self.n = j
+
+    def quadro(self) -> pd.DataFrame:
+        # As n primeiras linhas de cada buffer, sem cópia
+        n = self.n
+        colunas = {}
+        for nome, col in self.colunas.items():
+            tipo = col[0]
+            if tipo == 'category':
+                colunas[nome] = pd.Categorical.from_codes(col[1][:n], dtype=pd.CategoricalDtype(col[2]),
+                                                          validate=False)
+            elif tipo == 'Int64':
+                colunas[nome] = pd.arrays.IntegerArray(col[1][:n], col[2][:n])
+            elif tipo == 'arrow':
+                import pyarrow as pa
+
+                colunas[nome] = pd.arrays.ArrowStringArray(pa.chunked_array(col[1], type=col[1][0].type))
+            elif tipo == 'numpy':
+                colunas[nome] = col[1][:n]
+            else:
+                colunas[nome] = pd.concat([pd.Series(p) for p in col[1]], ignore_index=True).array
+        # copy=False: sem consolidar as colunas em blocos 2D (o que copiaria tudo)
+        return pd.DataFrame(colunas, copy=False)
@@ -0,0 +1,153 @@
+# Aquecimento dos caches em segundo plano: ao subir o servidor, um pool de threads carrega a base, monta o
+# índice de filtros e o cubo, constrói as figuras do filtro padrão da página e de uma lista de filtros
+# "quentes" e, por fim, os índices de busca do navegador da base. Threads (e não processos) porque os
+# caches vivem na memória do processo que atende as sessões; o trabalho é numpy/pandas, que liberam o GIL
+# na maior parte do tempo.
+#
+#   GAMES_AQUECIMENTO=0                      # desliga
+#   GAMES_FILTROS_QUENTES=quentes.json       # lista de filtros, ex.:
+#       [{"periodo": [2005, 2010]}, {"generos": ["Action", "Shooter"]}, {"publishers": ["Nintendo"]}]
+#       (campos ausentes ficam como no estado inicial da página: todos os anos, plataformas e gêneros)
+#   python -m games.aquecimento              # aquece em primeiro plano e imprime o relatório
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from games.analises import filtro_de, filtro_padrao
+from games.cache import CACHE_FILTROS
+from games.carga import CAMINHO_PADRAO, assinatura, load_data
+from games.cubo import cubo
+from games.filtros import Filtro, VisaoFiltrada, indice
+from games.graficos import CACHE_FIGURAS, FIGURAS, PARAMETROS, figura
+from games.navegacao import CAMPOS_BUSCA, indice_busca
+
+ATIVO = os.environ.get('GAMES_AQUECIMENTO', '1') not in ('', '0')
+ARQUIVO_QUENTES = os.environ.get('GAMES_FILTROS_QUENTES', '')
+THREADS = int(os.environ.get('GAMES_AQUECIMENTO_THREADS', min(os.cpu_count() or 1, 2)))
+
+_atual = None
+_lock = threading.Lock()
+
+
+def ler_quentes(arquivo: str = ARQUIVO_QUENTES) -> list[dict]:
+    if not arquivo:
+        return []
+    with open(arquivo, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class Aquecimento:
+    # Tarefa 'base' (dados, índice, cubo) e depois uma tarefa por (filtro, figura), todas no mesmo pool
+    def __init__(self, estados: list[dict], caminho: str = CAMINHO_PADRAO, threads: int = THREADS):
+        self.estados = estados
+        self.caminho = caminho
+        self.threads = threads
+        self.tarefas: dict[str, dict] = {'base': {'estado': 'pendente'}}
+        self.filtros: list[Filtro] = []
+        self.df = None
+        self.inicio = None
+        self.fim = None
+        self._lock = threading.Lock()
+        self._pendentes = 1
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='aquecimento')
+
+    def iniciar(self) -> 'Aquecimento':
+        self.inicio = time.perf_counter()
+        self._pool.submit(self._executar, 'base', self._base)
+        return self
+
+    def _executar(self, nome: str, funcao, *args):
+        self.tarefas[nome] = {'estado': 'executando'}
+        t0 = time.perf_counter()
+        try:
+            funcao(*args)
+            self.tarefas[nome] = {'estado': 'ok', 's': round(time.perf_counter() - t0, 4)}
+        except Exception as e:  # uma figura que falha não impede as outras (nem a página)
+            self.tarefas[nome] = {'estado': 'falha', 's': round(time.perf_counter() - t0, 4), 'erro': repr(e)}
+        with self._lock:
+            self._pendentes -= 1
+            if self._pendentes == 0:
+                self.fim = time.perf_counter()
+                self._pool.shutdown(wait=False)
+
+    def _base(self):
+        df = self.df = load_data(self.caminho)
+        indice(df)
+        cubo(df)
+        self.filtros = list(dict.fromkeys([filtro_padrao(df), *(filtro_de(df, e) for e in self.estados)]))
+        trabalhos = [(f'{i}:{nome}', f, nome) for i, f in enumerate(self.filtros) for nome in FIGURAS]
+        with self._lock:
+            self._pendentes += len(trabalhos) + 1
+        for nome_tarefa, _, _ in trabalhos:
+            self.tarefas[nome_tarefa] = {'estado': 'pendente'}
+        self.tarefas['busca'] = {'estado': 'pendente'}
+        for nome_tarefa, f, nome in trabalhos:
+            self._pool.submit(self._executar, nome_tarefa, self._figura, f, nome)
+        # índices de busca do navegador da base por último: só são usados quando alguém busca
+        self._pool.submit(self._executar, 'busca', self._busca)
+
+    def _figura(self, f: Filtro, nome: str):
+        figura(nome, VisaoFiltrada(self.df, f), *PARAMETROS.get(nome, ()))
+
+    def _busca(self):
+        for coluna in CAMPOS_BUSCA:
+            indice_busca(self.df, coluna)
+
+    @property
+    def concluido(self) -> bool:
+        return self.fim is not None
+
+    def progresso(self) -> dict:
+        estados = [t['estado'] for t in list(self.tarefas.values())]
+        fim = self.fim if self.fim is not None else time.perf_counter()
+        return {
+            'tarefas': len(estados),
+            'concluidas': sum(e in ('ok', 'falha') for e in estados),
+            'falhas': sum(e == 'falha' for e in estados),
+            'concluido': self.concluido,
+            'tempo_s': None if self.inicio is None else round(fim - self.inicio, 3),
+        }
+
+    def cobertura(self) -> dict:
+        # Fração dos resultados aquecidos que ainda estão nos caches (o LRU pode ter removido alguns)
+        if self.df is None or not self.filtros:
+            return {'filtros': 0.0, 'figuras': 0.0}
+        a = assinatura(self.df)
+        figuras = [(a, f, nome, *PARAMETROS.get(nome, ())) for f in self.filtros for nome in FIGURAS]
+        return {
+            'filtros': sum((a, f, 'linhas') in CACHE_FILTROS for f in self.filtros) / len(self.filtros),
+            'figuras': sum(k in CACHE_FIGURAS for k in figuras) / len(figuras),
+        }
+
+    def relatorio(self) -> dict:
+        return {**self.progresso(), 'filtros': len(self.filtros), 'cobertura': self.cobertura(),
+                'detalhes': dict(self.tarefas)}
+
+
+def iniciar_aquecimento(caminho: str = CAMINHO_PADRAO) -> Aquecimento | None:
+    # Uma vez por processo; chamadas seguintes (outras sessões, reruns) só devolvem o aquecimento em curso
+    global _atual
+    if not ATIVO:
+        return None
+    with _lock:
+        if _atual is None:
+            try:
+                estados = ler_quentes()
+            except (OSError, ValueError):
+                estados = []  # arquivo de filtros quentes inválido: aquece só o filtro padrão
+            _atual = Aquecimento(estados, caminho).iniciar()
+        return _atual
+
+
+def aquecimento_atual() -> Aquecimento | None:
+    return _atual
+
+
+if __name__ == '__main__':
+    a = Aquecimento(ler_quentes(*sys.argv[1:2]), threads=THREADS).iniciar()
+    while not a.concluido:
+        time.sleep(0.05)
+    json.dump(a.relatorio(), sys.stdout, ensure_ascii=False, indent=2)
@@ -0,0 +1,125 @@
+# Modo fora da memória: percorre o CSV em blocos e dobra as linhas filtradas de cada bloco no cubo
+# (Ano × Plataforma × Gênero × Rating) + top-N limitado, para catálogos maiores que a RAM. Memória de
+# pico ≈ um bloco + duas vezes o cubo dobrado (o acumulado e o do bloco, juntos em combinar) + o heap do
+# top-N. O cubo tem no máximo uma célula por combinação das quatro dimensões: não cresce com o número de
+# linhas, só com anos, plataformas, gêneros e classificações novos (~4 mil células na base original,
+# ~42 mil na sintética de 1M linhas). Publisher não entra na chave (teria quase uma célula por jogo);
+# o filtro por publishers é aplicado às linhas antes da dobra.
+#
+#   python -m games.blocos base.csv --inicio 2000 --fim 2010 --genero Action --genero Role-Playing
+import argparse
+import heapq
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from games.carga import CAMINHO_PADRAO, VENDAS, ler_blocos
+from games.cubo import (DIMENSOES, combinar, construir, jogos_por, kpis, lancamentos_por_ano,
+                        vendas_por_classificacao, vendas_por_regiao)
+from games.filtros import Filtro
+
+TAMANHO_BLOCO = int(os.environ.get('GAMES_TAMANHO_BLOCO', 200_000))
+# Só o que o cubo e o top-N precisam
+COLUNAS = ['Name', *DIMENSOES, 'Publisher', *VENDAS, 'Critic_Score', 'Critic_Count', 'User_Score', 'User_Count']
+# Todas as linhas com ano
+SEM_FILTRO = Filtro((-(2**31), 2**31 - 1), None, None)
+
+
+def mascara(bloco: pd.DataFrame, filtro: Filtro) -> np.ndarray:
+    # Mesma semântica do índice de filtros, aplicada às linhas de um bloco
+    anos = bloco['Year_of_Release']
+    m = (anos >= filtro.periodo[0]) & (anos <= filtro.periodo[1])
+    for col, valores in (('Platform', filtro.plataformas), ('Genre', filtro.generos)):
+        m &= bloco[col].notna() if valores is None else bloco[col].isin(valores)
+    if filtro.publishers:
+        m &= bloco['Publisher'].isin(filtro.publishers)
+    return m.fillna(False).to_numpy(dtype=bool)
+
+
+class TopN:
+    # Maiores vendas globais em um min-heap de tamanho n; empate fica com a linha que aparece antes no arquivo
+    def __init__(self, n: int):
+        self.n = n
+        self._heap = []
+
+    def adicionar(self, bloco: pd.DataFrame, linhas: np.ndarray):
+        # linhas: número de cada linha do bloco no arquivo (o índice do bloco pode recomeçar do zero)
+        bloco = bloco.set_axis(linhas)
+        cand = bloco.dropna(subset=['Global_Sales']).nlargest(self.n, 'Global_Sales', keep='first')
+        for pos, nome, plataforma, vendas in zip(cand.index, cand['Name'], cand['Platform'], cand['Global_Sales']):
+            item = (vendas, -pos, nome, plataforma)
+            if len(self._heap) < self.n:
+                heapq.heappush(self._heap, item)
+            elif item > self._heap[0]:
+                heapq.heapreplace(self._heap, item)
+
+    def resultado(self) -> pd.DataFrame:
+        itens = sorted(self._heap, reverse=True)
+        return pd.DataFrame({
+            'Name': [i[2] for i in itens],
+            'Platform': [i[3] for i in itens],
+            'Global_Sales': np.array([i[0] for i in itens], dtype=float),
+        })
+
+
+def agregar_em_blocos(caminho: str = CAMINHO_PADRAO, filtro: Filtro | None = None, top_n: int = 10,
+                      tamanho_bloco: int = TAMANHO_BLOCO) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # Devolve (cubo das linhas que passam pelo filtro, top-N por vendas globais)
+    filtro = filtro or SEM_FILTRO
+    parciais, top = [], TopN(top_n)
+    inicio = 0  # linhas já lidas: a posição absoluta no arquivo, para os empates do top-N
+    for bloco in ler_blocos(caminho, tamanho_bloco, COLUNAS):
+        # só as linhas do filtro entram no cubo (publisher não é dimensão dele, então não dá para fatiar depois)
+        m = mascara(bloco, filtro)
+        linhas = inicio + np.flatnonzero(m)
+        inicio += len(bloco)
+        bloco = bloco[m]
+        parciais.append(construir(bloco))
+        if len(parciais) > 1:
+            # dobra a cada bloco: a memória não cresce com o número de blocos
+            parciais = [combinar(parciais)]
+        top.adicionar(bloco, linhas)
+    return combinar(parciais), top.resultado()
+
+
+def resumo(c: pd.DataFrame, top: pd.DataFrame) -> dict:
+    # Os mesmos números que a página mostra, em forma serializável
+    def serie(s: pd.Series) -> dict:
+        return {str(k): (int(v) if np.issubdtype(type(v), np.integer) else float(v)) for k, v in s.items()}
+
+    return {
+        'kpis': kpis(c),
+        'lancamentos_por_ano': serie(lancamentos_por_ano(c)),
+        'jogos_por_genero': serie(jogos_por(c, 'Genre')),
+        'jogos_por_plataforma': serie(jogos_por(c, 'Platform')),
+        'vendas_por_regiao': serie(vendas_por_regiao(c)),
+        'vendas_por_classificacao': serie(vendas_por_classificacao(c)),
+        'top_vendas': top.to_dict(orient='records'),
+    }
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description='Agrega a base de games em blocos, sem carregá-la inteira.')
+    p.add_argument('caminho', nargs='?', default=CAMINHO_PADRAO)
+    p.add_argument('--inicio', type=int)
+    p.add_argument('--fim', type=int)
+    p.add_argument('--plataforma', action='append')
+    p.add_argument('--genero', action='append')
+    p.add_argument('--publisher', action='append')
+    p.add_argument('--top', type=int, default=10)
+    p.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO)
+    a = p.parse_args(argv)
+
+    filtro = None
+    if any(v is not None for v in (a.inicio, a.fim, a.plataforma, a.genero, a.publisher)):
+        periodo = (SEM_FILTRO.periodo[0] if a.inicio is None else a.inicio,
+                   SEM_FILTRO.periodo[1] if a.fim is None else a.fim)
+        filtro = Filtro.normalizar(periodo, a.plataforma, a.genero, a.publisher)
+    c, top = agregar_em_blocos(a.caminho, filtro, a.top, a.tamanho_bloco)
+    print(json.dumps(resumo(c, top), ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
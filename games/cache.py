@@ -0,0 +1,97 @@
+# Cache LRU limitado por memória, compartilhado entre as sessões do mesmo processo
+import dataclasses
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def tamanho(obj) -> int:
+    # Estimativa de memória ocupada por um valor guardado no cache. DataFrame e Series antes de nbytes: o
+    # nbytes deles não conta o conteúdo das strings (colunas object/Arrow) nem o índice
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if hasattr(obj, 'nbytes'):
+        return int(obj.nbytes)  # arrays numpy e dataclasses que somam os nbytes dos seus arrays
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # demais dataclasses de resultados (ResumoBox, Esboco, SomasGrupos...): soma dos campos
+        return sys.getsizeof(obj) + sum(tamanho(getattr(obj, f.name)) for f in dataclasses.fields(obj))
+    if hasattr(obj, 'to_plotly_json'):
+        # figuras Plotly: os dicionários de traços e layout que a figura guarda (arrays pelo nbytes), sem
+        # serializar a figura só para medi-la
+        return tamanho(obj._data) + tamanho(obj._layout)
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(tamanho(o) for o in obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(tamanho(k) + tamanho(v) for k, v in obj.items())
+    return sys.getsizeof(obj)
+
+
+class CacheLRU:
+    def __init__(self, limite_bytes: int):
+        self.limite_bytes = limite_bytes
+        self.bytes = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.remocoes = 0
+        self._itens: OrderedDict = OrderedDict()  # chave -> (valor, bytes)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __contains__(self, chave):
+        return chave in self._itens
+
+    def obter(self, chave, construtor):
+        # Devolve o valor em cache ou constrói (fora do lock) e guarda
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return item[0]
+            self.faltas += 1
+        valor = construtor()
+        self.guardar(chave, valor)
+        return valor
+
+    def guardar(self, chave, valor):
+        n = tamanho(valor)
+        if n > self.limite_bytes:
+            return  # maior que o orçamento inteiro: não vale a pena guardar
+        with self._lock:
+            antigo = self._itens.pop(chave, None)
+            if antigo is not None:
+                self.bytes -= antigo[1]
+            self._itens[chave] = (valor, n)
+            self.bytes += n
+            while self.bytes > self.limite_bytes:
+                _, (_, m) = self._itens.popitem(last=False)
+                self.bytes -= m
+                self.remocoes += 1
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self.bytes = 0
+
+    def estatisticas(self) -> dict:
+        total = self.acertos + self.faltas
+        return {
+            'itens': len(self._itens),
+            'bytes': self.bytes,
+            'limite_bytes': self.limite_bytes,
+            'acertos': self.acertos,
+            'faltas': self.faltas,
+            'remocoes': self.remocoes,
+            'taxa_acerto': self.acertos / total if total else 0.0,
+        }
+
+
+# Resultados de filtros (linhas selecionadas, fatias do cubo, agregados derivados)
+CACHE_FILTROS = CacheLRU(int(os.environ.get('GAMES_CACHE_FILTROS_MB', 256)) * 2**20)
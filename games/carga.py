@@ -0,0 +1,348 @@
+# Carga e limpeza da base de games, com cache por processo e arquivo colunar (Parquet) de apoio.
+# Com GAMES_MMAP=1 o arquivo de apoio é Arrow IPC lido por memory map (games.mapeado): todos os processos
+# do servidor compartilham as mesmas páginas da base limpa e das estruturas derivadas registradas com
+# compartilhar(), em vez de cada um ter sua cópia.
+import glob
+import hashlib
+import importlib.util
+import itertools
+import logging
+import os
+import threading
+import weakref
+
+import pandas as pd
+
+from games import mapeado
+from games.anexos import TabelaCrescente
+
+# pyarrow está no requirements.txt (arquivo de apoio Parquet/Arrow, motor de leitura do CSV e GAMES_MMAP);
+# sem ele a carga ainda funciona pelos caminhos lentos, avisando uma vez. Só verificamos, sem importar
+PYARROW_DISPONIVEL = importlib.util.find_spec('pyarrow') is not None
+_log = logging.getLogger(__name__)
+
+CAMINHO_PADRAO = os.environ.get('GAMES_DB', './games_db.csv')
+DIRETORIO_CACHE = os.environ.get('GAMES_CACHE_DIR', './.cache')
+# CSVs com linhas novas (mesmas colunas da base), anexados em ordem de nome sem reler a base
+DIRETORIO_DELTAS = os.environ.get('GAMES_DELTAS_DIR', './deltas')
+
+# Arquivo de apoio mapeado em memória e compartilhado entre processos (precisa do pyarrow)
+MAPEADO = PYARROW_DISPONIVEL and os.environ.get('GAMES_MMAP', '0') not in ('', '0')
+
+# Incrementar sempre que a limpeza mudar, para invalidar os arquivos de apoio antigos
+VERSAO_LIMPEZA = 2
+
+_lock = threading.Lock()
+_lock_derivados = threading.RLock()
+_derivados: dict[int, dict[str, object]] = {}  # id(DataFrame) -> estruturas derivadas por nome
+_versoes = itertools.count(1)
+_hashes: dict[tuple, str] = {}           # (caminho, mtime, tamanho) -> hash do conteúdo
+_datasets: dict[str, tuple[tuple, pd.DataFrame]] = {}  # caminho -> (chave, DataFrame limpo)
+_aplicados: dict[str, dict[str, tuple]] = {}  # caminho -> {delta já anexado: (mtime, tamanho)}
+_incrementais: dict[str, object] = {}  # nome da estrutura derivada -> atualizar(antiga, novo_df, delta)
+_compartilhados: dict[str, int] = {}  # nome da estrutura derivada (DataFrame) -> versão do arquivo mapeado
+_avisado_sem_pyarrow = False
+
+
+def _hash_arquivo(caminho: str) -> str:
+    h = hashlib.sha1()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def chave_arquivo(caminho: str) -> tuple:
+    # O hash só é recalculado quando mtime ou tamanho mudam
+    caminho = os.path.abspath(caminho)
+    info = os.stat(caminho)
+    stat = (caminho, info.st_mtime_ns, info.st_size)
+    if stat not in _hashes:
+        _hashes[stat] = _hash_arquivo(caminho)
+    return (caminho, info.st_mtime_ns, _hashes[stat])
+
+
+def _prefixo_apoio(chave: tuple) -> str:
+    return os.path.join(DIRETORIO_CACHE, os.path.splitext(os.path.basename(chave[0]))[0])
+
+
+def _caminho_apoio(chave: tuple) -> str:
+    extensao = 'arrow' if MAPEADO else 'parquet'
+    return f'{_prefixo_apoio(chave)}-v{VERSAO_LIMPEZA}-{chave[2][:16]}.{extensao}'
+
+
+# Esquema declarado da base: tipos finais de cada coluna, aplicados já na leitura do CSV
+ESQUEMA = {
+    'Name': 'string',
+    'Platform': 'category',
+    'Year_of_Release': 'Int64',
+    'Genre': 'category',
+    'Publisher': 'category',
+    'NA_Sales': 'float64',
+    'EU_Sales': 'float64',
+    'JP_Sales': 'float64',
+    'Other_Sales': 'float64',
+    'Global_Sales': 'float64',
+    'Critic_Score': 'float64',
+    'Critic_Count': 'float64',
+    'User_Score': 'float64',
+    'User_Count': 'float64',
+    'Developer': 'category',
+    'Rating': 'category',
+}
+VENDAS = ['NA_Sales','EU_Sales','JP_Sales','Other_Sales','Global_Sales']
+# Colunas de baixa cardinalidade guardadas como códigos inteiros + tabela de categorias
+CATEGORICAS = [c for c, tipo in ESQUEMA.items() if tipo == 'category']
+NA_VALORES = {'User_Score': ['tbd']}
+
+MOTOR_CSV = os.environ.get('GAMES_CSV_ENGINE', 'pyarrow' if PYARROW_DISPONIVEL else 'c')
+
+
+def limpar(df: pd.DataFrame) -> pd.DataFrame:
+    # Limpeza / Conversão de tipos (caminho lento, para arquivos que não seguem o esquema)
+    for col in ['Year_of_Release', 'Critic_Score', 'Critic_Count', 'User_Score', 'User_Count']:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(ESQUEMA[col])
+
+    for col in ['Name','Platform','Genre','Publisher','Developer','Rating']:
+        if col in df.columns:
+            df[col] = df[col].astype(ESQUEMA[col])
+
+    # Converte vendas negativas para 0
+    for c in VENDAS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors='coerce').clip(lower=0)
+    return df
+
+
+def _zerar_negativos(df: pd.DataFrame) -> pd.DataFrame:
+    # Converte vendas negativas para 0 (só copia as colunas que de fato têm negativos)
+    for c in VENDAS:
+        if c in df.columns and (df[c] < 0).any():
+            df[c] = df[c].clip(lower=0)
+    return df
+
+
+def _ordenar_categorias(df: pd.DataFrame) -> pd.DataFrame:
+    # Categorias em ordem alfabética na carga (anexos põem as novas no fim da tabela; ver games.anexos)
+    for c in CATEGORICAS:
+        if c in df.columns and not df[c].cat.categories.is_monotonic_increasing:
+            df[c] = df[c].cat.reorder_categories(df[c].cat.categories.sort_values())
+    return df
+
+
+def ler_csv(caminho, colunas: list[str] | None = None, motor: str | None = None, **kwargs):
+    # Leitura tipada em uma única passada; kwargs extras (ex.: chunksize) vão direto ao read_csv
+    colunas = list(ESQUEMA) if colunas is None else colunas
+    motor = motor or MOTOR_CSV
+    opcoes = dict(usecols=colunas, dtype={c: ESQUEMA[c] for c in colunas}, engine=motor, **kwargs)
+    if motor == 'pyarrow':
+        # o motor pyarrow só aceita lista global; 'tbd' só ocorre em User_Score
+        opcoes['na_values'] = [v for vs in NA_VALORES.values() for v in vs]
+    else:
+        opcoes['na_values'] = {c: v for c, v in NA_VALORES.items() if c in colunas}
+    df = pd.read_csv(caminho, **opcoes)
+    return df if 'chunksize' in kwargs else _ordenar_categorias(df)
+
+
+def carregar_csv(caminho: str) -> pd.DataFrame:
+    try:
+        df = ler_csv(caminho)
+    except (ValueError, TypeError):
+        # valores fora do esquema (ex.: texto em coluna numérica): volta à coerção tolerante
+        df = _ordenar_categorias(limpar(pd.read_csv(caminho)))
+    return _zerar_negativos(df)
+
+
+def ler_blocos(caminho: str, tamanho_bloco: int, colunas: list[str] | None = None):
+    # Lê o CSV em blocos já tipados e limpos (mesmas regras do load_data), sem carregar a base inteira.
+    # Cada bloco tem categorias próprias; quem junta os blocos unifica as tabelas.
+    lidas = 0
+    try:
+        for bloco in ler_csv(caminho, colunas, motor='c', chunksize=tamanho_bloco):
+            lidas += len(bloco)
+            yield _zerar_negativos(bloco)
+        return
+    except (ValueError, TypeError):
+        pass
+    # valores fora do esquema: continua do primeiro bloco não lido com a coerção tolerante
+    leitor = pd.read_csv(caminho, usecols=colunas, chunksize=tamanho_bloco, skiprows=range(1, lidas + 1))
+    for bloco in leitor:
+        yield _zerar_negativos(limpar(bloco))
+
+
+def _ler_apoio(caminho: str) -> pd.DataFrame | None:
+    if not PYARROW_DISPONIVEL or not os.path.exists(caminho):
+        return None
+    if caminho.endswith('.arrow'):
+        return mapeado.ler(caminho)
+    try:
+        return pd.read_parquet(caminho)
+    except Exception:
+        return None  # arquivo corrompido/incompatível: reconstrói a partir do CSV
+
+
+def _gravar_apoio(df: pd.DataFrame, chave: tuple):
+    if not PYARROW_DISPONIVEL:
+        return
+    caminho = _caminho_apoio(chave)
+    try:
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        if MAPEADO:
+            mapeado.gravar(df, caminho)
+        else:
+            tmp = f'{caminho}.{os.getpid()}.tmp'
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, caminho)  # troca atômica: outros processos nunca leem um arquivo pela metade
+        # remove arquivos de apoio (e estruturas derivadas mapeadas) de versões/conteúdos anteriores do mesmo CSV;
+        # processos que ainda mapeiam um arquivo removido continuam lendo-o até soltá-lo
+        atual = os.path.splitext(caminho)[0]
+        for antigo in glob.glob(f'{glob.escape(_prefixo_apoio(chave))}-v[0-9]*-*.*'):
+            if not antigo.startswith(atual) and antigo.endswith(('.parquet', '.arrow')):
+                os.remove(antigo)
+    except OSError:
+        pass  # sem permissão de escrita: segue apenas com o cache em memória
+
+
+def _estado_deltas() -> dict[str, tuple]:
+    estado = {}
+    for arq in sorted(glob.glob(os.path.join(glob.escape(DIRETORIO_DELTAS), '*.csv'))):
+        try:
+            info = os.stat(arq)
+        except OSError:
+            continue
+        estado[os.path.abspath(arq)] = (info.st_mtime_ns, info.st_size)
+    return estado
+
+
+def _avisar_sem_pyarrow():
+    global _avisado_sem_pyarrow
+    if PYARROW_DISPONIVEL or _avisado_sem_pyarrow:
+        return
+    _avisado_sem_pyarrow = True
+    mmap = ' e GAMES_MMAP ignorado' if os.environ.get('GAMES_MMAP', '0') not in ('', '0') else ''
+    _log.warning('pyarrow não instalado: sem arquivo de apoio, CSV lido pelo motor C%s (pip install pyarrow)',
+                 mmap)
+
+
+def load_data(caminho: str = CAMINHO_PADRAO) -> pd.DataFrame:
+    # Compartilhado entre sessões e reruns: não modificar o DataFrame retornado
+    _avisar_sem_pyarrow()
+    chave = chave_arquivo(caminho)
+    deltas = _estado_deltas()
+    atual = _datasets.get(chave[0])
+    if atual is not None and atual[0] == chave and _aplicados.get(chave[0]) == deltas:
+        return atual[1]
+
+    with _lock:
+        atual = _datasets.get(chave[0])
+        aplicados = dict(_aplicados.get(chave[0], {}))
+        # base nova, ou delta já anexado que mudou/sumiu: recomeça da base
+        if atual is None or atual[0] != chave or any(deltas.get(a) != st for a, st in aplicados.items()):
+            apoio = _caminho_apoio(chave)
+            df = _ler_apoio(apoio)
+            if df is None:
+                df = carregar_csv(chave[0])
+                _gravar_apoio(df, chave)
+                if MAPEADO:
+                    # o próprio processo que gravou passa a usar as páginas compartilhadas
+                    df = _ler_apoio(apoio) if os.path.exists(apoio) else df
+            if MAPEADO:
+                derivado(df, 'apoio', lambda _: apoio)
+            aplicados = {}
+        else:
+            df = atual[1]
+
+        # deltas novos: custo proporcional ao tamanho do delta
+        for arq, st in deltas.items():
+            if arq not in aplicados:
+                df = _anexar(df, carregar_csv(arq))
+                aplicados[arq] = st
+        _datasets[chave[0]] = (chave, df)
+        _aplicados[chave[0]] = aplicados
+        return df
+
+
+def incremental(nome: str, atualizar):
+    # Registra como atualizar a estrutura derivada `nome` quando linhas são anexadas, em vez de reconstruí-la
+    _incrementais[nome] = atualizar
+
+
+def compartilhar(nome: str, versao: int = 1):
+    # Registra a estrutura derivada `nome` (um DataFrame) para ser gravada ao lado do arquivo de apoio mapeado
+    # e lida por memory map pelos outros processos. Incrementar a versão quando o construtor mudar.
+    _compartilhados[nome] = versao
+
+
+def _construir_derivado(df: pd.DataFrame, nome: str, construtor, por_df: dict):
+    apoio = por_df.get('apoio')
+    if apoio is None or nome not in _compartilhados:
+        return construtor(df)
+    caminho = f'{os.path.splitext(apoio)[0]}-{nome}-v{_compartilhados[nome]}.arrow'
+    valor = mapeado.ler(caminho)
+    if valor is not None:
+        return valor
+    valor = construtor(df)
+    try:
+        mapeado.gravar(valor, caminho)
+    except OSError:
+        return valor  # sem permissão de escrita: estrutura só deste processo
+    compartilhado = mapeado.ler(caminho)
+    return valor if compartilhado is None else compartilhado
+
+
+def _anexar(df: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+    # Novo DataFrame = base + delta, sem copiar a base: as colunas são visões de buffers com folga
+    # (games.anexos), que só são realocados quando ela acaba. Categorias novas entram no fim das tabelas
+    # (os códigos da base não são reescritos). As estruturas derivadas já construídas para a base e com
+    # atualização registrada seguem para o novo DataFrame, recebendo o delta com as tabelas de categorias
+    # dele; as demais são reconstruídas sob demanda. A assinatura muda, então os caches por filtro expiram.
+    antigos = _derivados.get(id(df), {})
+    tabela = antigos.get('anexos')
+    # outra versão já escreveu na folga depois desta (ou não há espaço): copia a base para buffers novos
+    if tabela is None or tabela.n != len(df) or not tabela.cabe(delta):
+        tabela = TabelaCrescente.para(df, len(delta))
+    tabela.escrever(delta)
+    novo = tabela.quadro()
+    derivado(novo, 'anexos', lambda _: tabela)
+    delta = novo.iloc[len(df):].reset_index(drop=True)
+    for nome, atualizar in _incrementais.items():
+        if nome in antigos:
+            valor = atualizar(antigos[nome], novo, delta)
+            derivado(novo, nome, lambda _: valor)
+    return novo
+
+
+def anexar(delta, caminho: str = CAMINHO_PADRAO) -> pd.DataFrame:
+    # Anexa linhas novas (DataFrame ou CSV) à base em cache, limpas com as mesmas regras do load_data.
+    # Vale até a base ser recarregada; para persistir, grave o CSV em DIRETORIO_DELTAS.
+    if isinstance(delta, pd.DataFrame):
+        delta = _zerar_negativos(limpar(delta.reindex(columns=list(ESQUEMA))))
+    else:
+        delta = carregar_csv(delta)
+    load_data(caminho)
+    with _lock:
+        chave, df = _datasets[os.path.abspath(caminho)]
+        novo = _anexar(df, delta)
+        _datasets[chave[0]] = (chave, novo)
+        return novo
+
+
+def derivado(df: pd.DataFrame, nome: str, construtor):
+    # Estruturas derivadas (índices, cubos...) construídas uma vez por dataset e liberadas junto com ele
+    por_df = _derivados.get(id(df))
+    if por_df is not None and nome in por_df:
+        return por_df[nome]
+    with _lock_derivados:
+        por_df = _derivados.get(id(df))
+        if por_df is None:
+            por_df = _derivados[id(df)] = {}
+            weakref.finalize(df, _derivados.pop, id(df), None)
+        if nome not in por_df:
+            por_df[nome] = _construir_derivado(df, nome, construtor, por_df)
+        return por_df[nome]
+
+
+def assinatura(df: pd.DataFrame) -> int:
+    # Identificador único de um dataset carregado (não é reaproveitado como o id() do objeto)
+    return derivado(df, 'assinatura', lambda _: next(_versoes))
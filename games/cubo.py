@@ -0,0 +1,154 @@
+# Cubo pré-agregado (Ano × Plataforma × Gênero × Rating) com contagens, somas de vendas e somas suficientes
+# das vendas globais e das notas. Publisher fica de fora da chave: com ele o cubo teria quase uma célula por
+# jogo (12k células para 17k linhas na base original). Sem publisher as células são limitadas pelo produto
+# das cardinalidades das quatro dimensões, que não cresce com o catálogo; filtros com publishers somam só as
+# linhas selecionadas pelo índice (listas de posições).
+import numpy as np
+import pandas as pd
+
+from games.carga import VENDAS, compartilhar, derivado, incremental
+from games.filtros import Filtro, resultado, selecionar
+from games.instrumentacao import etapa
+
+DIMENSOES = ['Year_of_Release', 'Platform', 'Genre', 'Rating']
+
+
+def _medidas_notas(df: pd.DataFrame) -> pd.DataFrame:
+    # Somas suficientes dos pares (Críticos 0–10, Usuários) completos, para regressão/correlação por filtro
+    x = df['Critic_Score'].to_numpy(dtype=float) / 10.0
+    y = df['User_Score'].to_numpy(dtype=float)
+    par = ~(np.isnan(x) | np.isnan(y))
+    x, y = np.where(par, x, 0.0), np.where(par, y, 0.0)
+    return pd.DataFrame({
+        'notas_n': par.astype(np.int64), 'notas_sx': x, 'notas_sy': y,
+        'notas_sxx': x * x, 'notas_syy': y * y, 'notas_sxy': x * y,
+    }, index=df.index)
+
+
+def _medidas_vendas(df: pd.DataFrame) -> pd.DataFrame:
+    # Contagem e soma dos quadrados das vendas globais preenchidas (a soma já é Global_Sales), para testes t
+    v = df['Global_Sales'].to_numpy(dtype=float)
+    ok = ~np.isnan(v)
+    v = np.where(ok, v, 0.0)
+    return pd.DataFrame({'vendas_n': ok.astype(np.int64), 'vendas_ss': v * v}, index=df.index)
+
+
+def construir(df: pd.DataFrame) -> pd.DataFrame:
+    # Uma linha por combinação observada; n_nome conta nomes preenchidos (como o count('Name') das análises)
+    base = pd.concat([
+        df[DIMENSOES], df['Name'].notna().astype(np.int64).rename('n_nome'), df[VENDAS],
+        _medidas_vendas(df), _medidas_notas(df),
+    ], axis=1)
+    g = base.groupby(DIMENSOES, observed=True, dropna=False, sort=False)
+    celulas = g.sum()
+    celulas.insert(0, 'n_linhas', g.size())
+    celulas = celulas.reset_index()
+    # linhas sem ano nunca passam pelo filtro de período
+    return celulas[celulas['Year_of_Release'].notna()].reset_index(drop=True)
+
+
+def cubo(df: pd.DataFrame) -> pd.DataFrame:
+    return derivado(df, 'cubo', construir)
+
+
+def fatia(df: pd.DataFrame, filtro: Filtro) -> pd.DataFrame:
+    # Células do cubo que passam pelos filtros da barra lateral (mesmo índice usado nas linhas brutas).
+    # Com publishers, as mesmas células agregadas das linhas do filtro (poucas, pelas listas de posições).
+    if filtro.publishers:
+        return resultado(df, filtro, 'cubo', lambda: _agregar_linhas(df, filtro))
+    c = cubo(df)
+    return resultado(df, filtro, 'cubo', lambda: _fatiar(c, filtro))
+
+
+def _fatiar(c: pd.DataFrame, filtro: Filtro) -> pd.DataFrame:
+    with etapa('agregacao:cubo') as e:
+        f = c.take(selecionar(c, filtro))
+        e['linhas'] = len(f)
+        return f
+
+
+def _agregar_linhas(df: pd.DataFrame, filtro: Filtro) -> pd.DataFrame:
+    with etapa('agregacao:cubo_publishers') as e:
+        linhas = selecionar(df, filtro)
+        e['linhas'] = len(linhas)
+        return construir(df.take(linhas))
+
+
+def combinar(partes: list[pd.DataFrame], chaves: list[str] = DIMENSOES) -> pd.DataFrame:
+    # Soma as células de cubos parciais com tabelas de categorias próprias (ex.: blocos de leitura),
+    # unificando as tabelas. Outras tabelas somáveis por célula passam as próprias chaves.
+    if not partes:
+        raise ValueError('nenhum cubo para combinar')
+    partes = [p for p in partes if len(p)] or partes[:1]
+    for col in [c for c in chaves if c in DIMENSOES[1:]]:
+        categorias = pd.Index(sorted(set().union(*(p[col].cat.categories for p in partes))))
+        partes = [p.assign(**{col: p[col].cat.set_categories(categorias)}) for p in partes]
+    base = pd.concat(partes, ignore_index=True)
+    return base.groupby(chaves, observed=True, dropna=False, sort=False).sum().reset_index()
+
+
+def alinhar(tabela: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    # Colunas categóricas da tabela com as tabelas de categorias de df. Categorias anexadas ficam no fim
+    # (games.anexos): se as antigas são um prefixo, os códigos valem como estão e nada é recodificado.
+    trocas = {}
+    for col in tabela.columns:
+        s = tabela[col]
+        if not isinstance(s.dtype, pd.CategoricalDtype) or col not in df.columns:
+            continue
+        novas, antigas = df[col].cat.categories, s.cat.categories
+        if novas.equals(antigas):
+            continue
+        if len(antigas) <= len(novas) and novas[:len(antigas)].equals(antigas):
+            trocas[col] = pd.Categorical.from_codes(s.cat.codes.to_numpy(), dtype=df[col].dtype, validate=False)
+        else:
+            trocas[col] = s.cat.set_categories(novas)
+    return tabela.assign(**trocas) if trocas else tabela
+
+
+def somar(antigo: pd.DataFrame, parcial: pd.DataFrame, chaves: list[str] = DIMENSOES) -> pd.DataFrame:
+    # Soma as células de `parcial` às de `antigo` (mesmas tabelas de categorias, células únicas em cada um):
+    # só as células que o parcial toca mudam de valor e as novas entram no fim, sem reagrupar o cubo inteiro
+    def chave(t: pd.DataFrame) -> pd.MultiIndex:
+        return pd.MultiIndex.from_arrays([
+            t[c].cat.codes.to_numpy() if isinstance(t[c].dtype, pd.CategoricalDtype)
+            else t[c].to_numpy(dtype='int64', na_value=np.iinfo(np.int64).min) for c in chaves])
+
+    posicoes = chave(antigo).get_indexer(chave(parcial))
+    tocadas = posicoes >= 0
+    medidas = {}
+    for m in antigo.columns.difference(chaves, sort=False):
+        v = antigo[m].to_numpy(copy=True)  # o cubo antigo pode ser somente leitura (mapeado)
+        v[posicoes[tocadas]] += parcial[m].to_numpy()[tocadas]
+        medidas[m] = v
+    return pd.concat([antigo.assign(**medidas), parcial[~tocadas]], ignore_index=True)
+
+
+# Agregações sobre uma fatia do cubo (compartilhadas entre gráficos, KPIs e o modo em blocos)
+def lancamentos_por_ano(c: pd.DataFrame) -> pd.Series:
+    return c.groupby('Year_of_Release')['n_nome'].sum()
+
+
+def jogos_por(c: pd.DataFrame, dimensao: str) -> pd.Series:
+    return c.groupby(dimensao, observed=True)['n_nome'].sum().sort_values(ascending=False)
+
+
+def vendas_por_regiao(c: pd.DataFrame) -> pd.Series:
+    return c[[v for v in VENDAS if v != 'Global_Sales' and v in c.columns]].sum()
+
+
+def vendas_por_classificacao(c: pd.DataFrame) -> pd.Series:
+    return c.groupby('Rating', observed=True)['Global_Sales'].sum().sort_values(ascending=False)
+
+
+def kpis(c: pd.DataFrame) -> dict:
+    return {
+        'jogos': int(c['n_linhas'].sum()),
+        'vendas_globais': float(c['Global_Sales'].sum()),
+        'generos': int(c['Genre'].nunique()),
+    }
+
+
+# Linhas anexadas à base só somam as células do delta ao cubo já construído; com a base mapeada
+# (GAMES_MMAP), o cubo também é gravado e compartilhado entre os processos
+incremental('cubo', lambda antigo, df, delta: somar(alinhar(antigo, df), construir(delta)))
+compartilhar('cubo', versao=4)
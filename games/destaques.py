@@ -0,0 +1,126 @@
+# Destaques por jogo no filtro: as maiores discrepâncias entre a nota dos críticos e a dos usuários e o jogo
+# mais vendido de cada gênero ou plataforma. Nada ordena todas as linhas: as discrepâncias saem de uma
+# seleção parcial (ranking.top_k) e os mais vendidos de um argmax por grupo numa passada (groupby.idxmax).
+# Tudo fica em cache por filtro.
+#
+# Discrepância: Critic_Score / 10 − User_Score (as duas notas na escala 0–10). Para que um jogo com duas ou
+# três avaliações não domine o topo, a diferença é puxada para a diferença média do filtro com peso fixo:
+# (n·dif + PESO·média) / (n + PESO), com n = 1 / (1/Critic_Count + 1/User_Count) (a variância de uma
+# diferença soma as das duas médias, então o lado com menos avaliações manda). Jogos com muitas avaliações
+# dos dois lados ficam com a própria diferença; com poucas de um dos lados (ou sem contagem), perto da média.
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from games.filtros import VisaoFiltrada, resultado
+from games.instrumentacao import etapa
+from games.ranking import top_k
+
+DIRECOES = {
+    'ambos': 'Maior diferença (qualquer lado)',
+    'criticos': 'Críticos acima dos usuários',
+    'usuarios': 'Usuários acima dos críticos',
+}
+# Avaliações "virtuais" com a diferença média do filtro somadas a cada jogo (perto do n da mediana de
+# Critic_Count e User_Count na base original, ~24 e ~27)
+PESO_DISCREPANCIA = 12
+GRUPOS_VENDAS = {'Genre': 'Gênero', 'Platform': 'Plataforma'}
+DETALHES = ['Name', 'Platform', 'Genre', 'Year_of_Release', 'Publisher']
+
+
+@dataclass(frozen=True)
+class NotasPareadas:
+    # Jogos do filtro com as duas notas (posições em visao.linhas) e as notas na escala 0–10
+    posicoes: np.ndarray
+    criticos: np.ndarray
+    usuarios: np.ndarray
+    criticos_n: np.ndarray
+    usuarios_n: np.ndarray
+    diferenca: np.ndarray
+    diferenca_ajustada: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, c).nbytes for c in self.__dataclass_fields__)
+
+
+def _encolher(x: np.ndarray, n: np.ndarray, peso: float) -> np.ndarray:
+    total = n.sum()
+    media = (x * n).sum() / total if total > 0 else x.mean()
+    return (n * x + peso * media) / (n + peso)
+
+
+def notas_pareadas(visao: VisaoFiltrada) -> NotasPareadas:
+    def construir():
+        with etapa('destaques:notas_pareadas') as info:
+            def numeros(coluna: str) -> np.ndarray:
+                return visao[coluna].to_numpy(dtype=float, na_value=np.nan)
+
+            criticos, usuarios = numeros('Critic_Score'), numeros('User_Score')
+            posicoes = np.flatnonzero(~(np.isnan(criticos) | np.isnan(usuarios)))
+            info['linhas'] = len(posicoes)
+            criticos, usuarios = criticos[posicoes] / 10.0, usuarios[posicoes]
+            # sem contagem de avaliações (ou com zero) de um dos lados, n = 0: fica a diferença média
+            criticos_n = np.nan_to_num(numeros('Critic_Count')[posicoes])
+            usuarios_n = np.nan_to_num(numeros('User_Count')[posicoes])
+            with np.errstate(divide='ignore'):
+                n = 1.0 / (1.0 / criticos_n + 1.0 / usuarios_n)
+            diferenca = criticos - usuarios
+            ajustada = _encolher(diferenca, n, PESO_DISCREPANCIA) if len(posicoes) else np.empty(0)
+            return NotasPareadas(posicoes, criticos, usuarios, criticos_n, usuarios_n, diferenca, ajustada)
+    return resultado(visao.df, visao.filtro, 'notas_pareadas', construir)
+
+
+def _detalhes(visao: VisaoFiltrada, posicoes: np.ndarray, sem: str | None = None) -> dict:
+    # Colunas descritivas dos jogos nas posições (da visão), com os tipos da base
+    d = visao.df.take(visao.linhas[posicoes])
+    return {c: d[c].array for c in DETALHES if c != sem and c in d.columns}
+
+
+def discrepancias(visao: VisaoFiltrada, direcao: str = 'ambos', k: int = 10) -> pd.DataFrame:
+    # Top-k jogos pela diferença ajustada entre críticos e usuários, já na ordem
+    def construir():
+        p = notas_pareadas(visao)
+        chave = {'ambos': np.abs, 'criticos': np.asarray, 'usuarios': np.negative}[direcao]
+        escolhidos = top_k(chave(p.diferenca_ajustada), k, np.ones(len(p.posicoes), dtype=bool))
+        return pd.DataFrame({
+            'posicao': np.arange(1, len(escolhidos) + 1),
+            **_detalhes(visao, p.posicoes[escolhidos]),
+            'nota_criticos': p.criticos[escolhidos],
+            'nota_usuarios': p.usuarios[escolhidos],
+            'Critic_Count': p.criticos_n[escolhidos],
+            'User_Count': p.usuarios_n[escolhidos],
+            'diferenca': p.diferenca[escolhidos],
+            'diferenca_ajustada': p.diferenca_ajustada[escolhidos],
+        })
+    return resultado(visao.df, visao.filtro, f'discrepancias:{direcao}:{k}', construir)
+
+
+def mais_vendidos(visao: VisaoFiltrada, coluna: str = 'Genre') -> pd.DataFrame:
+    # O jogo mais vendido de cada grupo (gênero ou plataforma) e a fatia dele nas vendas do grupo; grupos do
+    # mais vendido para o menos. Empates ficam com o primeiro jogo na ordem da base.
+    def construir():
+        with etapa(f'destaques:mais_vendidos:{coluna}') as info:
+            codigos = visao[coluna].cat.codes.to_numpy()
+            vendas = visao['Global_Sales'].to_numpy(dtype=float, na_value=np.nan)
+            validos = np.flatnonzero((codigos >= 0) & ~np.isnan(vendas))
+            info['linhas'] = len(validos)
+            categorias = visao.df[coluna].cat.categories
+            # argmax por grupo numa passada: o índice da Series são as posições na visão
+            vencedores = pd.Series(vendas[validos], index=validos).groupby(codigos[validos]).idxmax()
+            grupos, posicoes = vencedores.index.to_numpy(), vencedores.to_numpy()
+            totais = np.bincount(codigos[validos], weights=vendas[validos], minlength=len(categorias))
+            jogos = np.bincount(codigos[validos], minlength=len(categorias))
+            melhores = vendas[posicoes]
+            tabela = pd.DataFrame({
+                'grupo': categorias[grupos],
+                **_detalhes(visao, posicoes, sem=coluna),
+                'Global_Sales': melhores,
+                'jogos': jogos[grupos],
+                'vendas_grupo': totais[grupos],
+                'participacao': melhores / totais[grupos],
+            })
+            # uma linha por grupo (dezenas): ordenar aqui é barato
+            return tabela.sort_values('Global_Sales', ascending=False, kind='stable').reset_index(drop=True)
+    return resultado(visao.df, visao.filtro, f'mais_vendidos:{coluna}', construir)
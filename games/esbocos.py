@@ -0,0 +1,129 @@
+# Esboços de quantis (DDSketch) das notas e das vendas por célula Ano × Plataforma × Gênero (as dimensões
+# dos filtros da barra lateral; Rating, que só o cubo tem, multiplicaria as células sem servir a filtro).
+# Cada valor x > 0 cai no balde i = ⌈log_γ x⌉, com γ = (1 + α) / (1 − α); valores ≤ MINIMO caem num balde
+# do zero. Juntar esboços é somar as contagens dos baldes, então o esboço de qualquer filtro sai das células
+# selecionadas (e os de blocos ou linhas anexadas se combinam como o cubo). Filtros por publisher usam o
+# cálculo exato.
+#
+# Garantia: para o quantil q de n valores, o valor devolvido x̂ satisfaz |x̂ − x₍ₖ₎| ≤ α·x₍ₖ₎, com
+# x₍ₖ₎ a k-ésima menor observação e k = ⌊q·(n − 1)⌋ (a mediana exata do pandas interpola entre x₍ₖ₎ e
+# x₍ₖ₊₁₎ quando n é par). Valores ≤ MINIMO voltam como 0. Memória: um contador por (célula, medida, balde)
+# ocupado.
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from games.carga import VENDAS, compartilhar, derivado, incremental
+from games.cubo import DIMENSOES, alinhar, somar
+from games.filtros import Filtro, resultado, selecionar
+from games.instrumentacao import etapa
+
+ERRO_RELATIVO = float(os.environ.get('GAMES_ESBOCO_ERRO', 0.01))
+if not 0 < ERRO_RELATIVO < 1:
+    raise ValueError(f'GAMES_ESBOCO_ERRO precisa estar entre 0 e 1 (veio {ERRO_RELATIVO})')
+GAMA = (1 + ERRO_RELATIVO) / (1 - ERRO_RELATIVO)
+MINIMO = 1e-4
+CHAVES = DIMENSOES[:3]
+# int32: com α pequeno os índices dos baldes passam com folga da faixa do int16 (α = 0,001 já vai de
+# ≈ −4600 a ≈ +2300; α = 10⁻⁶, a ±10⁷)
+BALDE_ZERO = np.iinfo(np.int32).min
+# Notas só dos pares completos (como as somas suficientes do cubo e o dropna de medidas_centrais)
+MEDIDAS = ['Critic_Score', 'User_Score', *VENDAS]
+
+
+def baldes(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    b = np.full(len(x), BALDE_ZERO, dtype=np.int32)
+    pos = x > MINIMO
+    b[pos] = np.ceil(np.log(x[pos]) / np.log(GAMA))
+    return b
+
+
+def valores(b: np.ndarray) -> np.ndarray:
+    # Ponto do balde com erro relativo ≤ α para qualquer x dentro dele
+    b = np.asarray(b)
+    return np.where(b == BALDE_ZERO, 0.0, 2 * GAMA ** b.astype(float) / (GAMA + 1))
+
+
+def construir(df: pd.DataFrame) -> pd.DataFrame:
+    # Uma linha por (célula, medida, balde) ocupado, com a contagem de valores
+    par = df['Critic_Score'].notna().to_numpy() & df['User_Score'].notna().to_numpy()
+    partes = []
+    for medida in MEDIDAS:
+        v = df[medida].to_numpy(dtype=float, na_value=np.nan)
+        ok = par if medida in ('Critic_Score', 'User_Score') else ~np.isnan(v)
+        partes.append(df[CHAVES].iloc[np.flatnonzero(ok)].assign(
+            medida=pd.Categorical.from_codes(np.full(ok.sum(), MEDIDAS.index(medida)), MEDIDAS),
+            balde=baldes(v[ok]),
+        ))
+    base = pd.concat(partes, ignore_index=True)
+    base = base[base['Year_of_Release'].notna()]
+    g = base.groupby([*CHAVES, 'medida', 'balde'], observed=True, dropna=False, sort=False)
+    return g.size().rename('n').reset_index()
+
+
+def esbocos(df: pd.DataFrame) -> pd.DataFrame:
+    return derivado(df, 'esbocos', construir)
+
+
+def fatia_esbocos(df: pd.DataFrame, filtro: Filtro) -> dict[str, 'Esboco'] | None:
+    # Esboço de cada medida no filtro; None quando o filtro usa uma dimensão que os esboços não têm (publishers)
+    if filtro.publishers:
+        return None
+    e = esbocos(df)
+
+    def juntar():
+        with etapa('agregacao:esbocos') as info:
+            pos = selecionar(e, filtro)
+            info['linhas'] = len(pos)
+            # uma contagem por (medida, balde) ocupado: a soma dos esboços das células selecionadas. A chave
+            # ordena por medida e depois por balde (o do zero primeiro); só os pares que existem ocupam memória
+            chave = (e['medida'].cat.codes.to_numpy()[pos].astype(np.int64) << 32
+                     | e['balde'].to_numpy()[pos].astype(np.int64) - BALDE_ZERO)
+            unicas, inv = np.unique(chave, return_inverse=True)
+            contagens = np.bincount(inv, weights=e['n'].to_numpy()[pos], minlength=len(unicas)).astype(np.int64)
+            b = ((unicas & 0xFFFFFFFF) + BALDE_ZERO).astype(np.int32)
+            cortes = np.searchsorted(unicas >> 32, np.arange(len(MEDIDAS) + 1))
+            return {m: Esboco(b[i:j], contagens[i:j]) for m, i, j in zip(MEDIDAS, cortes[:-1], cortes[1:])}
+    return resultado(df, filtro, 'esbocos', juntar)
+
+
+@dataclass(frozen=True)
+class Esboco:
+    baldes: np.ndarray      # ordenados (o balde do zero vem primeiro)
+    contagens: np.ndarray
+
+    def juntar(self, outro: 'Esboco') -> 'Esboco':
+        b, inv = np.unique(np.concatenate([self.baldes, outro.baldes]), return_inverse=True)
+        return Esboco(b, np.bincount(inv, weights=np.concatenate([self.contagens, outro.contagens]),
+                                     minlength=len(b)).astype(np.int64))
+
+    @property
+    def n(self) -> int:
+        return int(self.contagens.sum())
+
+    def quantil(self, q):
+        # q escalar ou vetor em [0, 1]; NaN sem valores
+        q = np.asarray(q, dtype=float)
+        if self.n == 0:
+            return np.full(q.shape, np.nan) if q.ndim else float('nan')
+        k = np.floor(q * (self.n - 1))
+        x = valores(self.baldes[np.searchsorted(np.cumsum(self.contagens), k, side='right')])
+        return x if q.ndim else float(x)
+
+    def mediana(self) -> float:
+        return self.quantil(0.5)
+
+
+def quantis(df: pd.DataFrame, filtro: Filtro, medida: str, q):
+    # Quantis aproximados da medida no filtro; None se o filtro não puder usar os esboços
+    f = fatia_esbocos(df, filtro)
+    return None if f is None else f[medida].quantil(q)
+
+
+# Linhas anexadas só somam as contagens dos seus baldes
+incremental('esbocos',
+            lambda antigo, df, delta: somar(alinhar(antigo, df), construir(delta), [*CHAVES, 'medida', 'balde']))
+compartilhar('esbocos', versao=2)
@@ -0,0 +1,181 @@
+# Estatísticas calculadas a partir de somas suficientes (acumuláveis no cubo e entre blocos)
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Ajuste:
+    n: int
+    inclinacao: float
+    intercepto: float
+    r2: float
+    r: float
+
+    def prever(self, x):
+        return self.intercepto + self.inclinacao * np.asarray(x, dtype=float)
+
+
+@dataclass(frozen=True)
+class SomasPares:
+    # n, Σx, Σy, Σx², Σy², Σxy de pares (x, y) completos
+    n: float = 0.0
+    sx: float = 0.0
+    sy: float = 0.0
+    sxx: float = 0.0
+    syy: float = 0.0
+    sxy: float = 0.0
+
+    @classmethod
+    def de_arrays(cls, x, y) -> 'SomasPares':
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        ok = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[ok], y[ok]
+        return cls(len(x), x.sum(), y.sum(), x @ x, y @ y, x @ y)
+
+    @classmethod
+    def de_cubo(cls, cubo: pd.DataFrame, prefixo: str = 'notas') -> 'SomasPares':
+        # soma das colunas <prefixo>_n, _sx, ... das células (ver cubo.construir)
+        return cls(*(float(cubo[f'{prefixo}_{c}'].sum()) for c in ['n', 'sx', 'sy', 'sxx', 'syy', 'sxy']))
+
+    def __add__(self, outro: 'SomasPares') -> 'SomasPares':
+        return SomasPares(self.n + outro.n, self.sx + outro.sx, self.sy + outro.sy,
+                          self.sxx + outro.sxx, self.syy + outro.syy, self.sxy + outro.sxy)
+
+    def media(self) -> tuple[float, float]:
+        if self.n == 0:
+            return float('nan'), float('nan')
+        return self.sx / self.n, self.sy / self.n
+
+    def desvio(self) -> tuple[float, float]:
+        # desvio padrão amostral (ddof=1), como o std() do pandas
+        if self.n < 2:
+            return float('nan'), float('nan')
+        return (float(np.sqrt(max(self.sxx - self.sx ** 2 / self.n, 0.0) / (self.n - 1))),
+                float(np.sqrt(max(self.syy - self.sy ** 2 / self.n, 0.0) / (self.n - 1))))
+
+    def ajuste(self) -> Ajuste | None:
+        # Mínimos quadrados em forma fechada; None sem variação em x
+        if self.n < 2:
+            return None
+        cxx = self.sxx - self.sx ** 2 / self.n
+        cyy = self.syy - self.sy ** 2 / self.n
+        cxy = self.sxy - self.sx * self.sy / self.n
+        if cxx <= 0:
+            return None
+        b = cxy / cxx
+        a = (self.sy - b * self.sx) / self.n
+        r = cxy / np.sqrt(cxx * cyy) if cyy > 0 else float('nan')
+        return Ajuste(int(self.n), float(b), float(a), float(r * r), float(r))
+
+
+def _cauda_t(t, gl):
+    # P(T > t) da t de Student (scipy.special é bem mais leve de importar que scipy.stats)
+    from scipy.special import stdtr
+    return stdtr(gl, -np.asarray(t, dtype=float))
+
+
+def welch(n1, m1, v1, n2, m2, v2, alternativa: str = 'two-sided'):
+    # Teste t de Welch vetorizado a partir de (n, média, variância) de cada lado; mesmas convenções do
+    # ttest_ind(equal_var=False). Devolve arrays (t, graus de liberdade, p).
+    with np.errstate(divide='ignore', invalid='ignore'):
+        e1, e2 = np.asarray(v1, float) / n1, np.asarray(v2, float) / n2
+        t = (np.asarray(m1, float) - m2) / np.sqrt(e1 + e2)
+        gl = (e1 + e2) ** 2 / (e1 ** 2 / (np.asarray(n1, float) - 1) + e2 ** 2 / (np.asarray(n2, float) - 1))
+    if alternativa == 'greater':
+        p = _cauda_t(t, gl)
+    elif alternativa == 'less':
+        p = _cauda_t(-t, gl)
+    else:
+        p = np.minimum(2 * _cauda_t(np.abs(t), gl), 1.0)
+    return t, gl, p
+
+
+def _ajustar(p, ajuste) -> np.ndarray:
+    # aplica a correção só aos p-valores definidos (NaN segue NaN e não conta como teste)
+    p = np.asarray(p, dtype=float)
+    saida = np.full(p.shape, np.nan)
+    ok = ~np.isnan(p)
+    if ok.any():
+        q = p[ok]
+        ordem = np.argsort(q, kind='stable')
+        ajustados = np.empty(len(q))
+        ajustados[ordem] = np.clip(ajuste(q[ordem], len(q)), 0.0, 1.0)
+        saida[ok] = ajustados
+    return saida
+
+
+def bonferroni(p) -> np.ndarray:
+    return _ajustar(p, lambda q, m: q * m)
+
+
+def holm(p) -> np.ndarray:
+    # controle do erro familiar (FWER), uniformemente mais poderoso que Bonferroni
+    return _ajustar(p, lambda q, m: np.maximum.accumulate((m - np.arange(m)) * q))
+
+
+def benjamini_hochberg(p) -> np.ndarray:
+    # controle da taxa de falsas descobertas (FDR)
+    return _ajustar(p, lambda q, m: np.minimum.accumulate((q * m / np.arange(1, m + 1))[::-1])[::-1])
+
+
+CORRECOES = {'holm': holm, 'bh': benjamini_hochberg, 'bonferroni': bonferroni}
+
+
+@dataclass(frozen=True)
+class TesteT:
+    t: float
+    gl: float
+    p: float
+
+
+@dataclass(frozen=True)
+class SomasGrupos:
+    # n, Σx e Σx² de uma medida por grupo (ex.: vendas globais por gênero), somados das células do cubo
+    rotulos: np.ndarray
+    n: np.ndarray
+    s: np.ndarray
+    ss: np.ndarray
+
+    @classmethod
+    def de_cubo(cls, cubo: pd.DataFrame, chave, coluna: str = 'Global_Sales',
+                prefixo: str = 'vendas') -> 'SomasGrupos':
+        # chave: nome de coluna do cubo ou um rótulo por célula; grupos sem observações ficam de fora
+        chave = cubo[chave] if isinstance(chave, str) else chave
+        codigos, rotulos = pd.factorize(chave, sort=True)  # categóricas: usa os códigos, sem comparar textos
+        ok = codigos >= 0
+        somas = [np.bincount(codigos[ok], weights=cubo[c].to_numpy(dtype=float)[ok], minlength=len(rotulos))
+                 for c in (f'{prefixo}_n', coluna, f'{prefixo}_ss')]
+        com_dados = somas[0] > 0
+        return cls(np.asarray(rotulos, dtype=object)[com_dados], *(x[com_dados] for x in somas))
+
+    def __contains__(self, rotulo) -> bool:
+        return rotulo in set(self.rotulos)
+
+    def media(self) -> np.ndarray:
+        return self.s / self.n
+
+    def variancia(self) -> np.ndarray:
+        # ddof=1; NaN para grupos com uma observação
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.maximum(self.ss - self.s ** 2 / self.n, 0.0) / (self.n - 1)
+
+    def teste(self, a, b, alternativa: str = 'two-sided') -> TesteT:
+        i, j = (int(np.flatnonzero(self.rotulos == r)[0]) for r in (a, b))
+        m, v = self.media(), self.variancia()
+        t, gl, p = welch(self.n[i], m[i], v[i], self.n[j], m[j], v[j], alternativa)
+        return TesteT(float(t), float(gl), float(p))
+
+    def pares(self, correcao: str = 'holm') -> pd.DataFrame:
+        # Todos os pares de grupos de uma vez (bilateral), com p-valor corrigido para comparações múltiplas
+        i, j = np.triu_indices(len(self.rotulos), 1)
+        m, v = self.media(), self.variancia()
+        t, gl, p = welch(self.n[i], m[i], v[i], self.n[j], m[j], v[j])
+        return pd.DataFrame({
+            'grupo_a': self.rotulos[i], 'grupo_b': self.rotulos[j],
+            'n_a': self.n[i].astype(np.int64), 'n_b': self.n[j].astype(np.int64),
+            'media_a': m[i], 'media_b': m[j], 't': t, 'gl': gl, 'p': p,
+            'p_ajustado': CORRECOES[correcao](p),
+        })
@@ -0,0 +1,214 @@
+# Filtros da barra lateral, resolvidos por um índice construído uma vez por dataset
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from games.cache import CACHE_FILTROS
+from games.carga import assinatura, derivado, incremental
+from games.instrumentacao import etapa
+
+DIMENSOES = ['Platform', 'Genre', 'Publisher']
+# Acima disso o índice de uma base com anexos é reconstruído inteiro (custo amortizado entre os deltas)
+MAX_SEGMENTOS = 8
+
+
+@dataclass(frozen=True)
+class Filtro:
+    # Estado dos filtros em forma canônica: sessões com a mesma escolha geram a mesma chave de cache.
+    # Plataformas/gêneros = None equivale a marcar todas as opções (uso fora da página, ex.: linha de comando).
+    periodo: tuple[int, int]
+    plataformas: tuple[str, ...] | None
+    generos: tuple[str, ...] | None
+    publishers: tuple[str, ...] = ()
+
+    @classmethod
+    def normalizar(cls, periodo, plataformas, generos, publishers=()) -> 'Filtro':
+        return cls(
+            (int(periodo[0]), int(periodo[1])),
+            None if plataformas is None else tuple(sorted(set(plataformas))),
+            None if generos is None else tuple(sorted(set(generos))),
+            tuple(sorted(set(publishers or ()))),
+        )
+
+
+def opcoes(df: pd.DataFrame, coluna: str) -> list[str]:
+    # Em ordem alfabética (depois de anexos, categorias novas ficam no fim da tabela; ver games.anexos)
+    return sorted(df[coluna].cat.categories) if coluna in df.columns else []
+
+
+def _dimensoes(df: pd.DataFrame) -> list[str]:
+    # Tabelas derivadas com menos dimensões (ex.: esboços de quantis) também podem ser filtradas
+    return [c for c in DIMENSOES if c in df.columns]
+
+
+def _tabelas_codigos(df: pd.DataFrame) -> dict[str, dict[str, int]]:
+    return {c: {v: i for i, v in enumerate(df[c].cat.categories)} for c in _dimensoes(df)}
+
+
+def codigos(df: pd.DataFrame, coluna: str, valores) -> np.ndarray:
+    # Traduz os valores escolhidos para os códigos da tabela de categorias (valores ausentes são ignorados)
+    if valores is None:
+        return np.arange(len(df[coluna].cat.categories), dtype=np.intp)
+    tabela = derivado(df, 'tabelas_codigos', _tabelas_codigos)[coluna]
+    return np.array([tabela[v] for v in valores if v in tabela], dtype=np.intp)
+
+
+class IndiceFiltros:
+    # Linhas com ano ordenadas por ano + listas de posições (nessa ordem) por categoria de cada dimensão,
+    # guardadas de forma contígua com o deslocamento de cada (categoria, ano). Um filtro vira: faixa de
+    # anos por busca binária, fatia das listas da dimensão mais seletiva e conferência das demais
+    # dimensões por tabela de consulta sobre os códigos.
+    def __init__(self, df: pd.DataFrame):
+        anos = df['Year_of_Release']
+        com_ano = np.flatnonzero(anos.notna().to_numpy())
+        valores = anos.to_numpy(dtype='int64', na_value=0)[com_ano]
+        ordem = np.argsort(valores, kind='stable')
+        self.linhas = com_ano[ordem]   # posição original de cada linha, em ordem de ano
+        self.anos = np.unique(valores)
+        idx_ano = np.searchsorted(self.anos, valores[ordem])
+        n_anos = len(self.anos)
+        self.inicio_ano = np.searchsorted(idx_ano, np.arange(n_anos + 1))
+
+        self.categorias = {dim: df[dim].cat.categories for dim in _dimensoes(df)}
+        self.codigos = {}
+        self.posicoes = {}
+        self.deslocamentos = {}
+        for dim in self.categorias:
+            cod = df[dim].cat.codes.to_numpy()[self.linhas]
+            n_cat = len(df[dim].cat.categories)
+            validos = cod >= 0
+            # ordena por (categoria, posição); linhas sem categoria ficam de fora das listas
+            por_cat = np.flatnonzero(validos)[np.argsort(cod[validos], kind='stable')].astype(np.int32)
+            contagem = np.bincount(cod[validos].astype(np.intp) * n_anos + idx_ano[validos],
+                                   minlength=n_cat * n_anos).reshape(n_cat, n_anos)
+            desloc = np.zeros((n_cat, n_anos + 1), dtype=np.int64)
+            np.cumsum(contagem, axis=1, out=desloc[:, 1:])
+            desloc += np.concatenate([[0], np.cumsum(contagem.sum(axis=1))[:-1]])[:, None]
+            self.codigos[dim] = cod
+            self.posicoes[dim] = por_cat
+            self.deslocamentos[dim] = desloc
+
+    def selecionar(self, periodo, selecoes: dict[str, np.ndarray]) -> np.ndarray:
+        # selecoes: dimensão -> códigos escolhidos; dimensões ausentes não filtram
+        k0 = np.searchsorted(self.anos, periodo[0], side='left')
+        k1 = np.searchsorted(self.anos, periodo[1], side='right')
+        if k0 >= k1 or any(len(c) == 0 for c in selecoes.values()):
+            return np.empty(0, dtype=np.intp)
+
+        # a dimensão mais seletiva gera os candidatos; como cada linha tem uma só categoria,
+        # a união das categorias escolhidas é apenas a concatenação das fatias
+        tamanhos = {dim: int((self.deslocamentos[dim][cods, k1] - self.deslocamentos[dim][cods, k0]).sum())
+                    for dim, cods in selecoes.items()}
+        if selecoes:
+            base = min(tamanhos, key=tamanhos.get)
+            desloc, pos = self.deslocamentos[base], self.posicoes[base]
+            cand = np.concatenate([pos[desloc[c, k0]:desloc[c, k1]] for c in selecoes[base]])
+        else:
+            base = None
+            cand = np.arange(self.inicio_ano[k0], self.inicio_ano[k1])
+
+        for dim, cods in selecoes.items():
+            if dim == base:
+                continue
+            tabela = np.zeros(len(self.deslocamentos[dim]) + 1, dtype=bool)
+            tabela[cods + 1] = True  # código -1 (ausente) cai na posição 0, sempre False
+            cand = cand[tabela[self.codigos[dim][cand] + 1]]
+        return np.sort(self.linhas[cand])
+
+
+class IndiceSegmentado:
+    # Índice de uma base que cresceu por anexos: um IndiceFiltros por faixa de linhas (a base e cada
+    # delta), cada um com a própria tabela de categorias. Os códigos escolhidos são traduzidos para a
+    # tabela de cada segmento; como as faixas são disjuntas e crescentes, basta concatenar os resultados.
+    def __init__(self, segmentos: list[tuple[int, IndiceFiltros]], df: pd.DataFrame):
+        self.segmentos = segmentos
+        self.traducoes = []
+        for _, seg in segmentos:
+            traducao = {}
+            for dim in seg.categorias:
+                mapa = np.full(len(df[dim].cat.categories), -1, dtype=np.intp)
+                mapa[df[dim].cat.categories.get_indexer(seg.categorias[dim])] = np.arange(len(seg.categorias[dim]))
+                traducao[dim] = mapa
+            self.traducoes.append(traducao)
+
+    def selecionar(self, periodo, selecoes: dict[str, np.ndarray]) -> np.ndarray:
+        partes = []
+        for (inicio, seg), traducao in zip(self.segmentos, self.traducoes):
+            locais = {dim: traducao[dim][cods] for dim, cods in selecoes.items()}
+            locais = {dim: cods[cods >= 0] for dim, cods in locais.items()}
+            partes.append(seg.selecionar(periodo, locais) + inicio)
+        return np.concatenate(partes)
+
+
+def _anexar_indice(antigo, df: pd.DataFrame, delta: pd.DataFrame):
+    segmentos = antigo.segmentos if isinstance(antigo, IndiceSegmentado) else [(0, antigo)]
+    if len(segmentos) >= MAX_SEGMENTOS:
+        return IndiceFiltros(df)
+    return IndiceSegmentado([*segmentos, (len(df) - len(delta), IndiceFiltros(delta))], df)
+
+
+incremental('indice_filtros', _anexar_indice)
+
+
+def indice(df: pd.DataFrame) -> IndiceFiltros | IndiceSegmentado:
+    return derivado(df, 'indice_filtros', IndiceFiltros)
+
+
+def resultado(df: pd.DataFrame, filtro: Filtro, nome: str, construtor):
+    # Resultados derivados de um filtro, compartilhados entre sessões pelo cache LRU
+    return CACHE_FILTROS.obter((assinatura(df), filtro, nome), construtor)
+
+
+def _selecionar(df: pd.DataFrame, filtro: Filtro) -> np.ndarray:
+    selecoes = {
+        'Platform': codigos(df, 'Platform', filtro.plataformas),
+        'Genre': codigos(df, 'Genre', filtro.generos),
+    }
+    if filtro.publishers:
+        selecoes['Publisher'] = codigos(df, 'Publisher', filtro.publishers)
+    return indice(df).selecionar(filtro.periodo, selecoes)
+
+
+def selecionar(df: pd.DataFrame, filtro: Filtro) -> np.ndarray:
+    # Posições (em ordem original) das linhas que passam pelos filtros da barra lateral
+    return resultado(df, filtro, 'linhas', lambda: _selecionar(df, filtro))
+
+
+class VisaoFiltrada:
+    # Visão preguiçosa das linhas filtradas: cada análise pede só as colunas que usa, e cada coluna é
+    # reunida uma única vez por filtro (cache compartilhado), sem cópia defensiva do DataFrame inteiro
+    def __init__(self, df: pd.DataFrame, filtro: Filtro):
+        self.df = df
+        self.filtro = filtro
+        self.linhas = selecionar(df, filtro)
+        self._todas = len(self.linhas) == len(df)  # posições únicas e ordenadas: é o próprio df
+
+    @property
+    def columns(self) -> pd.Index:
+        return self.df.columns
+
+    def __len__(self):
+        return len(self.linhas)
+
+    def _indice(self) -> pd.Index:
+        if self._todas:
+            return self.df.index
+        return resultado(self.df, self.filtro, 'indice', lambda: self.df.index.take(self.linhas))
+
+    def coluna(self, nome: str) -> pd.Series:
+        if self._todas:
+            return self.df[nome]
+        return resultado(self.df, self.filtro, f'coluna:{nome}', lambda: self._reunir(nome))
+
+    def _reunir(self, nome: str) -> pd.Series:
+        with etapa(f'copia:{nome}', len(self.linhas)):
+            return pd.Series(self.df[nome].array.take(self.linhas), index=self._indice(), name=nome)
+
+    def __getitem__(self, chave):
+        if isinstance(chave, str):
+            return self.coluna(chave)
+        return pd.DataFrame({c: self.coluna(c) for c in chave})
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return self.df.take(self.linhas[:n])
@@ -0,0 +1,488 @@
+# Figuras Plotly das análises, construídas a partir da visão filtrada e guardadas em cache por (análise, filtro).
+# O Plotly só é importado quando uma figura precisa ser construída (acertos de cache não pagam a importação).
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from games import analises
+from games.cache import CacheLRU
+from games.carga import assinatura
+from games.destaques import DIRECOES, GRUPOS_VENDAS
+from games.estatistica import CORRECOES, Ajuste
+from games.filtros import VisaoFiltrada, resultado
+from games.instrumentacao import etapa
+from games.ranking import GRUPOS, METRICAS, MINIMO_LANCAMENTOS
+
+# Figuras prontas, limitadas pelo tamanho do JSON que vai ao navegador
+CACHE_FIGURAS = CacheLRU(int(os.environ.get('GAMES_CACHE_FIGURAS_MB', 128)) * 2**20)
+
+# Dispersões grandes: WebGL acima de LIMIAR_WEBGL pontos, amostra estratificada (com outliers) acima de
+# LIMIAR_AMOSTRA e mapa de densidade 2D calculado no servidor acima de LIMIAR_DENSIDADE.
+# O payload fica limitado a MAX_PONTOS pontos (ou BINS_DENSIDADE² células) qualquer que seja o tamanho da base.
+# A redução é opcional (reduzir=False, ou a opção na página): os limiares só valem quando ela está ligada.
+LIMIAR_WEBGL = int(os.environ.get('GAMES_SCATTER_WEBGL', 1_000))
+LIMIAR_AMOSTRA = int(os.environ.get('GAMES_SCATTER_AMOSTRA', 20_000))
+LIMIAR_DENSIDADE = int(os.environ.get('GAMES_SCATTER_DENSIDADE', 200_000))
+MAX_PONTOS = int(os.environ.get('GAMES_SCATTER_MAX_PONTOS', 10_000))
+BINS_DENSIDADE = 100
+# Box plots: acima de LIMIAR_BOX jogos, quartis, bigodes e uma amostra de até MAX_OUTLIERS_BOX outliers por
+# grupo são calculados no servidor e enviados como caixas prontas, em vez de todas as linhas
+LIMIAR_BOX = int(os.environ.get('GAMES_BOX_RESUMO', 2_000))
+MAX_OUTLIERS_BOX = int(os.environ.get('GAMES_BOX_MAX_OUTLIERS', 300))
+# Tamanho inicial do ranking de publishers/developers
+TOP_RANKING = 10
+# Tamanho inicial da lista de discrepâncias entre críticos e usuários
+TOP_DISCREPANCIAS = 10
+
+
+def _outliers(x: np.ndarray, y: np.ndarray, z: float = 3.0) -> np.ndarray:
+    zx = np.abs(x - x.mean()) / (x.std() or 1.0)
+    zy = np.abs(y - y.mean()) / (y.std() or 1.0)
+    return (zx > z) | (zy > z)
+
+
+def amostra_estratificada(x: np.ndarray, y: np.ndarray, n_max: int, bins: int = 50, seed: int = 0) -> np.ndarray:
+    # Posições de uma amostra de até ~n_max pontos: cota proporcional por célula de uma grade 2D (mínimo 1,
+    # para não apagar regiões esparsas) + todos os outliers (|z| > 3), limitados a 1/5 da amostra
+    n = len(x)
+    if n <= n_max:
+        return np.arange(n)
+    rng = np.random.default_rng(seed)
+    cx = np.clip(((x - x.min()) / (np.ptp(x) or 1.0) * bins).astype(np.intp), 0, bins - 1)
+    cy = np.clip(((y - y.min()) / (np.ptp(y) or 1.0) * bins).astype(np.intp), 0, bins - 1)
+    celula = cx * bins + cy
+    contagem = np.bincount(celula, minlength=bins * bins)
+    cota = np.maximum(np.floor(contagem * (n_max * 0.8 / n)), contagem > 0)
+
+    # posição de cada ponto dentro da sua célula, em ordem aleatória
+    ordem = np.lexsort((rng.random(n), celula))
+    inicio = np.concatenate([[0], np.cumsum(contagem)[:-1]])
+    rank = np.empty(n, dtype=np.intp)
+    rank[ordem] = np.arange(n) - inicio[celula[ordem]]
+    manter = rank < cota[celula]
+
+    fora = np.flatnonzero(_outliers(x, y) & ~manter)
+    if len(fora) > n_max // 5:
+        fora = rng.choice(fora, n_max // 5, replace=False)
+    manter[fora] = True
+    return np.flatnonzero(manter)
+
+
+def _linha_tendencia(fig, xs: np.ndarray, ajuste: Ajuste | None):
+    # Reta OLS calculada em forma fechada (estatistica.SomasPares), sem statsmodels
+    import plotly.graph_objects as go
+
+    if ajuste is None or len(xs) == 0:
+        return fig
+    x = np.array([np.nanmin(xs), np.nanmax(xs)])
+    fig.add_trace(go.Scatter(
+        x=x, y=ajuste.prever(x), mode='lines', name='OLS', showlegend=False,
+        line={'color': '#FFA15A'},
+        hovertemplate=(f'<b>OLS</b><br>y = {ajuste.inclinacao:.3f}·x + {ajuste.intercepto:.3f}'
+                       f'<br>R² = {ajuste.r2:.3f} · r = {ajuste.r:.3f}<extra></extra>'),
+    ))
+    return fig
+
+
+def _densidade(d: pd.DataFrame, x: str, y: str, titulo: str, labels: dict):
+    import plotly.graph_objects as go
+
+    xs, ys = d[x].to_numpy(dtype=float), d[y].to_numpy(dtype=float)
+    z, ex, ey = np.histogram2d(xs, ys, bins=BINS_DENSIDADE)
+    fig = go.Figure(go.Heatmap(
+        x=(ex[:-1] + ex[1:]) / 2, y=(ey[:-1] + ey[1:]) / 2, z=np.where(z > 0, z, np.nan).T,
+        colorscale='Viridis', colorbar={'title': 'Jogos'}, hovertemplate='x=%{x:.2f}<br>y=%{y:.2f}<br>jogos=%{z}<extra></extra>',
+    ))
+    fora = np.flatnonzero(_outliers(xs, ys))
+    if len(fora) > MAX_PONTOS:
+        fora = np.random.default_rng(0).choice(fora, MAX_PONTOS, replace=False)
+    if len(fora):
+        fig.add_trace(go.Scattergl(x=xs[fora], y=ys[fora], mode='markers', name='Outliers',
+                                   marker={'size': 4, 'color': '#EF553B'}))
+    fig.update_layout(
+        title=f'{titulo} — densidade de {len(d):,} jogos'.replace(',', '.'),
+        xaxis_title=labels.get(x, x), yaxis_title=labels.get(y, y),
+    )
+    return fig
+
+
+def dispersao(d: pd.DataFrame, x: str, y: str, titulo: str, labels: dict, hover_data=None,
+              ajuste: Ajuste | None = None, reduzir: bool = True):
+    # Scatter cujo payload não cresce com a base (ver limiares acima); a reta usa o ajuste da base inteira.
+    # Sem reduzir, todos os pontos vão ao navegador (só o WebGL continua acima de LIMIAR_WEBGL)
+    import plotly.express as px
+
+    n = len(d)
+    xs = d[x].to_numpy(dtype=float)
+    if reduzir and n > LIMIAR_DENSIDADE:
+        return _linha_tendencia(_densidade(d, x, y, titulo, labels), xs, ajuste)
+    if reduzir and n > LIMIAR_AMOSTRA:
+        d = d.iloc[amostra_estratificada(xs, d[y].to_numpy(dtype=float), MAX_PONTOS)]
+        titulo = f'{titulo} — amostra de {len(d):,} de {n:,} jogos'.replace(',', '.')
+    fig = px.scatter(
+        d, x=x, y=y, hover_data=hover_data, title=titulo, labels=labels,
+        render_mode='webgl' if n > LIMIAR_WEBGL else 'svg',
+    )
+    return _linha_tendencia(fig, xs, ajuste)
+
+
+def tendencia_lancamentos(visao: VisaoFiltrada):
+    import plotly.express as px
+
+    s = analises.lancamentos(visao).reset_index(name='Name')
+    if s.empty:
+        return None
+    fig = px.line(
+        s, x='Year_of_Release', y='Name', markers=True,
+        title='Tendência de Lançamentos por Ano',
+        labels={'Year_of_Release': 'Ano', 'Name': 'Qtde de jogos'}
+    )
+    fig.update_layout(template='plotly_dark')
+    return fig
+
+
+def generos_populares(visao: VisaoFiltrada):
+    import plotly.express as px
+
+    s = analises.jogos_por_genero(visao).reset_index(name='Name')
+    if s.empty:
+        return None
+    fig = px.bar(
+        s, x='Genre', y='Name', text='Name',
+        title='Gêneros Mais Populares (por nº de jogos)',
+        labels={'Genre': 'Gênero', 'Name':'Qtde de jogos'}
+    )
+    fig.update_traces(textposition='outside')
+    fig.update_layout(template='plotly_dark', xaxis_tickangle=30)
+    return fig
+
+
+def lancamentos_plataformas(visao: VisaoFiltrada):
+    import plotly.express as px
+
+    s = analises.jogos_por_plataforma(visao).reset_index(name='Name')
+    if s.empty:
+        return None
+    fig = px.bar(
+        s, x='Platform', y='Name', text='Name',
+        title='Plataformas com Mais Lançamentos',
+        labels={'Platform': 'Plataforma', 'Name':'Qtde de jogos'}
+    )
+    fig.update_traces(textposition='outside')
+    fig.update_layout(template='plotly_dark')
+    return fig
+
+
+def vendas_globais(visao: VisaoFiltrada):
+    import plotly.express as px
+
+    top = analises.top_vendas(visao)
+    if top.empty:
+        return None
+    fig = px.bar(
+        top[::-1],  # inverte para mostrar o 1º no topo
+        x='Global_Sales', y='Name',
+        orientation='h', text='Global_Sales',
+        title='Top 10 Jogos por Vendas Globais (milhões)',
+        labels={'Global_Sales':'Vendas globais (mi)', 'Name':'Jogo'}
+    )
+    fig.update_traces(texttemplate='%{text:.2f}')
+    fig.update_layout(template='plotly_dark', yaxis={'categoryorder':'total ascending'})
+    return fig
+
+
+def vendas_regiao(visao: VisaoFiltrada):
+    import plotly.express as px
+
+    s = analises.vendas_regiao(visao)
+    if s.empty:
+        return None
+    s = s.reset_index()
+    s.columns = ['Região','Vendas']
+    fig = px.bar(
+        s, x='Região', y='Vendas', text='Vendas',
+        title='Distribuição de Vendas por Região (milhões)',
+        labels={'Vendas':'Vendas (mi)'}
+    )
+    fig.update_traces(texttemplate='%{text:.1f}', textposition='outside')
+    fig.update_layout(template='plotly_dark')
+    return fig
+
+
+def correlacao_notas(visao: VisaoFiltrada, reduzir: bool = True):
+    d = visao[['Critic_Score','User_Score','Name','Platform','Genre']].dropna()
+    if d.empty:
+        return None
+    d = d.assign(Critic_Score_10 = d['Critic_Score'] / 10.0)
+    fig = dispersao(
+        d, x='Critic_Score_10', y='User_Score',
+        hover_data=['Name','Platform','Genre'],
+        ajuste=analises.ajuste_notas(visao), reduzir=reduzir,
+        titulo='Correlação: Nota de Críticos (0–10) x Usuários (0–10)',
+        labels={'Critic_Score_10':'Críticos (0–10)', 'User_Score':'Usuários (0–10)'}
+    )
+    fig.update_layout(template='plotly_dark')
+    return fig
+
+
+def vendas_classificacao_etaria(visao: VisaoFiltrada):
+    import plotly.express as px
+
+    s = analises.vendas_classificacao(visao)
+    if s is None:
+        return None
+    s = s.reset_index()
+    fig = px.bar(
+        s, x='Rating', y='Global_Sales', text='Global_Sales',
+        title='Vendas Globais por Classificação Etária (milhões)',
+        labels={'Rating':'Rating', 'Global_Sales':'Vendas (mi)'}
+    )
+    fig.update_traces(texttemplate='%{text:.1f}', textposition='outside')
+    fig.update_layout(template='plotly_dark')
+    return fig
+
+
+def medidas_notas(visao: VisaoFiltrada, reduzir: bool = True):
+    notas = visao[['Critic_Score','User_Score']].dropna()
+    if notas.empty:
+        return None
+    notas = notas.assign(Critic_Score_10 = notas['Critic_Score'] / 10.0)
+    fig = dispersao(
+        notas, x='Critic_Score_10', y='User_Score',
+        titulo="Correlação: Críticos (0–10) x Usuários (0–10)",
+        labels={'Critic_Score_10':'Críticos (0–10)', 'User_Score':'Usuários (0–10)'},
+        ajuste=analises.ajuste_notas(visao), reduzir=reduzir,
+    )
+    fig.update_layout(template='plotly_dark')
+    return fig
+
+
+def medidas_regioes(visao: VisaoFiltrada):
+    import plotly.express as px
+
+    if not analises.colunas_regioes(visao):
+        return None
+    means = analises.medias_regioes(visao).rename_axis("Região").reset_index(name="Média_Vendas")
+    fig = px.bar(
+        means, x='Região', y='Média_Vendas', text='Média_Vendas',
+        title="Médias de Vendas por Região (mi por jogo)",
+        labels={'Média_Vendas':'Média (mi)'}
+    )
+    fig.update_traces(texttemplate='%{text:.2f}', textposition='outside')
+    fig.update_layout(template='plotly_dark')
+    return fig
+
+
+@dataclass(frozen=True)
+class ResumoBox:
+    n: int
+    q1: float
+    mediana: float
+    q3: float
+    inferior: float          # bigodes: valores extremos dentro de 1,5 × IQR (como no Plotly)
+    superior: float
+    outliers: np.ndarray     # amostra dos pontos fora dos bigodes
+    n_outliers: int
+
+
+def resumo_box(x: np.ndarray, max_outliers: int = MAX_OUTLIERS_BOX) -> ResumoBox:
+    # Mesmas regras do px.box (quartis 'linear'); a amostra de outliers é espaçada por posto e mantém os extremos
+    x = np.sort(x)
+    q1, mediana, q3 = np.quantile(x, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    lo = np.searchsorted(x, q1 - 1.5 * iqr, side='left')
+    hi = np.searchsorted(x, q3 + 1.5 * iqr, side='right')
+    fora = np.concatenate([x[:lo], x[hi:]])
+    if len(fora) > max_outliers:
+        fora = fora[np.unique(np.linspace(0, len(fora) - 1, max_outliers).round().astype(np.intp))]
+    return ResumoBox(len(x), float(q1), float(mediana), float(q3), float(x[lo]), float(x[hi - 1]),
+                     fora, int(len(x) - (hi - lo)))
+
+
+def resumo_box_vendas(visao: VisaoFiltrada, agrupamento: str, grupo: str) -> ResumoBox | None:
+    def construir():
+        x = analises.amostra_vendas(visao, agrupamento, grupo)
+        return resumo_box(x) if len(x) else None
+    return resultado(visao.df, visao.filtro, f'box:{agrupamento}:{grupo}', construir)
+
+
+def _box_resumido(resumos: dict, titulo: str, rotulo_x: str):
+    # Caixas pré-calculadas (go.Box com q1/median/q3/fences) + outliers amostrados como marcadores
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+
+    cor = qualitative.Plotly[0]
+    fig = go.Figure()
+    amostrados = 0
+    for nome, r in resumos.items():
+        fig.add_trace(go.Box(
+            x=[nome], q1=[r.q1], median=[r.mediana], q3=[r.q3], lowerfence=[r.inferior],
+            upperfence=[r.superior], name=nome, marker_color=cor, boxpoints=False,
+        ))
+        fig.add_trace(go.Scatter(
+            x=np.full(len(r.outliers), nome, dtype=object), y=r.outliers, mode='markers', name=nome,
+            marker=dict(color=cor, size=4), hovertemplate='%{y:.2f} mi<extra></extra>',
+        ))
+        amostrados += r.n_outliers - len(r.outliers)
+    if amostrados:
+        mostrados = sum(len(r.outliers) for r in resumos.values())
+        titulo = f'{titulo} — outliers: amostra de {mostrados:,} de {mostrados + amostrados:,}'.replace(',', '.')
+    fig.update_layout(title=titulo, xaxis_title=rotulo_x, yaxis_title='Vendas Globais (mi)',
+                      showlegend=False, template='plotly_dark')
+    return fig
+
+
+def _box_grupos(visao: VisaoFiltrada, agrupamento: str, grupos: list[str], titulo: str, rotulo_x: str):
+    # Modo resumido quando os grupos juntos passam de LIMIAR_BOX jogos (contagem vinda do cubo); senão None
+    g = analises.grupos_vendas(visao, agrupamento)
+    if sum(int(g.n[list(g.rotulos).index(x)]) for x in grupos if x in g) <= LIMIAR_BOX:
+        return None
+    resumos = {x: r for x in grupos if (r := resumo_box_vendas(visao, agrupamento, x)) is not None}
+    return _box_resumido(resumos, titulo, rotulo_x)
+
+
+def box_acao_vs_rpg(visao: VisaoFiltrada):
+    import plotly.express as px
+
+    fig = _box_grupos(visao, 'Genre', ['Action', 'Role-Playing'],
+                      "Distribuição de Vendas Globais: Ação vs RPG", 'Gênero')
+    if fig is not None:
+        return fig
+    data = visao[['Genre','Global_Sales']]
+    subset = data[data['Genre'].isin(['Action','Role-Playing'])]
+    fig = px.box(subset, x='Genre', y='Global_Sales',
+                 title="Distribuição de Vendas Globais: Ação vs RPG",
+                 labels={'Global_Sales': 'Vendas Globais (mi)', 'Genre': 'Gênero'})
+    fig.update_layout(template='plotly_dark')
+    return fig
+
+
+def box_antigos_vs_atuais(visao: VisaoFiltrada):
+    import plotly.express as px
+
+    fig = _box_grupos(visao, 'Era2010', ['Até 2010', 'Após 2010'],
+                      "Distribuição de Vendas Globais: Jogos Antigos vs Atuais", 'Período')
+    if fig is not None:
+        return fig
+    data = visao[['Year_of_Release','Global_Sales']]
+    subset = data[data['Year_of_Release'].notna()].copy()
+    subset['Era'] = subset['Year_of_Release'].apply(lambda x: 'Até 2010' if x <= 2010 else 'Após 2010')
+    fig = px.box(subset, x='Era', y='Global_Sales',
+                 title="Distribuição de Vendas Globais: Jogos Antigos vs Atuais",
+                 labels={'Global_Sales': 'Vendas Globais (mi)', 'Era': 'Período'})
+    fig.update_layout(template='plotly_dark')
+    return fig
+
+
+def matriz_pares(visao: VisaoFiltrada, agrupamento: str, correcao: str):
+    import plotly.graph_objects as go
+
+    pares = analises.pares_vendas(visao, agrupamento, correcao)
+    if pares.empty:
+        return None
+    rotulos = list(dict.fromkeys([*pares['grupo_a'], *pares['grupo_b']]))
+    pos = {r: i for i, r in enumerate(rotulos)}
+    matriz = np.full((len(rotulos), len(rotulos)), np.nan)
+    i, j = pares['grupo_a'].map(pos).to_numpy(), pares['grupo_b'].map(pos).to_numpy()
+    matriz[i, j] = matriz[j, i] = pares['p_ajustado'].to_numpy()
+    fig = go.Figure(go.Heatmap(
+        z=matriz, x=rotulos, y=rotulos, zmin=0, zmax=1, colorscale='Viridis_r',
+        colorbar={'title': 'p ajustado'},
+        hovertemplate='%{y} × %{x}<br>p ajustado = %{z:.4f}<extra></extra>',
+    ))
+    fig.update_layout(
+        template='plotly_dark', yaxis={'autorange': 'reversed'},
+        title=f'Vendas Globais — p-valores ajustados por par ({analises.AGRUPAMENTOS[agrupamento][0]})',
+    )
+    return fig
+
+
+def ranking_empresas(visao: VisaoFiltrada, coluna: str, metrica: str, k: int, minimo: int):
+    import plotly.express as px
+
+    tabela = analises.ranking_empresas(visao, coluna, metrica, k, minimo)
+    if tabela.empty:
+        return None
+    rotulo = METRICAS[metrica][0]
+    fig = px.bar(
+        tabela, x=metrica, y='grupo', orientation='h', text=metrica,
+        hover_data=['lancamentos', 'vendas_total', 'vendas_media', 'nota_criticos', 'nota_usuarios'],
+        title=f'Top {len(tabela)} {GRUPOS[coluna].lower()} — {rotulo}',
+        labels={metrica: rotulo, 'grupo': '', 'lancamentos': 'Lançamentos', 'vendas_total': 'Vendas globais (mi)',
+                'vendas_media': 'Vendas médias (mi)', 'nota_criticos': 'Nota críticos (pond.)',
+                'nota_usuarios': 'Nota usuários (pond.)'},
+    )
+    fig.update_traces(texttemplate='%{text:.3~f}', textposition='outside')
+    fig.update_layout(template='plotly_dark', yaxis={'autorange': 'reversed'})
+    return fig
+
+
+def discrepancias_notas(visao: VisaoFiltrada, direcao: str, k: int):
+    import plotly.express as px
+
+    tabela = analises.discrepancias_notas(visao, direcao, k)
+    if tabela.empty:
+        return None
+    # o mesmo título pode aparecer em várias plataformas: o rótulo leva a plataforma e a posição
+    tabela = tabela.assign(jogo=[f'{p}. {n} ({pl})' for p, n, pl in
+                                 zip(tabela['posicao'], tabela['Name'], tabela['Platform'])])
+    fig = px.bar(
+        tabela, x='diferenca_ajustada', y='jogo', orientation='h', text='diferenca_ajustada',
+        hover_data=['nota_criticos', 'nota_usuarios', 'Critic_Count', 'User_Count', 'diferenca'],
+        title=f'Discrepância entre críticos e usuários — {DIRECOES[direcao].lower()}',
+        labels={'diferenca_ajustada': 'Críticos − usuários (0–10, ajustada)', 'jogo': '',
+                'nota_criticos': 'Críticos (0–10)', 'nota_usuarios': 'Usuários (0–10)',
+                'Critic_Count': 'Nº de críticas', 'User_Count': 'Nº de avaliações de usuários',
+                'diferenca': 'Diferença sem ajuste'},
+    )
+    fig.update_traces(texttemplate='%{text:+.2f}', textposition='outside')
+    fig.update_layout(template='plotly_dark', yaxis={'autorange': 'reversed'})
+    return fig
+
+
+def mais_vendidos(visao: VisaoFiltrada, coluna: str):
+    import plotly.express as px
+
+    tabela = analises.mais_vendidos_por(visao, coluna)
+    if tabela.empty:
+        return None
+    fig = px.bar(
+        tabela, x='Global_Sales', y='grupo', orientation='h', text='Name',
+        hover_data=[c for c in ('Platform', 'Genre', 'Year_of_Release', 'participacao') if c in tabela.columns],
+        title=f'Jogo mais vendido por {GRUPOS_VENDAS[coluna].lower()} (milhões)',
+        labels={'Global_Sales': 'Vendas globais (mi)', 'grupo': GRUPOS_VENDAS[coluna], 'Name': 'Jogo',
+                'participacao': 'Fatia das vendas do grupo'},
+    )
+    fig.update_traces(textposition='auto')
+    fig.update_layout(template='plotly_dark', yaxis={'autorange': 'reversed'})
+    return fig
+
+
+FIGURAS = {f.__name__: f for f in [
+    tendencia_lancamentos, generos_populares, lancamentos_plataformas, vendas_globais, vendas_regiao,
+    correlacao_notas, vendas_classificacao_etaria, medidas_notas, medidas_regioes,
+    box_acao_vs_rpg, box_antigos_vs_atuais, matriz_pares, ranking_empresas, discrepancias_notas, mais_vendidos,
+]}
+# Parâmetros das figuras que os têm, como a página abre (primeira opção de cada widget)
+PARAMETROS = {
+    'correlacao_notas': (True,),
+    'medidas_notas': (True,),
+    'matriz_pares': (next(iter(analises.AGRUPAMENTOS)), next(iter(CORRECOES))),
+    'ranking_empresas': (next(iter(GRUPOS)), next(iter(METRICAS)), TOP_RANKING, MINIMO_LANCAMENTOS),
+    'discrepancias_notas': (next(iter(DIRECOES)), TOP_DISCREPANCIAS),
+    'mais_vendidos': (next(iter(GRUPOS_VENDAS)),),
+}
+
+
+def figura(nome: str, visao: VisaoFiltrada, *parametros):
+    # Figura pronta da análise para o filtro (e parâmetros) atuais; None quando não há dados (também fica em
+    # cache: a chave tem a assinatura da base e o filtro, então o None não envelhece). Não modificar o retorno.
+    return CACHE_FIGURAS.obter((assinatura(visao.df), visao.filtro, nome, *parametros),
+                               lambda: _construir(nome, visao, parametros))
+
+
+def _construir(nome: str, visao: VisaoFiltrada, parametros: tuple = ()):
+    with etapa(f'figura:{nome}', len(visao)):
+        return FIGURAS[nome](visao, *parametros)
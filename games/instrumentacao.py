@@ -0,0 +1,122 @@
+# Instrumentação opcional de cada rerun: tempo, linhas e variação de memória por etapa (carga, máscara,
+# cópia filtrada, agregação, figuras, serialização). Desligada, cada etapa custa só uma consulta a um
+# ContextVar. Ligada, cada rerun vira uma linha JSON no log, para agregar entre sessões/processos.
+#
+#   GAMES_INSTRUMENTACAO=1 streamlit run ...      # liga para todas as sessões
+#   python -m games.instrumentacao .cache/instrumentacao.jsonl   # resumo por etapa (p50/p95)
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+ATIVA_PADRAO = os.environ.get('GAMES_INSTRUMENTACAO', '') not in ('', '0')
+ARQUIVO_LOG = os.environ.get('GAMES_INSTRUMENTACAO_LOG', os.path.join(
+    os.environ.get('GAMES_CACHE_DIR', './.cache'), 'instrumentacao.jsonl'))
+
+_atual: contextvars.ContextVar = contextvars.ContextVar('rerun_instrumentado', default=None)
+_lock_log = threading.Lock()
+
+
+class Rerun:
+    # Etapas de um rerun na ordem em que terminaram. A memória vem do tracemalloc, que é global ao
+    # processo: com várias sessões simultâneas os deltas incluem alocações das outras.
+    def __init__(self, sessao: str | None = None, pagina: str | None = None):
+        self.sessao = sessao
+        self.pagina = pagina
+        self.inicio = time.time()
+        self._t0 = time.perf_counter()
+        self.etapas: list[dict] = []
+        self.caches: dict = {}
+        self.total_s = None
+
+    def registro(self) -> dict:
+        return {
+            'ts': round(self.inicio, 3), 'pid': os.getpid(), 'sessao': self.sessao, 'pagina': self.pagina,
+            'total_s': self.total_s, 'etapas': self.etapas, 'caches': self.caches,
+        }
+
+
+def iniciar(ativa: bool = ATIVA_PADRAO, sessao: str | None = None, pagina: str | None = None) -> Rerun | None:
+    if not ativa:
+        _atual.set(None)
+        return None
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    rerun = Rerun(sessao, pagina)
+    _atual.set(rerun)
+    return rerun
+
+
+def ativa() -> bool:
+    return _atual.get() is not None
+
+
+@contextmanager
+def etapa(nome: str, linhas: int | None = None):
+    # Mede o bloco; quem chama pode preencher dados['linhas'] (ou outros campos) dentro do with
+    rerun = _atual.get()
+    dados = {} if linhas is None else {'linhas': linhas}
+    if rerun is None:
+        yield dados
+        return
+    memoria_antes = tracemalloc.get_traced_memory()[0]
+    inicio = time.perf_counter()
+    try:
+        yield dados
+    finally:
+        rerun.etapas.append({
+            'etapa': nome,
+            's': round(time.perf_counter() - inicio, 6),
+            'memoria_kb': round((tracemalloc.get_traced_memory()[0] - memoria_antes) / 1024, 1),
+            **dados,
+        })
+
+
+def finalizar(caches: dict | None = None, arquivo: str | None = ARQUIVO_LOG) -> Rerun | None:
+    # Fecha o rerun atual e grava a linha de log (falhas de escrita não derrubam a página)
+    rerun = _atual.get()
+    if rerun is None:
+        return None
+    _atual.set(None)
+    rerun.total_s = round(time.perf_counter() - rerun._t0, 6)
+    rerun.caches = caches or {}
+    if arquivo:
+        linha = json.dumps(rerun.registro(), ensure_ascii=False, default=str)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(arquivo)), exist_ok=True)
+            with _lock_log, open(arquivo, 'a', encoding='utf-8') as f:
+                f.write(linha + '\n')
+        except OSError:
+            pass
+    return rerun
+
+
+def resumir(arquivo: str = ARQUIVO_LOG) -> dict:
+    # Agrega o log (de uma ou várias instâncias concatenadas) por etapa: chamadas, p50, p95 e máximo
+    import numpy as np
+
+    tempos: dict[str, list[float]] = {}
+    reruns = []
+    with open(arquivo, encoding='utf-8') as f:
+        for linha in f:
+            r = json.loads(linha)
+            reruns.append(r['total_s'])
+            for e in r['etapas']:
+                # agrupa por tipo de etapa ('figura:x' e 'copia:y' viram 'figura' e 'copia')
+                tempos.setdefault(e['etapa'].split(':')[0], []).append(e['s'])
+    resumo = {'reruns': len(reruns), 'etapas': {}}
+    for nome, ts in [('rerun', reruns), *sorted(tempos.items())]:
+        if not ts:
+            continue
+        p50, p95 = np.percentile(ts, [50, 95])
+        resumo['etapas'][nome] = {'n': len(ts), 'p50_s': round(float(p50), 6), 'p95_s': round(float(p95), 6),
+                                  'max_s': round(float(max(ts)), 6)}
+    return resumo
+
+
+if __name__ == '__main__':
+    json.dump(resumir(*sys.argv[1:2]), sys.stdout, ensure_ascii=False, indent=2)
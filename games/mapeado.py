@@ -0,0 +1,100 @@
+# DataFrames em arquivos Arrow IPC (Feather v2, sem compressão) lidos por memory map: as colunas do
+# DataFrame apontam direto para as páginas do arquivo, que o sistema operacional compartilha entre todos os
+# processos que mapeiam o mesmo arquivo. Vários workers do Streamlit com a mesma base pagam a memória uma vez.
+#
+# Para que a leitura não copie nada, o arquivo guarda cada coluna já no formato do pandas:
+#   float/int/bool     valores numpy (NaN é valor, não nulo do Arrow)
+#   category           códigos inteiros (−1 = ausente); as categorias vão nos metadados do esquema
+#   Int64 (anulável)   valores + máscara uint8 (vista como bool)
+#   string             strings Arrow, embrulhadas num ArrowStringArray
+# Outros tipos são convertidos pelo pyarrow (com cópia). Os arrays mapeados são somente leitura.
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+CHAVE_METADADOS = b'games'
+
+
+def gravar(df: pd.DataFrame, caminho: str):
+    # Troca atômica: quem já mapeou a versão anterior continua lendo o arquivo antigo até soltá-lo
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    colunas, tipos, categorias = {}, {}, {}
+    for nome in df.columns:
+        s = df[nome]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            colunas[nome] = pa.array(s.cat.codes.to_numpy())
+            tipos[nome] = 'category'
+            categorias[nome] = s.cat.categories.tolist()
+        elif isinstance(s.dtype, pd.Int64Dtype):
+            colunas[nome] = pa.array(s.to_numpy(dtype='int64', na_value=0))
+            colunas[f'{nome}__mascara'] = pa.array(s.isna().to_numpy().view(np.uint8))
+            tipos[nome] = 'Int64'
+        elif isinstance(s.dtype, pd.StringDtype):
+            colunas[nome] = pa.array(s.to_numpy(dtype=object, na_value=None), type=pa.large_string())
+            tipos[nome] = 'string'
+        elif isinstance(s.dtype, np.dtype) and s.dtype.kind in 'fiub':
+            colunas[nome] = pa.array(s.to_numpy().view(np.uint8) if s.dtype.kind == 'b' else s.to_numpy())
+            tipos[nome] = s.dtype.str
+        else:
+            colunas[nome] = pa.Array.from_pandas(s)
+            tipos[nome] = 'arrow'
+    metadados = {'colunas': list(df.columns), 'tipos': tipos, 'categorias': categorias}
+    tabela = pa.table(colunas).replace_schema_metadata(
+        {CHAVE_METADADOS: json.dumps(metadados, ensure_ascii=False, default=str).encode()})
+    tmp = f'{caminho}.{os.getpid()}.tmp'
+    # um só lote: cada coluna é um bloco contíguo, que vira um array numpy sem cópia
+    feather.write_feather(tabela, tmp, compression='uncompressed', chunksize=max(len(df), 1))
+    os.replace(tmp, caminho)
+
+
+def ler(caminho: str) -> pd.DataFrame | None:
+    # None se o arquivo não existe ou não foi gravado por gravar()
+    import pyarrow as pa
+
+    if not os.path.exists(caminho):
+        return None
+    try:
+        tabela = pa.ipc.open_file(pa.memory_map(caminho, 'r')).read_all()
+        metadados = json.loads(tabela.schema.metadata[CHAVE_METADADOS])
+    except (OSError, pa.ArrowInvalid, KeyError, TypeError, ValueError):
+        return None
+
+    def numpy(nome: str) -> np.ndarray:
+        return tabela.column(nome).chunk(0).to_numpy(zero_copy_only=True)
+
+    colunas = {}
+    for nome in metadados['colunas']:
+        tipo = metadados['tipos'][nome]
+        if tipo == 'category':
+            dtype = pd.CategoricalDtype(metadados['categorias'][nome])
+            colunas[nome] = pd.Categorical.from_codes(numpy(nome), dtype=dtype)
+        elif tipo == 'Int64':
+            colunas[nome] = pd.arrays.IntegerArray(numpy(nome), numpy(f'{nome}__mascara').view(bool))
+        elif tipo == 'string':
+            colunas[nome] = pd.arrays.ArrowStringArray(tabela.column(nome))
+        elif tipo == 'arrow':
+            colunas[nome] = tabela.column(nome).to_pandas()
+        else:
+            colunas[nome] = numpy(nome).view(np.dtype(tipo))
+    # copy=False: sem consolidar as colunas em blocos 2D (o que copiaria tudo para a memória do processo)
+    return pd.DataFrame(colunas, copy=False)
+
+
+def memoria_processo() -> dict:
+    # Memória do processo atual (Linux): rss conta as páginas do arquivo mapeado; uss só o que é exclusivo
+    # do processo; pss divide as páginas compartilhadas pelo número de processos que as usam
+    campos = {'Rss': 'rss', 'Pss': 'pss', 'Private_Clean': 'uss', 'Private_Dirty': 'uss'}
+    memoria = {'rss': 0, 'pss': 0, 'uss': 0}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for linha in f:
+                nome, _, valor = linha.partition(':')
+                if nome in campos:
+                    memoria[campos[nome]] += int(valor.split()[0]) * 1024
+    except OSError:
+        return {}
+    return memoria
@@ -0,0 +1,208 @@
+# Navegação paginada pelas linhas filtradas: busca por palavras em Name, Publisher e Developer e ordenação
+# por qualquer coluna, resolvidas por índices construídos uma vez por dataset (sob demanda, por coluna).
+# Só as linhas da página visível são materializadas e enviadas ao navegador.
+#
+# Busca: o texto é normalizado (sem acentos, minúsculas, separado em palavras) e cada palavra da consulta
+# precisa casar com alguma palavra do campo, como prefixo ('prefixo') ou em qualquer posição ('trecho').
+# O índice é por valor distinto do campo (um título relançado em várias plataformas é tokenizado uma vez):
+# vocabulário ordenado -> valores que têm a palavra -> linhas com o valor, em listas contíguas.
+import re
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from games.cache import CACHE_FILTROS
+from games.carga import assinatura, derivado
+from games.filtros import VisaoFiltrada, resultado
+from games.instrumentacao import etapa
+
+CAMPOS_BUSCA = ['Name', 'Publisher', 'Developer']
+MODOS_BUSCA = ['prefixo', 'trecho']
+TAMANHOS_PAGINA = [25, 50, 100, 250]
+
+_SEPARADORES = re.compile(r'[\W_]+')
+
+
+def normalizar(texto: str) -> list[str]:
+    # Palavras sem acentos e em minúsculas: 'Pokémon: Édition' -> ['pokemon', 'edition']
+    texto = unicodedata.normalize('NFKD', texto)
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).casefold()
+    return [p for p in _SEPARADORES.split(texto) if p]
+
+
+def _reunir(inicio: np.ndarray, valores: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    # Concatena as listas valores[inicio[i]:inicio[i + 1]] dos ids, sem laço em Python
+    comeco, fim = inicio[ids], inicio[ids + 1]
+    tamanhos = fim - comeco
+    total = int(tamanhos.sum())
+    if total == 0:
+        return np.empty(0, dtype=valores.dtype)
+    deslocamento = np.repeat(comeco - np.concatenate([[0], np.cumsum(tamanhos)[:-1]]), tamanhos)
+    return valores[deslocamento + np.arange(total)]
+
+
+def _listas(chaves: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    # Posições agrupadas por chave (0..n−1) e o início de cada grupo; chaves −1 ficam de fora
+    validas = np.flatnonzero(chaves >= 0)
+    posicoes = validas[np.argsort(chaves[validas], kind='stable')]
+    inicio = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(chaves[validas], minlength=n), out=inicio[1:])
+    return inicio, posicoes
+
+
+class IndiceBusca:
+    def __init__(self, serie: pd.Series):
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            codigos, distintos = serie.cat.codes.to_numpy(), serie.cat.categories
+        else:
+            codigos, distintos = pd.factorize(serie)
+        # linhas de cada valor distinto
+        self.inicio_valor, self.linhas = _listas(codigos.astype(np.int64), len(distintos))
+
+        # pares (palavra, valor) sem repetição; vocabulário ordenado para a busca por prefixo
+        palavras, donos = [], []
+        for i, valor in enumerate(distintos):
+            unicas = set(normalizar(str(valor)))
+            palavras.extend(unicas)
+            donos.extend([i] * len(unicas))
+        ids, self.vocabulario = pd.factorize(np.array(palavras, dtype=object), sort=True)
+        self.vocabulario = np.asarray(self.vocabulario, dtype=object)
+        self.inicio_palavra, self.valores = _listas(ids.astype(np.int64), len(self.vocabulario))
+        self.valores = np.asarray(donos, dtype=np.int64)[self.valores]
+
+    def _valores(self, palavra: str, modo: str) -> np.ndarray:
+        if modo == 'prefixo':
+            # palavras com o prefixo formam uma faixa contígua do vocabulário ordenado
+            a = np.searchsorted(self.vocabulario, palavra, side='left')
+            b = np.searchsorted(self.vocabulario, palavra + '\U0010ffff', side='left')
+            achados = self.valores[self.inicio_palavra[a]:self.inicio_palavra[b]]
+            if b - a == 1:
+                return achados  # uma só palavra: valores já únicos e em ordem
+        else:
+            ids = np.flatnonzero([palavra in p for p in self.vocabulario])
+            achados = _reunir(self.inicio_palavra, self.valores, ids)
+        return np.unique(achados)
+
+    def valores_com(self, palavras: list[str], modo: str = 'prefixo') -> np.ndarray:
+        # Valores distintos (em ordem) que têm todas as palavras; para categorias, os próprios códigos
+        valores = None
+        for p in palavras:
+            achados = self._valores(p, modo)
+            valores = achados if valores is None else np.intersect1d(valores, achados, assume_unique=True)
+            if len(valores) == 0:
+                break
+        return np.empty(0, dtype=np.int64) if valores is None else valores
+
+    def buscar(self, palavras: list[str], modo: str = 'prefixo') -> np.ndarray:
+        # Linhas (em ordem) cujo valor tem todas as palavras
+        valores = self.valores_com(palavras, modo)
+        if len(valores) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(_reunir(self.inicio_valor, self.linhas, valores))
+
+    def contagens(self) -> np.ndarray:
+        # Linhas de cada valor distinto
+        return np.diff(self.inicio_valor)
+
+
+def indice_busca(df: pd.DataFrame, coluna: str) -> IndiceBusca:
+    return derivado(df, f'busca:{coluna}', lambda d: IndiceBusca(d[coluna]))
+
+
+def buscar(df: pd.DataFrame, texto: str, campos=CAMPOS_BUSCA, modo: str = 'prefixo') -> np.ndarray | None:
+    # Linhas da base inteira (em ordem) que casam com o texto em algum dos campos; None sem texto de busca
+    palavras = normalizar(texto or '')
+    if not palavras:
+        return None
+    campos = tuple(c for c in campos if c in df.columns)
+
+    def construir():
+        with etapa('navegacao:busca') as info:
+            partes = [indice_busca(df, c).buscar(palavras, modo) for c in campos]
+            linhas = np.unique(np.concatenate(partes)) if partes else np.empty(0, dtype=np.int64)
+            info['linhas'] = len(linhas)
+            return linhas
+    return CACHE_FILTROS.obter((assinatura(df), 'busca', tuple(palavras), campos, modo), construir)
+
+
+def sugestoes(df: pd.DataFrame, coluna: str, texto: str = '', limite: int = 50, modo: str = 'prefixo') -> list[str]:
+    # Até `limite` categorias da coluna que casam com o texto (todas, sem texto), das com mais jogos para as
+    # com menos: as opções de um seletor com centenas de valores, sem montar a lista inteira
+    palavras = normalizar(texto or '')
+
+    def construir():
+        indice = indice_busca(df, coluna)
+        contagens = indice.contagens()
+        candidatos = indice.valores_com(palavras, modo) if palavras else np.flatnonzero(contagens)
+        if len(candidatos) > limite:
+            candidatos = candidatos[np.argpartition(-contagens[candidatos], limite - 1)[:limite]]
+        candidatos = candidatos[np.lexsort((candidatos, -contagens[candidatos]))]
+        return df[coluna].cat.categories[candidatos].tolist()
+    return CACHE_FILTROS.obter((assinatura(df), 'sugestoes', coluna, tuple(palavras), limite, modo), construir)
+
+
+def _ordem(df: pd.DataFrame, coluna: str, crescente: bool) -> np.ndarray:
+    # Todas as posições ordenadas pela coluna (estável: empates na ordem original; ausentes no fim)
+    s = df[coluna]
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        # posição alfabética de cada categoria (anexos deixam categorias novas no fim da tabela)
+        alfabetica = np.argsort(np.argsort(s.cat.categories.to_numpy(), kind='stable')).astype(float)
+        chave = np.append(alfabetica, np.nan)[s.cat.codes.to_numpy()]
+    elif pd.api.types.is_numeric_dtype(s.dtype):
+        chave = s.to_numpy(dtype=float, na_value=np.nan)
+    else:
+        codigos, _ = pd.factorize(s, sort=True)
+        chave = np.where(codigos < 0, np.nan, codigos.astype(float))
+    return np.argsort(chave if crescente else -chave, kind='stable')
+
+
+def ordem(df: pd.DataFrame, coluna: str, crescente: bool = True) -> np.ndarray:
+    direcao = 'crescente' if crescente else 'decrescente'
+    return derivado(df, f'ordem:{coluna}:{direcao}', lambda d: _ordem(d, coluna, crescente))
+
+
+@dataclass(frozen=True)
+class Pagina:
+    dados: pd.DataFrame     # só as linhas da página
+    numero: int             # 1..paginas (ajustado se pedido fora da faixa)
+    paginas: int
+    total: int              # linhas filtradas (e encontradas pela busca)
+    inicio: int             # posição da primeira linha da página no total (0 se vazio)
+
+
+def linhas(visao: VisaoFiltrada, texto: str = '', campos=CAMPOS_BUSCA, modo: str = 'prefixo',
+           coluna: str | None = None, crescente: bool = True) -> np.ndarray:
+    # Posições das linhas do filtro que casam com a busca, na ordem pedida (sem coluna: ordem original)
+    encontradas = buscar(visao.df, texto, campos, modo)
+    chave = f"navegacao:{' '.join(normalizar(texto or ''))}:{','.join(campos)}:{modo}:{coluna}:{crescente}"
+
+    def construir():
+        with etapa('navegacao:linhas') as info:
+            selecionadas = visao.linhas
+            if encontradas is not None:
+                selecionadas = np.intersect1d(selecionadas, encontradas, assume_unique=True)
+            if coluna is not None:
+                # a ordem global, restrita às linhas selecionadas: uma passada sobre as posições, sem ordenar
+                marcadas = np.zeros(len(visao.df), dtype=bool)
+                marcadas[selecionadas] = True
+                o = ordem(visao.df, coluna, crescente)
+                selecionadas = o[marcadas[o]]
+            info['linhas'] = len(selecionadas)
+            return selecionadas
+    if encontradas is None and coluna is None:
+        return visao.linhas
+    return resultado(visao.df, visao.filtro, chave, construir)
+
+
+def pagina(visao: VisaoFiltrada, numero: int = 1, tamanho: int = TAMANHOS_PAGINA[0], texto: str = '',
+           campos=CAMPOS_BUSCA, modo: str = 'prefixo', coluna: str | None = None,
+           crescente: bool = True) -> Pagina:
+    posicoes = linhas(visao, texto, campos, modo, coluna, crescente)
+    total = len(posicoes)
+    paginas = max(1, -(-total // tamanho))
+    numero = min(max(int(numero), 1), paginas)
+    inicio = (numero - 1) * tamanho
+    return Pagina(visao.df.take(posicoes[inicio:inicio + tamanho]), numero, paginas, total,
+                  inicio if total else 0)
@@ -0,0 +1,116 @@
+# Rankings de publishers e developers no filtro: lançamentos, vendas globais (total e média por jogo) e
+# médias das notas ponderadas pelo número de avaliações (Critic_Count / User_Count). Publisher e Developer
+# não são dimensões do cubo, então as somas por grupo saem das linhas filtradas, com um bincount sobre os
+# códigos das categorias; ficam em cache por filtro. O top-k é uma seleção parcial (np.partition) seguida
+# da ordenação só dos k escolhidos, nunca de todos os grupos.
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from games.filtros import VisaoFiltrada, resultado
+from games.instrumentacao import etapa
+
+GRUPOS = {'Publisher': 'Publicadoras', 'Developer': 'Desenvolvedoras'}
+# métrica -> (rótulo, é média?)
+METRICAS = {
+    'vendas_total': ('Vendas globais (mi)', False),
+    'lancamentos': ('Lançamentos', False),
+    'vendas_media': ('Vendas médias por jogo (mi)', True),
+    'nota_criticos': ('Nota dos críticos (0–100, ponderada)', True),
+    'nota_usuarios': ('Nota dos usuários (0–10, ponderada)', True),
+}
+# Médias de grupos com menos lançamentos que isso ficam fora do ranking (evita o topo só com um ou dois jogos)
+MINIMO_LANCAMENTOS = 5
+SOMAS = ['lancamentos', 'vendas_n', 'Global_Sales', 'criticos_soma', 'criticos_peso', 'usuarios_soma',
+         'usuarios_peso']
+
+
+@dataclass(frozen=True)
+class SomasEmpresas:
+    # Somas por categoria do grupo (todas as categorias da base, na ordem da tabela de categorias)
+    categorias: pd.Index
+    somas: dict[str, np.ndarray]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(v.nbytes for v in self.somas.values())
+
+    def metrica(self, nome: str) -> np.ndarray:
+        s = self.somas
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if nome == 'lancamentos':
+                return s['lancamentos'].astype(float)
+            if nome == 'vendas_total':
+                return s['Global_Sales']
+            if nome == 'vendas_media':
+                return s['Global_Sales'] / s['vendas_n']
+            if nome == 'nota_criticos':
+                return s['criticos_soma'] / s['criticos_peso']
+            if nome == 'nota_usuarios':
+                return s['usuarios_soma'] / s['usuarios_peso']
+        raise KeyError(nome)
+
+    def tabela(self, posicoes: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame({
+            'grupo': self.categorias[posicoes],
+            'lancamentos': self.somas['lancamentos'][posicoes],
+            'vendas_total': self.somas['Global_Sales'][posicoes],
+            **{m: self.metrica(m)[posicoes] for m in ('vendas_media', 'nota_criticos', 'nota_usuarios')},
+        })
+
+
+def _medidas_linhas(visao: VisaoFiltrada) -> dict[str, np.ndarray]:
+    # Medidas somáveis de cada linha do filtro (os pesos e as somas ponderadas só contam notas com contagem)
+    def numeros(coluna: str) -> np.ndarray:
+        return visao[coluna].to_numpy(dtype=float, na_value=np.nan)
+
+    v = numeros('Global_Sales')
+    medidas = {'lancamentos': np.ones(len(visao)), 'vendas_n': (~np.isnan(v)).astype(float),
+               'Global_Sales': np.nan_to_num(v)}
+    for nome, nota, contagem in (('criticos', 'Critic_Score', 'Critic_Count'),
+                                 ('usuarios', 'User_Score', 'User_Count')):
+        x, w = numeros(nota), numeros(contagem)
+        ok = ~(np.isnan(x) | np.isnan(w))
+        medidas[f'{nome}_peso'] = np.where(ok, w, 0.0)
+        medidas[f'{nome}_soma'] = np.where(ok, x * w, 0.0)
+    return medidas
+
+
+def somas_empresas(visao: VisaoFiltrada, coluna: str) -> SomasEmpresas:
+    def construir():
+        with etapa(f'agregacao:somas_empresas:{coluna}') as info:
+            codigos = visao[coluna].cat.codes.to_numpy()
+            medidas = _medidas_linhas(visao)
+            info['linhas'] = len(codigos)
+            categorias = visao.df[coluna].cat.categories
+            validos = codigos >= 0  # sem publisher/developer não entra em nenhum grupo
+            somas = {m: np.bincount(codigos[validos], weights=medidas[m][validos], minlength=len(categorias))
+                     for m in SOMAS}
+            somas['lancamentos'] = somas['lancamentos'].astype(np.int64)
+            return SomasEmpresas(categorias, somas)
+    return resultado(visao.df, visao.filtro, f'somas_empresas:{coluna}', construir)
+
+
+def top_k(valores: np.ndarray, k: int, elegiveis: np.ndarray) -> np.ndarray:
+    # Posições dos k maiores valores elegíveis, do maior ao menor; empates pela posição (na tabela de categorias)
+    candidatos = np.flatnonzero(elegiveis & ~np.isnan(valores))
+    if len(candidatos) > k > 0:
+        # o k-ésimo maior por seleção parcial; entram todos os empatados com ele, e só esses são ordenados
+        limiar = np.partition(valores[candidatos], len(candidatos) - k)[len(candidatos) - k]
+        candidatos = candidatos[valores[candidatos] >= limiar]
+    ordem = np.lexsort((candidatos, -valores[candidatos]))
+    return candidatos[ordem[:k]]
+
+
+def ranking(visao: VisaoFiltrada, coluna: str = 'Publisher', metrica: str = 'vendas_total', k: int = 10,
+            minimo: int = MINIMO_LANCAMENTOS) -> pd.DataFrame:
+    # Top-k grupos pela métrica, com todas as métricas de cada um (uma linha por grupo, já na ordem)
+    def construir():
+        s = somas_empresas(visao, coluna)
+        lancamentos = s.somas['lancamentos']
+        elegiveis = lancamentos >= (minimo if METRICAS[metrica][1] else 1)
+        tabela = s.tabela(top_k(s.metrica(metrica), k, elegiveis))
+        tabela.insert(0, 'posicao', np.arange(1, len(tabela) + 1))
+        return tabela
+    return resultado(visao.df, visao.filtro, f'ranking:{coluna}:{metrica}:{k}:{minimo}', construir)
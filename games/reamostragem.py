@@ -0,0 +1,204 @@
+# Testes não paramétricos para vendas muito assimétricas: permutação (p-valor) e bootstrap (intervalo de
+# confiança) da diferença de médias ou medianas entre dois grupos. As reamostras são geradas em lotes
+# vetorizados (uma matriz lote × n por vez) e os lotes são distribuídos num pool de processos.
+#
+# Reprodutível: cada lote tem sua semente, derivada de SeedSequence(seed).spawn(). Com orçamento de tempo,
+# só entra no resultado o maior prefixo de lotes concluídos, então a mesma seed e o mesmo número de
+# reamostras feitas dão sempre o mesmo resultado. O primeiro lote sempre termina, mesmo com o orçamento
+# esgotado: um resultado nunca vem de zero reamostras.
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+import numpy as np
+
+PROCESSOS = int(os.environ.get('GAMES_PROCESSOS', min(os.cpu_count() or 1, 8)))
+# Elementos por matriz de reamostragem (limita a memória de cada passo: 4M float64 = 32 MB)
+ELEMENTOS_POR_PASSO = 4_000_000
+# Trabalho (reamostras × tamanho da amostra) de cada lote; lotes menores = orçamento de tempo mais preciso
+ELEMENTOS_POR_LOTE = 50_000_000
+# Abaixo disso o custo de enviar o trabalho aos processos não compensa
+MINIMO_PARALELO = 20_000_000
+# Mínimo de lotes: granularidade do orçamento de tempo e da divisão entre processos. Não depende do número
+# de processos, para que o resultado seja o mesmo em qualquer máquina
+LOTES_MINIMOS = 16
+
+_pool = None
+_processos_pool = 0
+_lock_pool = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Reamostragem:
+    metodo: str             # 'permutacao' ou 'bootstrap'
+    estatistica: str        # 'media' ou 'mediana'
+    observado: float        # diferença a − b na amostra original
+    reamostras: int         # feitas (pode ser menor que as solicitadas se o orçamento acabar)
+    solicitadas: int
+    tempo_s: float
+    p: float | None = None                      # permutação
+    ic: tuple[float, float] | None = None       # bootstrap
+    nivel: float | None = None
+
+    @property
+    def completa(self) -> bool:
+        return self.reamostras == self.solicitadas
+
+    @property
+    def erro_p(self) -> float | None:
+        # erro padrão de Monte Carlo do p-valor
+        if self.p is None:
+            return None
+        return math.sqrt(self.p * (1 - self.p) / max(self.reamostras, 1))
+
+
+def _estatistica(x: np.ndarray, nome: str) -> np.ndarray:
+    return np.median(x, axis=-1) if nome == 'mediana' else x.mean(axis=-1)
+
+
+def _lote_permutacao(a: np.ndarray, b: np.ndarray, estatistica: str, semente, tamanho: int) -> np.ndarray:
+    # diferenças a − b com os rótulos dos grupos embaralhados
+    rng = np.random.default_rng(semente)
+    todos = np.concatenate([a, b])
+    na, total = len(a), todos.sum()
+    passo = max(1, ELEMENTOS_POR_PASSO // len(todos))
+    saida = np.empty(tamanho)
+    for inicio in range(0, tamanho, passo):
+        k = min(passo, tamanho - inicio)
+        m = np.tile(todos, (k, 1))
+        rng.permuted(m, axis=1, out=m)
+        if estatistica == 'media':
+            soma_a = m[:, :na].sum(axis=1)
+            saida[inicio:inicio + k] = soma_a / na - (total - soma_a) / len(b)
+        else:
+            saida[inicio:inicio + k] = _estatistica(m[:, :na], estatistica) - _estatistica(m[:, na:], estatistica)
+    return saida
+
+
+def _lote_bootstrap(a: np.ndarray, b: np.ndarray, estatistica: str, semente, tamanho: int) -> np.ndarray:
+    # diferenças a − b reamostrando cada grupo com reposição
+    rng = np.random.default_rng(semente)
+    passo = max(1, ELEMENTOS_POR_PASSO // (len(a) + len(b)))
+    saida = np.empty(tamanho)
+    for inicio in range(0, tamanho, passo):
+        k = min(passo, tamanho - inicio)
+        ra = a[rng.integers(0, len(a), size=(k, len(a)))]
+        rb = b[rng.integers(0, len(b), size=(k, len(b)))]
+        saida[inicio:inicio + k] = _estatistica(ra, estatistica) - _estatistica(rb, estatistica)
+    return saida
+
+
+def _obter_pool(processos: int) -> ProcessPoolExecutor:
+    # Pool persistente: 'spawn' evita fork de um servidor com várias threads
+    global _pool, _processos_pool
+    with _lock_pool:
+        if _pool is None or _processos_pool != processos:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context('spawn'))
+            _processos_pool = processos
+        return _pool
+
+
+def _descartar_pool():
+    global _pool
+    with _lock_pool:
+        _pool = None
+
+
+def _executar_pool(lote, a, b, estatistica: str, sementes, tamanhos, limite: float | None,
+                   processos: int) -> list[np.ndarray]:
+    # No máximo um lote por processo em execução, e lote novo só sai com orçamento sobrando: quando o
+    # orçamento acaba, o que continua rodando no pool compartilhado é no máximo um lote por processo
+    # (cancel() não interrompe lotes já iniciados)
+    pool = _obter_pool(processos)
+    pendentes = list(zip(sementes, tamanhos))
+    futuros = [pool.submit(lote, a, b, estatistica, *pendentes.pop(0)) for _ in range(min(processos, len(pendentes)))]
+    prontos = []
+    while len(prontos) < len(futuros):
+        # o primeiro lote espera sem limite; os seguintes, só até o fim do orçamento
+        restante = None if limite is None or not prontos else limite - time.perf_counter()
+        if restante is not None and restante <= 0:
+            break
+        try:
+            prontos.append(futuros[len(prontos)].result(timeout=restante))
+        except TimeoutError:
+            break
+        if pendentes and (limite is None or time.perf_counter() < limite):
+            futuros.append(pool.submit(lote, a, b, estatistica, *pendentes.pop(0)))
+    for f in futuros[len(prontos):]:
+        f.cancel()
+    return prontos
+
+
+def _executar(lote, a, b, estatistica: str, n: int, seed: int, orcamento_s: float | None,
+              processos: int) -> np.ndarray:
+    # Estatísticas reamostradas na ordem dos lotes (prefixo concluído dentro do orçamento, ao menos um lote)
+    if n < 1:
+        raise ValueError('o número de reamostras precisa ser positivo')
+    trabalho = n * (len(a) + len(b))
+    n_lotes = max(1, min(n, max(LOTES_MINIMOS, math.ceil(trabalho / ELEMENTOS_POR_LOTE))))
+    tamanhos = [n // n_lotes + (i < n % n_lotes) for i in range(n_lotes)]
+    sementes = np.random.SeedSequence(seed).spawn(n_lotes)
+    limite = None if orcamento_s is None else time.perf_counter() + orcamento_s
+
+    partes = None
+    if processos > 1 and trabalho >= MINIMO_PARALELO:
+        try:
+            partes = _executar_pool(lote, a, b, estatistica, sementes, tamanhos, limite, processos)
+        except BrokenProcessPool:
+            _descartar_pool()  # processo morto (ex.: falta de memória): segue no processo atual
+    if partes is None:
+        partes = []
+        for s, t in zip(sementes, tamanhos):
+            if limite is not None and partes and time.perf_counter() > limite:
+                break
+            partes.append(lote(a, b, estatistica, s, t))
+    if not partes:
+        raise ValueError('nenhum lote de reamostragem terminou')
+    return np.concatenate(partes)
+
+
+def _preparar(a, b) -> tuple[np.ndarray, np.ndarray]:
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    a, b = a[~np.isnan(a)], b[~np.isnan(b)]
+    if len(a) < 2 or len(b) < 2:
+        raise ValueError('cada grupo precisa de ao menos duas observações')
+    return a, b
+
+
+def permutacao(a, b, estatistica: str = 'media', n: int = 100_000, alternativa: str = 'greater',
+               seed: int = 0, orcamento_s: float | None = None, processos: int = PROCESSOS) -> Reamostragem:
+    # H₀: os rótulos dos grupos são trocáveis. p = (1 + #{reamostras ao menos tão extremas}) / (1 + n)
+    a, b = _preparar(a, b)
+    inicio = time.perf_counter()
+    observado = float(_estatistica(a, estatistica) - _estatistica(b, estatistica))
+    difs = _executar(_lote_permutacao, a, b, estatistica, n, seed, orcamento_s, processos)
+    tol = 1e-12 * max(1.0, abs(observado))  # empates numéricos contam como "tão extremo"
+    if alternativa == 'greater':
+        extremos = np.count_nonzero(difs >= observado - tol)
+    elif alternativa == 'less':
+        extremos = np.count_nonzero(difs <= observado + tol)
+    else:
+        extremos = np.count_nonzero(np.abs(difs) >= abs(observado) - tol)
+    return Reamostragem('permutacao', estatistica, observado, len(difs), n, time.perf_counter() - inicio,
+                        p=(1 + extremos) / (1 + len(difs)))
+
+
+def bootstrap(a, b, estatistica: str = 'media', n: int = 100_000, nivel: float = 0.95, seed: int = 0,
+              orcamento_s: float | None = None, processos: int = PROCESSOS) -> Reamostragem:
+    # Intervalo percentil da diferença a − b
+    a, b = _preparar(a, b)
+    inicio = time.perf_counter()
+    observado = float(_estatistica(a, estatistica) - _estatistica(b, estatistica))
+    difs = _executar(_lote_bootstrap, a, b, estatistica, n, seed, orcamento_s, processos)
+    alfa = (1 - nivel) / 2
+    baixo, alto = np.quantile(difs, [alfa, 1 - alfa])
+    return Reamostragem('bootstrap', estatistica, observado, len(difs), n, time.perf_counter() - inicio,
+                        ic=(float(baixo), float(alto)), nivel=nivel)
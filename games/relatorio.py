@@ -0,0 +1,207 @@
+# Relatórios em lote: todas as análises (games.analises) e figuras (games.graficos) de uma lista de filtros,
+# sem o Streamlit. Os filtros são distribuídos num pool de processos; cada processo carrega a base uma vez
+# (com o arquivo de apoio da carga) e reaproveita o índice e o cubo entre os filtros que recebe.
+#
+#   python -m games.relatorio --por plataforma --saida relatorios/
+#   python -m games.relatorio filtros.json --formato parquet --figuras png --processos 4
+#       filtros.json: [{"nome": "ps2-2000s", "periodo": [2000, 2009], "plataformas": ["PS2"]}, ...]
+#       (mesmos campos de GAMES_FILTROS_QUENTES; campos ausentes ficam como no estado inicial da página)
+#
+# Saída: <saida>/<fatia>/resultado.json (ou uma tabela .parquet por análise + resumo.json), uma figura por
+# análise em HTML (Plotly via CDN) ou PNG, e <saida>/indice.json com o que foi gerado e o tempo de cada fatia.
+import argparse
+import dataclasses
+import importlib.util
+import json
+import math
+import multiprocessing
+import os
+import re
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from games.analises import ANALISES, calcular, filtro_de
+from games.carga import CAMINHO_PADRAO, PYARROW_DISPONIVEL, load_data
+from games.filtros import VisaoFiltrada, opcoes
+
+PROCESSOS = int(os.environ.get('GAMES_PROCESSOS', min(os.cpu_count() or 1, 8)))
+# Fatias automáticas: uma por valor da dimensão
+POR = {'plataforma': 'Platform', 'genero': 'Genre', 'ano': 'Year_of_Release', 'publisher': 'Publisher'}
+FORMATOS = ['json', 'parquet']
+FIGURAS = ['html', 'png', 'nenhuma']
+
+_df = None
+
+
+def fatias(df: pd.DataFrame, por: str) -> list[dict]:
+    coluna = POR[por]
+    if coluna == 'Year_of_Release':
+        anos = df[coluna].dropna().astype(int).unique()
+        return [{'nome': str(a), 'periodo': [int(a), int(a)]} for a in sorted(anos)]
+    campo = {'Platform': 'plataformas', 'Genre': 'generos', 'Publisher': 'publishers'}[coluna]
+    return [{'nome': str(v), campo: [v]} for v in opcoes(df, coluna)]
+
+
+def slug(nome: str) -> str:
+    s = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '-', s.lower()).strip('-') or 'fatia'
+
+
+def _nomes_unicos(estados: list[dict]) -> list[str]:
+    # Diretório de cada fatia; nomes que colidem depois do slug ganham sufixo
+    vistos: dict[str, int] = {}
+    nomes = []
+    for i, e in enumerate(estados):
+        base = slug(e.get('nome', f'fatia-{i}'))
+        vistos[base] = vistos.get(base, 0) + 1
+        nomes.append(base if vistos[base] == 1 else f'{base}-{vistos[base]}')
+    return nomes
+
+
+def para_json(valor):
+    # Resultados das análises (Series, DataFrames, dataclasses, escalares numpy) em tipos do json
+    if isinstance(valor, pd.DataFrame):
+        d = valor if isinstance(valor.index, pd.RangeIndex) else valor.reset_index()
+        return json.loads(d.to_json(orient='records', force_ascii=False))
+    if isinstance(valor, pd.Series):
+        return json.loads(valor.to_json(force_ascii=False))
+    if dataclasses.is_dataclass(valor):
+        return para_json(dataclasses.asdict(valor))
+    if isinstance(valor, dict):
+        return {str(k): para_json(v) for k, v in valor.items()}
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    return valor
+
+
+def _tabela(valor) -> pd.DataFrame | None:
+    if isinstance(valor, pd.Series):
+        valor = valor.to_frame(valor.name if valor.name is not None else 'valor')
+    if not isinstance(valor, pd.DataFrame):
+        return None
+    d = valor if isinstance(valor.index, pd.RangeIndex) else valor.reset_index()
+    return d.rename(columns=str)
+
+
+def gravar(resultados: dict, diretorio: str, formato: str) -> list[str]:
+    os.makedirs(diretorio, exist_ok=True)
+    if formato == 'json':
+        with open(os.path.join(diretorio, 'resultado.json'), 'w', encoding='utf-8') as f:
+            json.dump(para_json(resultados), f, ensure_ascii=False, indent=2)
+        return ['resultado.json']
+    arquivos, resumo = [], {}
+    for nome, valor in resultados.items():
+        tabela = _tabela(valor)
+        if tabela is None:
+            resumo[nome] = para_json(valor)
+        else:
+            tabela.to_parquet(os.path.join(diretorio, f'{nome}.parquet'), index=False)
+            arquivos.append(f'{nome}.parquet')
+    with open(os.path.join(diretorio, 'resumo.json'), 'w', encoding='utf-8') as f:
+        json.dump(resumo, f, ensure_ascii=False, indent=2)
+    return [*arquivos, 'resumo.json']
+
+
+def gravar_figuras(visao: VisaoFiltrada, diretorio: str, figuras: str) -> list[str]:
+    from games.graficos import FIGURAS as CONSTRUTORES, PARAMETROS
+
+    arquivos = []
+    for nome, construir in CONSTRUTORES.items():
+        fig = construir(visao, *PARAMETROS.get(nome, ()))
+        if fig is None:
+            continue
+        arquivo = f'{nome}.{figuras}'
+        if figuras == 'html':
+            fig.write_html(os.path.join(diretorio, arquivo), include_plotlyjs='cdn')
+        else:
+            fig.write_image(os.path.join(diretorio, arquivo))
+        arquivos.append(arquivo)
+    return arquivos
+
+
+def _iniciar(caminho: str):
+    # Uma carga por processo (o pool reaproveita os processos entre as fatias)
+    global _df
+    _df = load_data(caminho)
+
+
+def processar(estado: dict, diretorio: str, formato: str, figuras: str) -> dict:
+    inicio = time.perf_counter()
+    entrada = {'nome': estado.get('nome'), 'diretorio': os.path.basename(diretorio), 'filtro': estado}
+    try:
+        visao = VisaoFiltrada(_df, filtro_de(_df, estado))
+        entrada['linhas'] = len(visao)
+        arquivos = gravar(calcular(visao), diretorio, formato)
+        if figuras != 'nenhuma':
+            arquivos += gravar_figuras(visao, diretorio, figuras)
+        entrada['arquivos'] = arquivos
+    except Exception as e:  # uma fatia que falha não interrompe o lote; o erro fica no índice
+        entrada['erro'] = repr(e)
+    entrada['tempo_s'] = round(time.perf_counter() - inicio, 4)
+    return entrada
+
+
+def gerar(estados: list[dict], saida: str, formato: str = 'json', figuras: str = 'html',
+          processos: int = PROCESSOS, caminho: str = CAMINHO_PADRAO) -> dict:
+    if formato == 'parquet' and not PYARROW_DISPONIVEL:
+        raise RuntimeError("o formato parquet precisa do pyarrow (pip install pyarrow)")
+    if figuras == 'png' and importlib.util.find_spec('kaleido') is None:
+        raise RuntimeError("figuras em PNG precisam do kaleido (pip install kaleido)")
+    inicio = time.perf_counter()
+    os.makedirs(saida, exist_ok=True)
+    tarefas = [(e, os.path.join(saida, n), formato, figuras) for e, n in zip(estados, _nomes_unicos(estados))]
+    processos = max(1, min(processos, len(tarefas)))
+    if processos == 1:
+        _iniciar(caminho)
+        entradas = [processar(*t) for t in tarefas]
+    else:
+        # 'spawn' como em reamostragem; chunksize > 1 reduz as idas e voltas com centenas de fatias
+        with ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_iniciar, initargs=(caminho,)) as pool:
+            entradas = list(pool.map(processar, *zip(*tarefas), chunksize=max(1, len(tarefas) // (processos * 4))))
+    indice = {
+        'base': os.path.abspath(caminho), 'formato': formato, 'figuras': figuras, 'processos': processos,
+        'analises': list(ANALISES), 'tempo_s': round(time.perf_counter() - inicio, 3),
+        'falhas': sum('erro' in e for e in entradas), 'fatias': entradas,
+    }
+    with open(os.path.join(saida, 'indice.json'), 'w', encoding='utf-8') as f:
+        json.dump(indice, f, ensure_ascii=False, indent=2)
+    return indice
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Relatórios em lote das análises de games, um por filtro')
+    parser.add_argument('filtros', nargs='?', help='JSON com a lista de filtros (ver o cabeçalho do módulo)')
+    parser.add_argument('--por', choices=list(POR), help='uma fatia por valor da dimensão (em vez do JSON)')
+    parser.add_argument('--saida', default='relatorios')
+    parser.add_argument('--formato', choices=FORMATOS, default='json')
+    parser.add_argument('--figuras', choices=FIGURAS, default='html', help='png precisa do kaleido')
+    parser.add_argument('--processos', type=int, default=PROCESSOS)
+    parser.add_argument('--base', default=CAMINHO_PADRAO, help='CSV da base (padrão: GAMES_DB)')
+    args = parser.parse_args()
+
+    if (args.filtros is None) == (args.por is None):
+        parser.error('informe o arquivo de filtros ou --por')
+    if args.por:
+        estados = fatias(load_data(args.base), args.por)
+    else:
+        with open(args.filtros, encoding='utf-8') as f:
+            estados = json.load(f)
+    try:
+        indice = gerar(estados, args.saida, args.formato, args.figuras, args.processos, args.base)
+    except RuntimeError as e:
+        parser.error(str(e))
+    print(f"{len(indice['fatias'])} fatias em {indice['tempo_s']:.1f}s ({indice['falhas']} falhas) -> "
+          f"{os.path.join(args.saida, 'indice.json')}")
+    sys.exit(1 if indice['falhas'] else 0)
+
+
+if __name__ == '__main__':
+    main()
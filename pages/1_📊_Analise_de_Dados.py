@@ -1,33 +1,39 @@
 import os
+import uuid
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from scipy.stats import ttest_ind
+from games.analises import (AGRUPAMENTOS, HIPOTESES, colunas_regioes, discrepancias_notas, indicadores,
+                            mais_vendidos_por, medias_regioes, notas, ordem_regioes, pares_vendas, percentis_vendas,
+                            ranking_empresas, reamostragem_vendas, significativos, teste_medias)
+from games.aquecimento import iniciar_aquecimento
+from games.cache import CACHE_FILTROS
+from games.carga import load_data
+from games.destaques import DIRECOES, GRUPOS_VENDAS
+from games.filtros import Filtro, VisaoFiltrada, opcoes
+from games.esbocos import ERRO_RELATIVO
+from games.estatistica import CORRECOES
+from games.graficos import CACHE_FIGURAS, TOP_DISCREPANCIAS, TOP_RANKING, figura
+from games.navegacao import MODOS_BUSCA, TAMANHOS_PAGINA, pagina, sugestoes
+from games.ranking import GRUPOS, METRICAS, MINIMO_LANCAMENTOS
+from games.instrumentacao import ARQUIVO_LOG, ATIVA_PADRAO, etapa, finalizar, iniciar
 
 st.set_page_config(page_title='Análise de Dados - Games', page_icon='📊', layout='wide')
+LIMITE_SUGESTOES = 50
 st.sidebar.title('Navegação')
 
-def load_data():
-    df = pd.read_csv('./games_db.csv')
+# Instrumentação do rerun (também ligada para todas as sessões com GAMES_INSTRUMENTACAO=1)
+instrumentar = st.sidebar.checkbox('🐞 Instrumentação', value=ATIVA_PADRAO)
+iniciar(instrumentar, st.session_state.setdefault('sessao_id', uuid.uuid4().hex[:12]), 'Analise_de_Dados')
 
-    # Limpeza / Conversão de tipos
-    df['Year_of_Release'] = pd.to_numeric(df['Year_of_Release'], errors='coerce').astype('Int64')
-    df['Critic_Score'] = pd.to_numeric(df['Critic_Score'], errors='coerce')
-    df['Critic_Count'] = pd.to_numeric(df['Critic_Count'], errors='coerce')
-    df['User_Score'] = pd.to_numeric(df['User_Score'], errors='coerce')
-    df['User_Count'] = pd.to_numeric(df['User_Count'], errors='coerce')
+# Aquecimento dos caches em segundo plano (uma vez por processo; normalmente já começou na página inicial)
+aquecimento = iniciar_aquecimento()
+if aquecimento is not None and not aquecimento.concluido:
+    andamento = aquecimento.progresso()
+    st.sidebar.caption(f"🔥 Aquecendo caches: {andamento['concluidas']}/{andamento['tarefas']} tarefas")
 
-    for col in ['Name','Platform','Genre','Publisher','Developer','Rating']:
-        if col in df.columns:
-            df[col] = df[col].astype('string')
-
-    # Converte vendas negativas para 0
-    for c in ['NA_Sales','EU_Sales','JP_Sales','Other_Sales','Global_Sales']:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors='coerce').clip(lower=0)
-    return df
-
-df = load_data()
+with etapa('carga') as e:
+    df = load_data()
+    e['linhas'] = len(df)
 st.title('📊 Análise de Dados de Games')
 st.divider()
 st.caption('Escolha a Análise na Barra Lateral.')
@@ -41,242 +47,222 @@ with st.expander('⚙️ Filtros', expanded=False):
         ano_final = int(df['Year_of_Release'].dropna().max())
     periodo = st.slider('Ano de lançamento', ano_inicial, ano_final, (ano_inicial, ano_final))
 
-    plataformas = sorted(df['Platform'].dropna().unique().tolist()) if 'Platform' in df.columns else []
-    generos = sorted(df['Genre'].dropna().unique().tolist())    if 'Genre' in df.columns else []
-    publishers = sorted(df['Publisher'].dropna().unique().tolist()) if 'Publisher' in df.columns else []
+    plataformas = opcoes(df, 'Platform')
+    generos = opcoes(df, 'Genre')
 
     sel_plataformas = st.multiselect('Plataformas', plataformas, default=plataformas)
     sel_generos = st.multiselect('Gêneros',    generos,    default=generos)
-    sel_publishers = st.multiselect('Publishers (opcional)', publishers, default=[])
 
-# Aplica os Filtros
-mask = (
-    df['Year_of_Release'].between(periodo[0], periodo[1], inclusive='both')
-) & (df['Platform'].isin(sel_plataformas)) & (df['Genre'].isin(sel_generos))
-if sel_publishers:
-    mask &= df['Publisher'].isin(sel_publishers)
+    # Publishers: centenas de opções; o seletor mostra só os escolhidos e as sugestões da busca
+    # (os com mais jogos primeiro), resolvidas pelo índice de busca do navegador
+    busca_publishers = st.text_input('Buscar publishers', key='filtro:busca_publishers',
+                                     placeholder='ex.: nintendo, electronic')
+    escolhidos = st.session_state.get('filtro:publishers', [])
+    sugeridos = sugestoes(df, 'Publisher', busca_publishers, LIMITE_SUGESTOES)
+    sel_publishers = st.multiselect('Publishers (opcional)', list(dict.fromkeys([*escolhidos, *sugeridos])),
+                                    key='filtro:publishers',
+                                    help=f'Mostra até {LIMITE_SUGESTOES} publishers; use a busca para encontrar outros.')
 
-df_f = df[mask].copy()
+# Aplica os Filtros
+filtro = Filtro.normalizar(periodo, sel_plataformas, sel_generos, sel_publishers)
+with etapa('mascara') as e:
+    df_f = VisaoFiltrada(df, filtro)
+    e['linhas'] = len(df_f)
+with etapa('agregacao:kpis'):
+    resumo = indicadores(df_f)
 
 col_k1, col_k2, col_k3, col_k4 = st.columns(4)
 with col_k1:
-    st.metric('🎮 Jogos', f'{len(df_f):,}'.replace(",", "."))
+    st.metric('🎮 Jogos', f"{resumo['jogos']:,}".replace(",", "."))
 with col_k2:
-    st.metric('🌍 Vendas Globais (mi)', f"{df_f['Global_Sales'].sum():.2f}")
+    st.metric('🌍 Vendas Globais (mi)', f"{resumo['vendas_globais']:.2f}")
 with col_k3:
     st.metric('📅 Período', f'{periodo[0]}–{periodo[1]}')
 with col_k4:
-    st.metric('🧩 Gêneros', f"{df_f['Genre'].nunique()}")
+    st.metric('🧩 Gêneros', f"{resumo['generos']}")
 
 st.divider()
 
+# Envia a figura ao navegador (a serialização para JSON acontece aqui)
+def grafico(fig, nome: str):
+    with etapa(f'serializacao:{nome}'):
+        st.plotly_chart(fig, use_container_width=True)
+
 # Análise: tendência de lançamentos por ano
-def tendencia_lancamentos(data: pd.DataFrame):
-    s = data.dropna(subset=['Year_of_Release']).groupby('Year_of_Release')['Name'].count().reset_index()
-    if s.empty:
+def tendencia_lancamentos(data: VisaoFiltrada):
+    fig = figura('tendencia_lancamentos', data)
+    if fig is None:
         st.info('Sem dados suficientes para esta visualização.')
         return
-    fig = px.line(
-        s, x='Year_of_Release', y='Name', markers=True,
-        title='Tendência de Lançamentos por Ano',
-        labels={'Year_of_Release': 'Ano', 'Name': 'Qtde de jogos'}
-    )
-    fig.update_layout(template='plotly_dark')
-    st.plotly_chart(fig, use_container_width=True)
+    grafico(fig, 'tendencia_lancamentos')
 
 # Análise: gêneros mais populares
-def generos_populares(data: pd.DataFrame):
-    s = data.groupby('Genre')['Name'].count().sort_values(ascending=False).reset_index()
-    if s.empty:
+def generos_populares(data: VisaoFiltrada):
+    fig = figura('generos_populares', data)
+    if fig is None:
         st.info('Sem dados suficientes para esta visualização.')
         return
-    fig = px.bar(
-        s, x='Genre', y='Name', text='Name',
-        title='Gêneros Mais Populares (por nº de jogos)',
-        labels={'Genre': 'Gênero', 'Name':'Qtde de jogos'}
-    )
-    fig.update_traces(textposition='outside')
-    fig.update_layout(template='plotly_dark', xaxis_tickangle=30)
-    st.plotly_chart(fig, use_container_width=True)
+    grafico(fig, 'generos_populares')
 
 # Análise: plataformas com mais lançamentos
-def lancamentos_plataformas(data: pd.DataFrame):
-    s = data.groupby('Platform')['Name'].count().sort_values(ascending=False).reset_index()
-    if s.empty:
+def lancamentos_plataformas(data: VisaoFiltrada):
+    fig = figura('lancamentos_plataformas', data)
+    if fig is None:
         st.info('Sem dados suficientes para esta visualização.')
         return
-    fig = px.bar(
-        s, x='Platform', y='Name', text='Name',
-        title='Plataformas com Mais Lançamentos',
-        labels={'Platform': 'Plataforma', 'Name':'Qtde de jogos'}
-    )
-    fig.update_traces(textposition='outside')
-    fig.update_layout(template='plotly_dark')
-    st.plotly_chart(fig, use_container_width=True)
+    grafico(fig, 'lancamentos_plataformas')
 
 # Análise: top 10 jogos por vendas globais
-def vendas_globais(data: pd.DataFrame):
-    top = (data[['Name','Platform','Global_Sales']]
-           .dropna(subset=['Global_Sales'])
-           .sort_values('Global_Sales', ascending=False)
-           .head(10))
-    if top.empty:
+def vendas_globais(data: VisaoFiltrada):
+    fig = figura('vendas_globais', data)
+    if fig is None:
         st.info('Sem dados suficientes para esta visualização.')
         return
-    fig = px.bar(
-        top[::-1],  # inverte para mostrar o 1º no topo
-        x='Global_Sales', y='Name',
-        orientation='h', text='Global_Sales',
-        title='Top 10 Jogos por Vendas Globais (milhões)',
-        labels={'Global_Sales':'Vendas globais (mi)', 'Name':'Jogo'}
-    )
-    fig.update_traces(texttemplate='%{text:.2f}')
-    fig.update_layout(template='plotly_dark', yaxis={'categoryorder':'total ascending'})
-    st.plotly_chart(fig, use_container_width=True)
+    grafico(fig, 'vendas_globais')
+
+# Jogo mais vendido de cada gênero ou plataforma
+def mais_vendidos_por_grupo(data: VisaoFiltrada):
+    coluna = st.radio('Agrupar por', list(GRUPOS_VENDAS), format_func=GRUPOS_VENDAS.get, horizontal=True,
+                      key='mais_vendidos:coluna')
+    fig = figura('mais_vendidos', data, coluna)
+    if fig is None:
+        st.info('Sem dados de vendas para os filtros atuais.')
+        return
+    grafico(fig, 'mais_vendidos')
+    tabela = mais_vendidos_por(data, coluna)
+    st.dataframe(tabela.rename(columns={
+        'grupo': GRUPOS_VENDAS[coluna], 'Name': 'Jogo', 'Platform': 'Plataforma', 'Genre': 'Gênero',
+        'Year_of_Release': 'Ano', 'Global_Sales': 'Vendas globais (mi)', 'jogos': 'Jogos no grupo',
+        'vendas_grupo': 'Vendas do grupo (mi)', 'participacao': 'Fatia do grupo',
+    }).round(3), use_container_width=True, hide_index=True)
 
 # Análise: vendas por região
-def vendas_regiao(data: pd.DataFrame):
-    sales_cols = [c for c in ['NA_Sales','EU_Sales','JP_Sales','Other_Sales'] if c in data.columns]
-    if not sales_cols:
+def vendas_regiao(data: VisaoFiltrada):
+    fig = figura('vendas_regiao', data)
+    if fig is None:
         st.info('Colunas de vendas por região não encontradas.')
         return
-    s = data[sales_cols].sum().reset_index()
-    s.columns = ['Região','Vendas']
-    if s.empty:
-        st.info('Sem dados suficientes para esta visualização.')
-        return
-    fig = px.bar(
-        s, x='Região', y='Vendas', text='Vendas',
-        title='Distribuição de Vendas por Região (milhões)',
-        labels={'Vendas':'Vendas (mi)'}
-    )
-    fig.update_traces(texttemplate='%{text:.1f}', textposition='outside')
-    fig.update_layout(template='plotly_dark')
-    st.plotly_chart(fig, use_container_width=True)
+    grafico(fig, 'vendas_regiao')
+
+# Dispersões grandes viram amostra estratificada ou mapa de densidade; desligado, todos os pontos são enviados
+def reduzir_dispersao() -> bool:
+    return st.toggle('Reduzir dispersões grandes (amostra / densidade)', value=True, key='dispersao:reduzir',
+                     help='Desligue para enviar todos os pontos ao navegador (pode ficar lento em bases grandes).')
 
 # Análise: correlação entre notas de críticos e usuários
-def correlacao_notas(data: pd.DataFrame):
-    d = data[['Critic_Score','User_Score','Name','Platform','Genre']].dropna()
-    if d.empty:
+def correlacao_notas(data: VisaoFiltrada):
+    fig = figura('correlacao_notas', data, reduzir_dispersao())
+    if fig is None:
         st.info('Sem dados suficientes de notas nos filtros atuais.')
         return
-    d = d.assign(Critic_Score_10 = d['Critic_Score'] / 10.0)
-
-    # tenta trendline OLS (statsmodels); se não houver, mostra sem tendência
-    try:
-        fig = px.scatter(
-            d, x='Critic_Score_10', y='User_Score',
-            hover_data=['Name','Platform','Genre'],
-            trendline='ols',
-            title='Correlação: Nota de Críticos (0–10) x Usuários (0–10)',
-            labels={'Critic_Score_10':'Críticos (0–10)', 'User_Score':'Usuários (0–10)'}
-        )
-    except Exception:
-        st.warning("Trendline OLS indisponível (instale 'statsmodels'). Exibindo scatter sem tendência.")
-        fig = px.scatter(
-            d, x='Critic_Score_10', y='User_Score',
-            hover_data=['Name','Platform','Genre'],
-            title='Correlação: Nota de Críticos (0–10) x Usuários (0–10)',
-            labels={'Critic_Score_10':'Críticos (0–10)', 'User_Score':'Usuários (0–10)'}
-        )
-    fig.update_layout(template='plotly_dark')
-    st.plotly_chart(fig, use_container_width=True)
+    grafico(fig, 'correlacao_notas')
+
+# Jogos com maior discrepância entre críticos e usuários (notas puxadas para a média conforme o nº de avaliações)
+def discrepancias_criticos_usuarios(data: VisaoFiltrada):
+    c1, c2 = st.columns([3, 2])
+    with c1:
+        direcao = st.radio('Discrepância', list(DIRECOES), format_func=DIRECOES.get, horizontal=True,
+                           key='discrepancias:direcao')
+    with c2:
+        k = st.slider('Quantidade', 5, 50, TOP_DISCREPANCIAS, 5, key='discrepancias:k')
+    fig = figura('discrepancias_notas', data, direcao, k)
+    if fig is None:
+        st.info('Sem jogos com as duas notas nos filtros atuais.')
+        return
+    grafico(fig, 'discrepancias_notas')
+    st.caption('Diferença = nota dos críticos / 10 − nota dos usuários. Na ajustada, cada nota é puxada para a '
+               'média do filtro com peso inverso ao número de avaliações (Critic_Count / User_Count), para que '
+               'jogos com poucas avaliações não dominem o topo.')
+    tabela = discrepancias_notas(data, direcao, k)
+    st.dataframe(tabela.rename(columns={
+        'posicao': '#', 'Name': 'Jogo', 'Platform': 'Plataforma', 'Genre': 'Gênero', 'Year_of_Release': 'Ano',
+        'nota_criticos': 'Críticos (0–10)', 'nota_usuarios': 'Usuários (0–10)', 'Critic_Count': 'Nº críticas',
+        'User_Count': 'Nº avaliações usuários', 'diferenca': 'Diferença', 'diferenca_ajustada': 'Diferença ajustada',
+    }).round(2), use_container_width=True, hide_index=True)
 
 # Análise: vendas por classificação etária
-def vendas_classificacao_etaria(data: pd.DataFrame):
-    if 'Rating' not in data.columns or data['Rating'].dropna().empty:
+def vendas_classificacao_etaria(data: VisaoFiltrada):
+    fig = figura('vendas_classificacao_etaria', data)
+    if fig is None:
         st.info('Sem dados de classificação etária (Rating) para os filtros atuais.')
         return
-    s = data.dropna(subset=['Rating']).groupby('Rating')['Global_Sales'].sum().reset_index()
-    s = s.sort_values('Global_Sales', ascending=False)
-    if s.empty:
-        st.info('Sem dados suficientes para esta visualização.')
+    grafico(fig, 'vendas_classificacao_etaria')
+
+# Publicadoras e desenvolvedoras: top-k por lançamentos, vendas ou notas ponderadas pelo nº de avaliações
+def publicadoras_desenvolvedoras(data: VisaoFiltrada):
+    c1, c2, c3, c4 = st.columns([2, 3, 2, 2])
+    with c1:
+        coluna = st.radio('Agrupar', list(GRUPOS), format_func=GRUPOS.get, horizontal=True)
+    with c2:
+        metrica = st.selectbox('Ordenar por', list(METRICAS), format_func=lambda m: METRICAS[m][0])
+    with c3:
+        k = st.slider('Quantidade', 5, 50, TOP_RANKING, 5)
+    with c4:
+        minimo = int(st.number_input('Mínimo de lançamentos (médias)', 1, 1000, MINIMO_LANCAMENTOS))
+
+    fig = figura('ranking_empresas', data, coluna, metrica, k, minimo)
+    if fig is None:
+        st.info('Sem publicadoras/desenvolvedoras com dados suficientes para os filtros atuais.')
         return
-    fig = px.bar(
-        s, x='Rating', y='Global_Sales', text='Global_Sales',
-        title='Vendas Globais por Classificação Etária (milhões)',
-        labels={'Rating':'Rating', 'Global_Sales':'Vendas (mi)'}
-    )
-    fig.update_traces(texttemplate='%{text:.1f}', textposition='outside')
-    fig.update_layout(template='plotly_dark')
-    st.plotly_chart(fig, use_container_width=True)
+    grafico(fig, 'ranking_empresas')
+    if METRICAS[metrica][1]:
+        st.caption(f"Só entram grupos com ao menos {minimo} lançamentos. Notas ponderadas pelo número de "
+                   "avaliações de cada jogo (Critic_Count / User_Count).")
+    tabela = ranking_empresas(data, coluna, metrica, k, minimo)
+    st.dataframe(tabela.rename(columns={
+        'posicao': '#', 'grupo': GRUPOS[coluna], 'lancamentos': 'Lançamentos', 'vendas_total': 'Vendas globais (mi)',
+        'vendas_media': 'Vendas médias (mi)', 'nota_criticos': 'Nota críticos (0–100)',
+        'nota_usuarios': 'Nota usuários (0–10)',
+    }).round(2), use_container_width=True, hide_index=True)
 
 # Medidas centrais e distribuições
-def medidas_centrais(data: pd.DataFrame):
+def medidas_centrais(data: VisaoFiltrada):
     # Notas de usuários x críticos
     st.subheader("⭐ Notas: Medidas Centrais e Correlação")
 
-    notas = data[['Critic_Score','User_Score']].dropna()
-    if notas.empty:
+    # Medianas e percentis exatos (ordenam as linhas filtradas) ou dos esboços de quantis somados por célula
+    aproximado = st.toggle(f"Quantis aproximados (esboços, erro relativo ≤ {ERRO_RELATIVO:.0%})",
+                           key='quantis_aproximados')
+    if aproximado and data.filtro.publishers:
+        st.caption("Com filtro de publishers os quantis são calculados de forma exata.")
+
+    medidas = notas(data, aproximado)
+    if medidas is None:
         st.warning("Sem dados suficientes de notas para esta seção.")
     else:
-        # Normaliza a nota dos críticos para a mesma escala 0–10
-        notas = notas.assign(Critic_Score_10 = notas['Critic_Score'] / 10.0)
-
-        # Medidas centrais das notas
-        cs_mean = notas['Critic_Score_10'].mean()
-        cs_median = notas['Critic_Score_10'].median()
-        cs_std = notas['Critic_Score_10'].std()
-
-        us_mean = notas['User_Score'].mean()
-        us_median = notas['User_Score'].median()
-        us_std = notas['User_Score'].std()
-
         c1, c2, c3 = st.columns(3)
         with c1:
-            st.metric("Críticos — Média (0–10)", f"{cs_mean:.2f}")
-            st.metric("Usuários — Média (0–10)", f"{us_mean:.2f}")
+            st.metric("Críticos — Média (0–10)", f"{medidas['media_criticos']:.2f}")
+            st.metric("Usuários — Média (0–10)", f"{medidas['media_usuarios']:.2f}")
         with c2:
-            st.metric("Críticos — Mediana (0–10)", f"{cs_median:.2f}")
-            st.metric("Usuários — Mediana (0–10)", f"{us_median:.2f}")
+            st.metric("Críticos — Mediana (0–10)", f"{medidas['mediana_criticos']:.2f}")
+            st.metric("Usuários — Mediana (0–10)", f"{medidas['mediana_usuarios']:.2f}")
         with c3:
-            st.metric("Críticos — Desvio Padrão", f"{cs_std:.2f}")
-            st.metric("Usuários — Desvio Padrão", f"{us_std:.2f}")
+            st.metric("Críticos — Desvio Padrão", f"{medidas['desvio_criticos']:.2f}")
+            st.metric("Usuários — Desvio Padrão", f"{medidas['desvio_usuarios']:.2f}")
 
         # Correlação (Pearson)
-        corr = notas[['Critic_Score_10','User_Score']].corr().iloc[0,1]
-        st.info(f"Coeficiente de correlação entre notas de **Críticos (0–10)** e **Usuários (0–10)**: **{corr:.2f}**")
+        st.info(f"Coeficiente de correlação entre notas de **Críticos (0–10)** e **Usuários (0–10)**: "
+                f"**{medidas['correlacao']:.2f}**")
 
-        # Scatter com trendline quando possível
-        try:
-            fig_scatter = px.scatter(
-                notas, x='Critic_Score_10', y='User_Score',
-                title="Correlação: Críticos (0–10) x Usuários (0–10)",
-                labels={'Critic_Score_10':'Críticos (0–10)', 'User_Score':'Usuários (0–10)'},
-                trendline='ols'
-            )
-        except Exception:
-            st.warning("Trendline OLS indisponível (instale 'statsmodels'). Exibindo sem tendência.")
-            fig_scatter = px.scatter(
-                notas, x='Critic_Score_10', y='User_Score',
-                title="Correlação: Críticos (0–10) x Usuários (0–10)",
-                labels={'Critic_Score_10':'Críticos (0–10)', 'User_Score':'Usuários (0–10)'},
-            )
-        fig_scatter.update_layout(template='plotly_dark')
-        st.plotly_chart(fig_scatter, use_container_width=True)
+        # Scatter com reta de tendência (OLS)
+        fig_scatter = figura('medidas_notas', data, reduzir_dispersao())
+        grafico(fig_scatter, 'medidas_notas')
 
     st.divider()
 
     # Médias de vendas por região
     st.subheader("🌍 Médias de Vendas por Região")
 
-    sales_cols = [c for c in ['NA_Sales','EU_Sales','JP_Sales','Other_Sales'] if c in data.columns]
-    if not sales_cols:
+    if not colunas_regioes(data):
         st.warning("Colunas de vendas regionais não encontradas.")
         return
 
-    means = data[sales_cols].mean().rename_axis("Região").reset_index(name="Média_Vendas")
-    fig_reg = px.bar(
-        means, x='Região', y='Média_Vendas', text='Média_Vendas',
-        title="Médias de Vendas por Região (mi por jogo)",
-        labels={'Média_Vendas':'Média (mi)'}
-    )
-    fig_reg.update_traces(texttemplate='%{text:.2f}', textposition='outside')
-    fig_reg.update_layout(template='plotly_dark')
-    st.plotly_chart(fig_reg, use_container_width=True)
+    fig_reg = figura('medidas_regioes', data)
+    grafico(fig_reg, 'medidas_regioes')
 
     # Insight automático sobre a ordem das regiões
-    order = means.sort_values('Média_Vendas', ascending=False)['Região'].tolist()
+    order = ordem_regioes(medias_regioes(data))
     ordem_str = " > ".join(order)
     st.caption(f"**Ordem das médias por região (maior → menor):** {ordem_str}")
     if all(r in order for r in ['NA_Sales','EU_Sales','JP_Sales']):
@@ -285,21 +271,27 @@ def medidas_centrais(data: pd.DataFrame):
         else:
             st.info("Para os filtros atuais, a ordem **NA > EU > JP** não se mantém exatamente; veja o ranking acima.")
 
+    # Percentis das vendas por jogo
+    with etapa('agregacao:percentis_vendas'):
+        tabela = percentis_vendas(data, aproximado)
+    tabela.index = ['P25', 'Mediana', 'P75', 'P90']
+    aproximados = aproximado and not data.filtro.publishers
+    st.caption("**Percentis das vendas por jogo (mi)**" + (" — aproximados" if aproximados else ""))
+    st.dataframe(tabela.T.round(3), use_container_width=True)
+
 # Teste de hipótese: jogos de Ação vendem mais que RPG?
 
-def teste_acao_vs_rpg(data: pd.DataFrame):
+def teste_acao_vs_rpg(data: VisaoFiltrada):
     st.write("**H₀**: A média de vendas globais de jogos de Ação = média de RPG")
     st.write("**H₁**: A média de vendas globais de jogos de Ação > média de RPG")
 
-    acao = data.loc[data['Genre'] == 'Action', 'Global_Sales'].dropna()
-    rpg = data.loc[data['Genre'] == 'Role-Playing', 'Global_Sales'].dropna()
-
-    if acao.empty or rpg.empty:
+    # teste t de Welch a partir de n, Σ e Σ² por gênero (somados do cubo, sem passar pelas linhas)
+    with etapa('agregacao:teste_t:acao_vs_rpg'):
+        teste = teste_medias(data, *HIPOTESES['acao_vs_rpg'])
+    if teste is None:
         st.warning("Não há dados suficientes para comparar Ação vs RPG.")
         return
-
-    # teste t
-    stat, p = ttest_ind(acao, rpg, alternative='greater', equal_var=False)
+    stat, p = teste.t, teste.p
 
     st.write(f"Estatística t: **{stat:.3f}**")
     st.write(f"P-Valor: **{p:.5f}**")
@@ -311,28 +303,71 @@ def teste_acao_vs_rpg(data: pd.DataFrame):
         st.info("Não rejeitamos H₀ → Não há evidência suficiente de que Ação venda mais que RPG.")
 
     # boxplot comparativo
-    subset = data[data['Genre'].isin(['Action','Role-Playing'])]
-    fig = px.box(subset, x='Genre', y='Global_Sales',
-                 title="Distribuição de Vendas Globais: Ação vs RPG",
-                 labels={'Global_Sales': 'Vendas Globais (mi)', 'Genre': 'Gênero'})
-    fig.update_layout(template='plotly_dark')
-    st.plotly_chart(fig, use_container_width=True)
+    grafico(figura('box_acao_vs_rpg', data), 'box_acao_vs_rpg')
+    alternativas_nao_parametricas(data, 'Genre', 'Action', 'Role-Playing')
+
+
+# Permutação e bootstrap como alternativa ao teste t (as vendas são muito assimétricas). Só roda ao clicar,
+# porque 100 mil reamostras levam segundos; o último resultado pedido fica na sessão e no cache do filtro.
+def alternativas_nao_parametricas(data: VisaoFiltrada, agrupamento: str, a: str, b: str):
+    with st.expander("🎲 Alternativas não paramétricas: permutação e bootstrap"):
+        chave = f'reamostragem:{agrupamento}:{a}:{b}'
+        c1, c2, c3, c4 = st.columns(4)
+        with c1:
+            estatistica = st.radio('Estatística', ['media', 'mediana'], key=f'{chave}:estatistica',
+                                   format_func={'media': 'Média', 'mediana': 'Mediana'}.get)
+        with c2:
+            n = int(st.number_input('Reamostras', 1_000, 1_000_000, 100_000, 10_000, key=f'{chave}:n'))
+        with c3:
+            orcamento = float(st.number_input('Orçamento por teste (s)', 0.5, 120.0, 10.0, 0.5,
+                                              key=f'{chave}:orcamento'))
+        with c4:
+            seed = int(st.number_input('Semente', 0, 2**31 - 1, 0, key=f'{chave}:seed'))
+
+        parametros = (data.filtro, estatistica, n, orcamento, seed)
+        if st.button("Executar", key=f'{chave}:executar'):
+            st.session_state[chave] = parametros
+        if st.session_state.get(chave) != parametros:
+            st.caption("Escolha os parâmetros e clique em Executar.")
+            return
+
+        try:
+            with etapa(f'agregacao:reamostragem:{agrupamento}'):
+                perm = reamostragem_vendas(data, agrupamento, a, b, 'permutacao', estatistica, n, seed, orcamento)
+                boot = reamostragem_vendas(data, agrupamento, a, b, 'bootstrap', estatistica, n, seed, orcamento)
+        except ValueError as e:
+            st.warning(f"Não foi possível reamostrar: {e}.")
+            return
+
+        def feitas(r) -> str:
+            return f"{r.reamostras:,} reamostras".replace(',', '.') + f", {r.tempo_s:.1f}s"
+
+        nome = 'médias' if estatistica == 'media' else 'medianas'
+        st.write(f"Diferença observada das {nome} ({a} − {b}): **{perm.observado:.4f}**")
+        st.write(f"P-Valor por permutação (unilateral): **{perm.p:.5f}** ± {perm.erro_p:.5f} ({feitas(perm)})")
+        st.write(f"IC bootstrap {boot.nivel:.0%} da diferença: **[{boot.ic[0]:.4f}, {boot.ic[1]:.4f}]** "
+                 f"({feitas(boot)})")
+        if not (perm.completa and boot.completa):
+            st.warning("O orçamento de tempo acabou antes de todas as reamostras: os resultados usam as "
+                       "que terminaram (o ± do p-valor é o erro de Monte Carlo).")
+        if perm.p < 0.05:
+            st.success(f"Rejeitamos H₀ pela permutação → {a} > {b} nas {nome} (nível 5%).")
+        else:
+            st.info(f"Não rejeitamos H₀ pela permutação → sem evidência de {a} > {b} nas {nome}.")
 
 
 # Teste de hipótese: Jogos antigos (até 2010) vendem mais que jogos atuais (após 2010)
-def teste_jogos_antigos_vs_atuais(data: pd.DataFrame):
+def teste_jogos_antigos_vs_atuais(data: VisaoFiltrada):
     st.write("**H₀**: A média de vendas globais de jogos até 2010 = média de vendas após 2010")
     st.write("**H₁**: Jogos até 2010 vendem mais (média maior)")
 
-    antigos = data.loc[data['Year_of_Release'] <= 2010, 'Global_Sales'].dropna()
-    atuais = data.loc[data['Year_of_Release'] > 2010, 'Global_Sales'].dropna()
-
-    if antigos.empty or atuais.empty:
+    # teste t de Welch a partir de n, Σ e Σ² por período (somados do cubo)
+    with etapa('agregacao:teste_t:antigos_vs_atuais'):
+        teste = teste_medias(data, *HIPOTESES['antigos_vs_atuais'])
+    if teste is None:
         st.warning("Não há dados suficientes para comparar jogos antigos e atuais.")
         return
-
-    # teste t
-    stat, p = ttest_ind(antigos, atuais, alternative='greater', equal_var=False)
+    stat, p = teste.t, teste.p
 
     st.write(f"Estatística t: **{stat:.3f}**")
     st.write(f"P-Valor: **{p:.5f}**")
@@ -344,20 +379,72 @@ def teste_jogos_antigos_vs_atuais(data: pd.DataFrame):
         st.info("Não rejeitamos H₀ → Não há evidência suficiente de que jogos antigos vendam mais.")
 
     # boxplot comparativo
-    subset = data[data['Year_of_Release'].notna()].copy()
-    subset['Era'] = subset['Year_of_Release'].apply(lambda x: 'Até 2010' if x <= 2010 else 'Após 2010')
-    fig = px.box(subset, x='Era', y='Global_Sales',
-                 title="Distribuição de Vendas Globais: Jogos Antigos vs Atuais",
-                 labels={'Global_Sales': 'Vendas Globais (mi)', 'Era': 'Período'})
-    fig.update_layout(template='plotly_dark')
-    st.plotly_chart(fig, use_container_width=True)
+    grafico(figura('box_antigos_vs_atuais', data), 'box_antigos_vs_atuais')
+    alternativas_nao_parametricas(data, 'Era2010', 'Até 2010', 'Após 2010')
+
+
+# Todos os pares de gêneros / plataformas / décadas de uma vez, com correção para comparações múltiplas
+def comparacoes_multiplas(data: VisaoFiltrada):
+    st.write("**H₀** (para cada par): as médias de vendas globais dos dois grupos são iguais (Welch, bilateral)")
+    c1, c2 = st.columns(2)
+    with c1:
+        agrupamento = st.selectbox('Comparar', list(AGRUPAMENTOS), format_func=lambda k: AGRUPAMENTOS[k][0])
+    with c2:
+        nomes = {'holm': 'Holm (FWER)', 'bh': 'Benjamini–Hochberg (FDR)', 'bonferroni': 'Bonferroni'}
+        correcao = st.radio('Correção', list(CORRECOES), format_func=nomes.get, horizontal=True)
+
+    with etapa(f'agregacao:pares:{agrupamento}'):
+        pares = pares_vendas(data, agrupamento, correcao)
+    if pares.empty:
+        st.warning("São necessários ao menos dois grupos com vendas para comparar.")
+        return
+    destaques = significativos(pares)
+    st.write(f"Pares testados: **{len(pares)}** · significativos a 5% após a correção: **{len(destaques)}**")
+    grafico(figura('matriz_pares', data, agrupamento, correcao), 'matriz_pares')
+    if not destaques.empty:
+        st.dataframe(destaques, use_container_width=True, hide_index=True)
+
+
+# Navegação paginada pelas linhas filtradas: busca e ordenação resolvidas pelos índices de games.navegacao,
+# só a página visível é montada e enviada ao navegador
+def navegador(data: VisaoFiltrada):
+    modos = {'prefixo': 'Início das palavras', 'trecho': 'Qualquer trecho'}
+    c1, c2, c3, c4 = st.columns([3, 2, 2, 1])
+    with c1:
+        texto = st.text_input('Buscar em nome, publisher e developer', key='navegacao:texto',
+                              placeholder='ex.: mario kart')
+    with c2:
+        modo = st.radio('Casar', MODOS_BUSCA, format_func=modos.get, horizontal=True, key='navegacao:modo')
+    with c3:
+        coluna = st.selectbox('Ordenar por', ['(ordem original)', *data.columns], key='navegacao:coluna')
+    with c4:
+        decrescente = st.toggle('Decrescente', key='navegacao:decrescente')
+    tamanho = st.selectbox('Linhas por página', TAMANHOS_PAGINA, key='navegacao:tamanho')
+    coluna = None if coluna == '(ordem original)' else coluna
+
+    # busca, ordem ou filtro novos voltam para a primeira página
+    consulta = (data.filtro, texto, modo, coluna, decrescente, tamanho)
+    if st.session_state.get('navegacao:consulta') != consulta:
+        st.session_state['navegacao:consulta'] = consulta
+        st.session_state['navegacao:pagina'] = 1
+    with etapa('navegacao:pagina'):
+        p = pagina(data, st.session_state.get('navegacao:pagina', 1), tamanho, texto, modo=modo, coluna=coluna,
+                   crescente=not decrescente)
+    st.session_state['navegacao:pagina'] = p.numero
+    st.number_input('Página', min_value=1, max_value=p.paginas, step=1, key='navegacao:pagina')
+    if p.total == 0:
+        st.info('Nenhum jogo encontrado para a busca e os filtros atuais.')
+        return
+    st.caption(f"{p.total:,} jogos · linhas {p.inicio + 1:,}–{p.inicio + len(p.dados):,} · "
+               f"página {p.numero:,} de {p.paginas:,}".replace(',', '.'))
+    st.dataframe(p.dados, use_container_width=True)
 
 
 #Visao geral dos dados
-def visao_geral():
+def visao_geral(data: VisaoFiltrada):
     st.subheader('📌 Visão Geral dos Dados')
-    with st.expander('Visualizar amostra da base', expanded=False):
-        st.dataframe(df_f.head(25), use_container_width=True)
+    with st.expander('Navegar pela base', expanded=False):
+        navegador(data)
 
 analises = st.sidebar.radio(
     'Escolha a análise',
@@ -370,6 +457,7 @@ analises = st.sidebar.radio(
         'Vendas por Região',
         'Notas: Críticos vs Usuários',
         'Vendas por Classificação Etária',
+        'Publicadoras & Desenvolvedoras',
         'Medidas Centrais & Distribuições',
         'Teste de Hipótese'
     ],
@@ -401,8 +489,8 @@ match analises:
     case 'Visão Geral':
         st.subheader('📌 Visão Geral dos Dados')
         st.write('Base de dados: Vendas e Análises de Jogos *(1980 - 2020)*')
-        with st.expander('Visualizar amostra da base', expanded=False):
-            st.dataframe(df_f.head(25), use_container_width=True)
+        with st.expander('Navegar pela base', expanded=False):
+            navegador(df_f)
         st.divider()
         st.subheader('📋 Identificação dos Tipos das Variáveis & Descrição das Colunas')
         mostrar_dicionario_variaveis()
@@ -483,6 +571,9 @@ match analises:
         st.markdown('''
         💡 **Insight:** O top 10 é dominado pela Nintendo, com foco em jogos casuais e familiares.
         ''')
+        st.divider()
+        st.subheader('🥇 Mais Vendido por Gênero e Plataforma')
+        mais_vendidos_por_grupo(df_f)
 
     case 'Vendas por Região':
         st.subheader('🌍 Vendas por Região')
@@ -504,6 +595,9 @@ match analises:
         💡 **Insight:** Jogos bem avaliados pela crítica tendem a agradar os jogadores também, 
         mas há discrepâncias (nem sempre o que a crítica gosta é o que os jogadores compram).
         ''')
+        st.divider()
+        st.subheader('⚖️ Maiores Discrepâncias entre Críticos e Usuários')
+        discrepancias_criticos_usuarios(df_f)
 
     case 'Vendas por Classificação Etária':
         st.subheader('🔞 Vendas por Classificação Etária')
@@ -516,6 +610,10 @@ match analises:
         💡 **Insight:** Jogos para todas as idades (E) dominam em vendas, confirmando o apelo familiar, mas T e M também têm grande mercado.
         ''')
 
+    case 'Publicadoras & Desenvolvedoras':
+        st.subheader('🏢 Publicadoras e Desenvolvedoras')
+        publicadoras_desenvolvedoras(df_f)
+
     case 'Medidas Centrais & Distribuições':
         st.subheader('📊 Medidas Centrais e Distribuições')
         medidas_centrais(df_f)
@@ -526,6 +624,24 @@ match analises:
         st.divider()
         st.subheader('🎮 Teste de Hipótese: Jogos Antigos (até 2010) vs Atuais (após 2010)')
         teste_jogos_antigos_vs_atuais(df_f)
+        st.divider()
+        st.subheader('🧮 Comparações Múltiplas: Todos os Pares')
+        comparacoes_multiplas(df_f)
 
     case _:
         st.warning('Selecione uma análise válida na barra lateral.')
+
+# Painel de instrumentação: etapas deste rerun (o log em JSON lines acumula todas as sessões)
+rerun = finalizar({'filtros': CACHE_FILTROS.estatisticas(), 'figuras': CACHE_FIGURAS.estatisticas()})
+if rerun is not None:
+    st.divider()
+    with st.expander('🐞 Instrumentação deste rerun', expanded=True):
+        st.caption(f'Total: {rerun.total_s * 1e3:.1f} ms · sessão {rerun.sessao} · log: {ARQUIVO_LOG}')
+        st.dataframe(pd.DataFrame(rerun.etapas), use_container_width=True)
+        st.write('Caches:')
+        st.dataframe(pd.DataFrame(rerun.caches).T, use_container_width=True)
+        if aquecimento is not None:
+            andamento, cobertura = aquecimento.progresso(), aquecimento.cobertura()
+            st.caption(f"Aquecimento: {andamento['concluidas']}/{andamento['tarefas']} tarefas "
+                       f"({andamento['falhas']} falhas) em {andamento['tempo_s']}s · {len(aquecimento.filtros)} filtros · cobertura: "
+                       f"{cobertura['filtros']:.0%} dos filtros, {cobertura['figuras']:.0%} das figuras")
@@ -0,0 +1,75 @@
+# Bases dos testes: o CSV que acompanha o app e um quadro sintético pequeno com os casos de borda da limpeza
+# (sem ano, sem nome/gênero, venda negativa, 'tbd', acentos e empates). Cada motor é comparado com o mesmo
+# cálculo feito direto no pandas sobre as linhas filtradas.
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from games import carga
+from games.filtros import Filtro, opcoes
+
+CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'games_db.csv')
+
+SINTETICO = ','.join(carga.ESQUEMA) + """
+Pokémon Red,GB,1996,Role-Playing,Nintendo,11.27,8.89,10.22,1,31.37,,,,,,
+Super Mario Bros.,NES,1985,Platform,Nintendo,29.08,3.58,6.81,0.77,40.24,,,,,,
+Mario Kart Wii,Wii,2008,Racing,Nintendo,15.68,12.76,3.79,3.29,35.52,82,73,8.3,709,Nintendo,E
+Halo 3,X360,2007,Shooter,Microsoft Game Studios,7.97,2.81,0.13,1.21,12.12,94,87,7.8,2350,Bungie Studios,M
+Grand Theft Auto V,PS3,2013,Action,Take-Two Interactive,7.02,9.09,0.98,3.96,21.04,97,50,8.2,3994,Rockstar North,M
+Grand Theft Auto V,X360,2013,Action,Take-Two Interactive,9.66,5.14,0.06,1.41,16.27,97,58,8.1,3711,Rockstar North,M
+Sem Ano,PS2,,Action,Ubisoft,0.1,0.1,0,0.01,0.21,60,10,tbd,,Ubisoft,T
+Negativo,PS2,2004,Sports,Ubisoft,-0.5,0.2,0,0.01,0.21,70,12,6.5,20,Ubisoft,E
+,GEN,1993,,Acclaim Entertainment,1,0,0,0,1,,,,,,
+Tetris,GB,1989,Puzzle,Nintendo,23.2,2.26,4.22,0.58,30.26,,,,,,
+Empate A,PC,2010,Strategy,Aaa Publisher,0.5,0.5,0,0,1,80,10,8,10,Aaa Dev,T
+Empate B,PC,2010,Strategy,Zzz Publisher,0.5,0.5,0,0,1,80,10,8,10,Zzz Dev,T
+Ação Épica,PS2,2004,Action,Ubisoft,1.5,0.5,0,0.2,2.2,75,30,7.1,40,Ubisoft Montréal,T
+"""
+
+
+@pytest.fixture(scope='session')
+def base() -> pd.DataFrame:
+    return carga.carregar_csv(CSV)
+
+
+@pytest.fixture(scope='session')
+def sintetico(tmp_path_factory) -> pd.DataFrame:
+    caminho = tmp_path_factory.mktemp('sintetico') / 'games.csv'
+    caminho.write_text(SINTETICO, encoding='utf-8')
+    return carga.carregar_csv(str(caminho))
+
+
+@pytest.fixture(params=['base', 'sintetico'])
+def df(request) -> pd.DataFrame:
+    return request.getfixturevalue(request.param)
+
+
+def mascara(df: pd.DataFrame, filtro: Filtro) -> np.ndarray:
+    # As linhas do filtro em pandas puro
+    ano = df['Year_of_Release']
+    m = ano.notna() & (ano >= filtro.periodo[0]) & (ano <= filtro.periodo[1])
+    if filtro.plataformas is not None:
+        m &= df['Platform'].isin(filtro.plataformas)
+    if filtro.generos is not None:
+        m &= df['Genre'].isin(filtro.generos)
+    if filtro.publishers:
+        m &= df['Publisher'].isin(filtro.publishers)
+    return m.fillna(False).to_numpy(dtype=bool)
+
+
+def filtros(df: pd.DataFrame, n: int = 12, seed: int = 0) -> list[Filtro]:
+    # Filtro de tudo, um vazio (nenhuma plataforma marcada) e sorteios com e sem publishers
+    rng = np.random.default_rng(seed)
+    plataformas, generos, publishers = opcoes(df, 'Platform'), opcoes(df, 'Genre'), opcoes(df, 'Publisher')
+    todos = [Filtro.normalizar((1980, 2020), plataformas, generos), Filtro.normalizar((1980, 2020), [], generos)]
+    for i in range(n):
+        a = int(rng.integers(1980, 2017))
+        todos.append(Filtro.normalizar(
+            (a, int(rng.integers(a, 2021))),
+            rng.choice(plataformas, rng.integers(1, len(plataformas) + 1), replace=False).tolist(),
+            rng.choice(generos, rng.integers(1, len(generos) + 1), replace=False).tolist(),
+            rng.choice(publishers, 3, replace=False).tolist() if i % 3 == 0 else (),
+        ))
+    return todos
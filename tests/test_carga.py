@@ -0,0 +1,100 @@
+# Linhas anexadas (CSVs em DIRETORIO_DELTAS e carga.anexar) contra a base inteira lida de uma vez. As
+# estruturas com atualização incremental (índice dos filtros, cubo, esboços) são construídas antes dos
+# deltas, para que sigam pelo caminho incremental e não sejam reconstruídas.
+import numpy as np
+import pandas as pd
+import pytest
+
+from games import carga
+from games.cubo import cubo, fatia, kpis
+from games.esbocos import MEDIDAS, esbocos, fatia_esbocos
+from games.filtros import Filtro, VisaoFiltrada, indice, opcoes, selecionar
+from games.navegacao import pagina
+from tests.conftest import CSV, filtros
+
+# Só nos deltas: três plataformas e um publisher inteiros (categorias novas para a base)
+NOVAS = {'Platform': ['PS4', 'XOne', 'WiiU'], 'Publisher': ['Nintendo']}
+
+
+@pytest.fixture
+def arquivos(tmp_path, monkeypatch):
+    monkeypatch.setattr(carga, 'DIRETORIO_CACHE', str(tmp_path / 'cache'))
+    monkeypatch.setattr(carga, 'DIRETORIO_DELTAS', str(tmp_path / 'deltas'))
+    (tmp_path / 'deltas').mkdir()
+    bruto = pd.read_csv(CSV)
+    novas = np.logical_or.reduce([bruto[c].isin(v) for c, v in NOVAS.items()])
+    base, resto = bruto[~novas].iloc[:8_000], pd.concat([bruto[~novas].iloc[8_000:], bruto[novas]])
+    base.to_csv(tmp_path / 'base.csv', index=False)
+    partes = np.array_split(np.arange(len(resto)), 3)
+    for i, p in enumerate(partes):
+        resto.iloc[p].to_csv(tmp_path / f'delta{i}.csv', index=False)
+    pd.concat([base, resto]).to_csv(tmp_path / 'inteira.csv', index=False)
+    return tmp_path, len(partes)
+
+
+def _comparar(df: pd.DataFrame, ref: pd.DataFrame):
+    assert len(df) == len(ref) and list(df.columns) == list(ref.columns)
+    for c in ref.columns:
+        assert df[c].dtype.name == ref[c].dtype.name, c
+        assert df[c].isna().equals(ref[c].isna()), c
+        assert np.array_equal(df[c].dropna().astype(object).to_numpy(), ref[c].dropna().astype(object).to_numpy()), c
+        if isinstance(ref[c].dtype, pd.CategoricalDtype):
+            assert opcoes(df, c) == opcoes(ref, c), c
+    for filtro in filtros(ref):
+        assert np.array_equal(selecionar(df, filtro), selecionar(ref, filtro)), filtro
+        assert kpis(fatia(df, filtro)) == pytest.approx(kpis(fatia(ref, filtro))), filtro
+        a, b = fatia_esbocos(df, filtro), fatia_esbocos(ref, filtro)
+        for m in MEDIDAS if a is not None else []:
+            assert np.array_equal(a[m].baldes, b[m].baldes) and np.array_equal(a[m].contagens, b[m].contagens), m
+        visao, visao_ref = VisaoFiltrada(df, filtro), VisaoFiltrada(ref, filtro)
+        for coluna in ['Platform', 'Publisher']:
+            assert np.array_equal(pagina(visao, 1, 50, coluna=coluna).dados.index,
+                                  pagina(visao_ref, 1, 50, coluna=coluna).dados.index), coluna
+
+
+def test_deltas_com_categorias_novas(arquivos):
+    pasta, n_deltas = arquivos
+    caminho = str(pasta / 'base.csv')
+    df = carga.load_data(caminho)
+    assert not set(opcoes(df, 'Platform')) & set(NOVAS['Platform'])
+    anteriores = indice(df), cubo(df), esbocos(df)
+    for i in range(n_deltas):
+        (pasta / f'delta{i}.csv').rename(pasta / 'deltas' / f'delta{i}.csv')
+        df = carga.load_data(caminho)
+    assert carga.load_data(caminho) is df  # nada mudou: mesmo DataFrame
+    assert type(indice(df)).__name__ == 'IndiceSegmentado'  # atualizado, não reconstruído
+    assert all(a is not b for a, b in zip(anteriores, (indice(df), cubo(df), esbocos(df))))
+    _comparar(df, carga.carregar_csv(str(pasta / 'inteira.csv')))
+
+
+def test_delta_alterado_recomeca_da_base(arquivos):
+    pasta, _ = arquivos
+    caminho = str(pasta / 'base.csv')
+    (pasta / 'delta0.csv').rename(pasta / 'deltas' / 'delta0.csv')
+    com_delta = carga.load_data(caminho)
+    (pasta / 'deltas' / 'delta0.csv').write_text((pasta / 'delta1.csv').read_text())
+    df = carga.load_data(caminho)
+    assert df is not com_delta
+    base, delta = carga.carregar_csv(caminho), carga.carregar_csv(str(pasta / 'delta1.csv'))
+    assert len(df) == len(base) + len(delta)
+    assert df['Name'].iloc[len(base):].tolist() == delta['Name'].tolist()
+
+
+def test_anexar_quadro_com_plataforma_nova(arquivos):
+    pasta, _ = arquivos
+    caminho = str(pasta / 'base.csv')
+    df = carga.load_data(caminho)
+    selecionar(df, Filtro.normalizar((1980, 2020), None, None))
+    cubo(df)
+    novo = carga.anexar(pd.DataFrame({
+        'Name': ['Jogo Novo', 'Outro'], 'Platform': ['NEW', 'PS2'], 'Year_of_Release': ['2030', '2030'],
+        'Genre': ['Action', 'Action'], 'Global_Sales': ['-1', '2.5'], 'User_Score': ['tbd', '7.5'],
+    }), caminho)
+    assert len(novo) == len(df) + 2 and carga.load_data(caminho) is novo
+    assert 'NEW' in opcoes(novo, 'Platform')
+    assert novo['Global_Sales'].iloc[-2:].tolist() == [0.0, 2.5]  # venda negativa zerada, como na carga
+    assert np.isnan(novo['User_Score'].iloc[-2])
+    filtro = Filtro.normalizar((2030, 2030), ['NEW', 'PS2'], ['Action'])
+    assert selecionar(novo, filtro).tolist() == [len(df), len(df) + 1]
+    assert kpis(fatia(novo, filtro)) == {'jogos': 2, 'vendas_globais': 2.5, 'generos': 1}
+    assert selecionar(df, filtro).tolist() == []  # a versão anterior continua a mesma
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from games.cubo import fatia, jogos_por, kpis, lancamentos_por_ano, vendas_por_classificacao, vendas_por_regiao
+from games.estatistica import SomasGrupos, SomasPares
+from tests.conftest import filtros, mascara
+
+
+def test_agregacoes_iguais_ao_pandas(df):
+    for filtro in filtros(df):
+        c, linhas = fatia(df, filtro), df[mascara(df, filtro)]
+        k = kpis(c)
+        assert k['jogos'] == len(linhas)
+        assert k['vendas_globais'] == pytest.approx(linhas['Global_Sales'].sum())
+        assert k['generos'] == linhas['Genre'].nunique()
+        esperado = linhas.groupby('Year_of_Release')['Name'].count()
+        pd.testing.assert_series_equal(lancamentos_por_ano(c).astype(np.int64), esperado.astype(np.int64),
+                                       check_names=False, check_index_type=False)
+        for dimensao in ['Platform', 'Genre']:
+            obtido = jogos_por(c, dimensao)
+            esperado = linhas.groupby(dimensao, observed=True)['Name'].count()
+            esperado = esperado[linhas.groupby(dimensao, observed=True).size() > 0]
+            assert obtido.sort_index().to_dict() == esperado.sort_index().to_dict(), dimensao
+        obtido = vendas_por_classificacao(c)
+        esperado = linhas.groupby('Rating', observed=True)['Global_Sales'].sum()
+        assert obtido.sort_index().to_dict() == pytest.approx(esperado.sort_index().to_dict())
+        regioes = vendas_por_regiao(c)
+        for regiao in regioes.index:
+            assert regioes[regiao] == pytest.approx(linhas[regiao].sum())
+
+
+def test_somas_suficientes_das_notas(df):
+    for filtro in filtros(df, n=6):
+        linhas = df[mascara(df, filtro)]
+        pares = linhas[['Critic_Score', 'User_Score']].dropna()
+        x, y = pares['Critic_Score'] / 10.0, pares['User_Score']
+        s = SomasPares.de_cubo(fatia(df, filtro))
+        assert s.n == len(pares)
+        if len(pares) >= 3 and x.std() > 0:
+            assert s.media() == pytest.approx((x.mean(), y.mean()))
+            assert s.desvio() == pytest.approx((x.std(), y.std()))
+            a = s.ajuste()
+            inclinacao, intercepto = np.polyfit(x, y, 1)
+            assert (a.inclinacao, a.intercepto) == pytest.approx((inclinacao, intercepto))
+            assert a.r == pytest.approx(x.corr(y))
+
+
+def test_somas_por_grupo_e_welch(base):
+    stats = pytest.importorskip('scipy.stats')
+    filtro = filtros(base)[0]
+    linhas = base[mascara(base, filtro)]
+    grupos = SomasGrupos.de_cubo(fatia(base, filtro), 'Genre')
+    vendas = linhas.dropna(subset=['Global_Sales']).groupby('Genre', observed=True)['Global_Sales']
+    assert list(grupos.rotulos) == list(vendas.mean().index)
+    assert grupos.media() == pytest.approx(vendas.mean().to_numpy())
+    assert grupos.variancia() == pytest.approx(vendas.var().to_numpy())
+    a, b = (linhas.loc[linhas['Genre'] == g, 'Global_Sales'].dropna() for g in ('Action', 'Role-Playing'))
+    esperado = stats.ttest_ind(a, b, equal_var=False, alternative='greater')
+    teste = grupos.teste('Action', 'Role-Playing', 'greater')
+    assert (teste.t, teste.p) == pytest.approx((esperado.statistic, esperado.pvalue))
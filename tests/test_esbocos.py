@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from games.esbocos import ERRO_RELATIVO, MEDIDAS, MINIMO, fatia_esbocos
+from tests.conftest import filtros, mascara
+
+QUANTIS = [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0]
+
+
+def _valores(linhas, medida: str) -> np.ndarray:
+    # notas só dos pares completos, como nos esboços
+    if medida in ('Critic_Score', 'User_Score'):
+        linhas = linhas.dropna(subset=['Critic_Score', 'User_Score'])
+    return np.sort(linhas[medida].dropna().to_numpy(dtype=float))
+
+
+def test_quantis_dentro_do_erro_relativo(df):
+    for filtro in filtros(df):
+        esbocos = fatia_esbocos(df, filtro)
+        if filtro.publishers:
+            assert esbocos is None  # publishers não são dimensão dos esboços: quem chama usa o cálculo exato
+            continue
+        linhas = df[mascara(df, filtro)]
+        for medida in MEDIDAS:
+            x, e = _valores(linhas, medida), esbocos[medida]
+            assert e.n == len(x), medida
+            if not len(x):
+                assert np.isnan(e.mediana())
+                continue
+            # garantia: |x̂ − x₍ₖ₎| ≤ α·x₍ₖ₎, com k = ⌊q·(n − 1)⌋
+            exato = x[np.floor(np.array(QUANTIS) * (len(x) - 1)).astype(int)]
+            aproximado = e.quantil(QUANTIS)
+            zero = exato <= MINIMO
+            assert np.all(aproximado[zero] == 0), medida
+            assert np.all(np.abs(aproximado - exato)[~zero] <= ERRO_RELATIVO * exato[~zero] * (1 + 1e-9)), medida
+
+
+def test_juntar_soma_as_contagens(base):
+    # o esboço de duas fatias juntas é o da união: com a mesma fatia duas vezes, os quantis não mudam
+    e = fatia_esbocos(base, filtros(base)[0])['Global_Sales']
+    dobro = e.juntar(e)
+    assert dobro.n == 2 * e.n
+    assert dobro.quantil(QUANTIS) == pytest.approx(e.quantil(QUANTIS))
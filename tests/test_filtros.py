@@ -0,0 +1,33 @@
+import numpy as np
+
+from games.filtros import Filtro, VisaoFiltrada, opcoes, selecionar
+from tests.conftest import filtros, mascara
+
+
+def test_selecionar_igual_ao_pandas(df):
+    for filtro in filtros(df):
+        assert np.array_equal(selecionar(df, filtro), np.flatnonzero(mascara(df, filtro))), filtro
+
+
+def test_visao_reune_as_colunas_do_filtro(df):
+    for filtro in filtros(df, n=4):
+        visao = VisaoFiltrada(df, filtro)
+        esperado = df[mascara(df, filtro)]
+        assert len(visao) == len(esperado)
+        for coluna in ['Name', 'Platform', 'Global_Sales', 'Year_of_Release']:
+            assert visao[coluna].equals(esperado[coluna]), coluna
+
+
+def test_filtro_vazio(df):
+    for filtro in [Filtro.normalizar((1980, 2020), [], opcoes(df, 'Genre')),
+                   Filtro.normalizar((1980, 2020), opcoes(df, 'Platform'), opcoes(df, 'Genre'), ['Não existe']),
+                   Filtro.normalizar((2100, 2200), None, None)]:
+        assert len(selecionar(df, filtro)) == 0
+        assert len(VisaoFiltrada(df, filtro)['Name']) == 0
+
+
+def test_valores_desconhecidos_sao_ignorados(df):
+    plataformas = opcoes(df, 'Platform')
+    com = Filtro.normalizar((1980, 2020), [*plataformas[:2], 'Não existe'], None)
+    sem = Filtro.normalizar((1980, 2020), plataformas[:2], None)
+    assert np.array_equal(selecionar(df, com), selecionar(df, sem))
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from games.filtros import VisaoFiltrada
+from games.navegacao import CAMPOS_BUSCA, buscar, normalizar, pagina, sugestoes
+from tests.conftest import filtros, mascara
+
+TEXTOS = ['mario', 'grand theft', 'pokemon', 'POKÉMON red', 'acao epi', 'nintendo', 'halo 3', 'xyzzy']
+
+
+def _casa(valor, palavras: list[str], modo: str) -> bool:
+    if pd.isna(valor):
+        return False
+    termos = normalizar(valor)
+    if modo == 'prefixo':
+        return all(any(t.startswith(p) for t in termos) for p in palavras)
+    return all(any(p in t for t in termos) for p in palavras)
+
+
+def _busca_pandas(df: pd.DataFrame, texto: str, modo: str) -> np.ndarray:
+    palavras = normalizar(texto)
+    m = np.zeros(len(df), dtype=bool)
+    for campo in CAMPOS_BUSCA:
+        distintos = df[campo].astype(object).drop_duplicates()
+        casam = {v for v in distintos if _casa(v, palavras, modo)}
+        m |= df[campo].astype(object).isin(casam).to_numpy()
+    return np.flatnonzero(m)
+
+
+def test_busca_igual_ao_pandas(df):
+    for modo in ['prefixo', 'trecho']:
+        for texto in TEXTOS:
+            assert np.array_equal(buscar(df, texto, modo=modo), _busca_pandas(df, texto, modo)), (texto, modo)
+    assert buscar(df, '  ') is None
+
+
+def test_paginas_ordenadas_iguais_ao_pandas(df):
+    for filtro in filtros(df, n=3):
+        visao = VisaoFiltrada(df, filtro)
+        linhas = df.reset_index(drop=True)[mascara(df, filtro)]
+        for coluna in ['Name', 'Platform', 'Global_Sales', 'Year_of_Release', None]:
+            for crescente in [True, False]:
+                esperado = linhas if coluna is None else linhas.sort_values(
+                    coluna, ascending=crescente, kind='stable', na_position='last')
+                p = pagina(visao, 2, 25, coluna=coluna, crescente=crescente)
+                assert p.total == len(linhas) and p.paginas == max(1, -(-len(linhas) // 25))
+                inicio = (p.numero - 1) * 25
+                assert p.inicio == (inicio if len(linhas) else 0)
+                assert np.array_equal(p.dados.index, esperado.index[inicio:inicio + 25]), (coluna, crescente)
+
+
+def test_pagina_com_busca_e_fora_da_faixa(df):
+    filtro = filtros(df)[0]
+    visao = VisaoFiltrada(df, filtro)
+    encontradas = np.intersect1d(_busca_pandas(df, 'grand', 'prefixo'), np.flatnonzero(mascara(df, filtro)))
+    p = pagina(visao, 1_000, 10, texto='grand')
+    assert p.total == len(encontradas)
+    assert p.numero == p.paginas  # página pedida além da última: vai para a última
+    assert np.array_equal(p.dados.index, encontradas[(p.numero - 1) * 10:])
+    vazia = pagina(visao, 3, 10, texto='xyzzy')
+    assert (vazia.total, vazia.numero, vazia.paginas, vazia.inicio, len(vazia.dados)) == (0, 1, 1, 0, 0)
+
+
+def test_sugestoes_das_mais_frequentes(df):
+    contagens = df['Publisher'].value_counts()
+    obtido = sugestoes(df, 'Publisher', limite=5)
+    assert [contagens[v] for v in obtido] == list(contagens.iloc[:5])
+    for v in sugestoes(df, 'Publisher', 'nin'):
+        assert _casa(v, ['nin'], 'prefixo')
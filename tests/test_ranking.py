@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from games.filtros import VisaoFiltrada
+from games.ranking import GRUPOS, MINIMO_LANCAMENTOS, ranking, top_k
+from tests.conftest import filtros, mascara
+
+
+def _metricas_pandas(linhas: pd.DataFrame, coluna: str) -> pd.DataFrame:
+    # grupos como texto: a ordem do índice é a alfabética, a mesma da tabela de categorias
+    linhas = linhas.assign(**{coluna: linhas[coluna].astype(object)})
+    criticos = linhas.dropna(subset=['Critic_Score', 'Critic_Count'])
+    usuarios = linhas.dropna(subset=['User_Score', 'User_Count'])
+    g = linhas.groupby(coluna)
+    return pd.DataFrame({
+        'lancamentos': g.size(),
+        'vendas_total': g['Global_Sales'].sum(),
+        'vendas_media': g['Global_Sales'].mean(),
+        'nota_criticos': (criticos['Critic_Score'] * criticos['Critic_Count']).groupby(criticos[coluna])
+        .sum() / criticos.groupby(coluna)['Critic_Count'].sum(),
+        'nota_usuarios': (usuarios['User_Score'] * usuarios['User_Count']).groupby(usuarios[coluna])
+        .sum() / usuarios.groupby(coluna)['User_Count'].sum(),
+    })
+
+
+@pytest.mark.parametrize('metrica', ['vendas_total', 'lancamentos', 'vendas_media', 'nota_criticos'])
+def test_ranking_igual_ao_pandas(df, metrica):
+    for filtro in filtros(df, n=3):
+        linhas = df[mascara(df, filtro)]
+        for coluna in GRUPOS:
+            esperado = _metricas_pandas(linhas, coluna)
+            if metrica in ('vendas_media', 'nota_criticos'):
+                esperado = esperado[esperado['lancamentos'] >= MINIMO_LANCAMENTOS]
+            # do maior para o menor; empates pela ordem alfabética (a da tabela de categorias)
+            esperado = esperado[metrica].dropna().sort_index().sort_values(ascending=False, kind='stable')
+            obtido = ranking(VisaoFiltrada(df, filtro), coluna, metrica, k=10)
+            assert list(obtido['posicao']) == list(range(1, len(obtido) + 1))
+            assert list(obtido['grupo']) == list(esperado.index[:10]), (coluna, metrica)
+            assert obtido[metrica].to_numpy() == pytest.approx(esperado.to_numpy()[:10])
+
+
+def test_ranking_de_filtro_vazio(df):
+    assert ranking(VisaoFiltrada(df, filtros(df)[1]), 'Publisher').empty
+
+
+def test_top_k_igual_a_ordenar_tudo():
+    rng = np.random.default_rng(0)
+    valores = rng.integers(0, 20, 500).astype(float)  # muitos empates
+    valores[rng.choice(500, 30, replace=False)] = np.nan
+    elegiveis = rng.random(500) < 0.8
+    validos = np.flatnonzero(elegiveis & ~np.isnan(valores))
+    esperado = validos[np.argsort(-valores[validos], kind='stable')]
+    for k in [0, 1, 7, 50, 1_000]:
+        assert np.array_equal(top_k(valores, k, elegiveis), esperado[:k]), k
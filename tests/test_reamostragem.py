@@ -0,0 +1,83 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from games import reamostragem
+from games.reamostragem import LOTES_MINIMOS, bootstrap, permutacao
+from tests.conftest import filtros, mascara
+
+
+def _p_exato(a: np.ndarray, b: np.ndarray) -> float:
+    # Todas as trocas de rótulos: P(média(a*) − média(b*) ≥ observado)
+    juntos, observado = np.concatenate([a, b]), a.mean() - b.mean()
+    difs = []
+    for i in itertools.combinations(range(len(juntos)), len(a)):
+        m = np.zeros(len(juntos), dtype=bool)
+        m[list(i)] = True
+        difs.append(juntos[m].mean() - juntos[~m].mean())
+    return float(np.mean(np.array(difs) >= observado - 1e-12))
+
+
+def test_permutacao_perto_do_p_exato():
+    a, b = np.array([1.0, 2.0, 3.0, 9.0, 4.0]), np.array([0.0, 1.0, 2.0, 2.5])
+    r = permutacao(a, b, n=40_000, processos=1)
+    assert r.observado == pytest.approx(a.mean() - b.mean())
+    assert r.completa and r.reamostras == 40_000
+    assert r.p == pytest.approx(_p_exato(a, b), abs=5 * r.erro_p + 1e-3)
+
+
+def test_bootstrap_perto_do_bootstrap_ingenuo():
+    rng = np.random.default_rng(1)
+    a, b = rng.lognormal(0.0, 1.0, 300), rng.lognormal(-0.2, 1.0, 200)
+    r = bootstrap(a, b, 'mediana', n=20_000, processos=1, seed=3)
+    assert r.observado == pytest.approx(np.median(a) - np.median(b))
+    # o mesmo intervalo percentil feito linha a linha, com outro gerador
+    g = np.random.default_rng(7)
+    difs = [np.median(g.choice(a, len(a))) - np.median(g.choice(b, len(b))) for _ in range(20_000)]
+    assert r.ic == pytest.approx(tuple(np.quantile(difs, [0.025, 0.975])), abs=0.03)
+    # mesma seed, mesmas reamostras
+    assert bootstrap(a, b, 'mediana', n=20_000, processos=1, seed=3).ic == r.ic
+
+
+def test_vendas_da_base(base):
+    linhas = base[mascara(base, filtros(base)[0])]
+    a, b = (linhas.loc[linhas['Genre'] == g, 'Global_Sales'].to_numpy() for g in ('Action', 'Role-Playing'))
+    r = permutacao(a, b, 'media', n=2_000, processos=1)
+    assert r.observado == pytest.approx(np.nanmean(a) - np.nanmean(b))
+    assert 0 < r.p <= 1
+
+
+def test_orcamento_esgotado_devolve_o_primeiro_lote():
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=50), rng.normal(size=40)
+    n = 100 * LOTES_MINIMOS
+    for metodo in (permutacao, bootstrap):
+        r = metodo(a, b, n=n, orcamento_s=0.0, processos=1, seed=5)
+        assert r.reamostras == n // LOTES_MINIMOS and not r.completa
+    # o prefixo concluído é o mesmo de uma execução completa: as reamostras do primeiro lote não mudam
+    parcial = reamostragem._executar(reamostragem._lote_permutacao, a, b, 'media', n, 5, 0.0, 1)
+    inteiro = reamostragem._executar(reamostragem._lote_permutacao, a, b, 'media', n, 5, None, 1)
+    assert len(inteiro) == n and np.array_equal(parcial, inteiro[:len(parcial)])
+
+
+def test_orcamento_esgotado_no_pool(monkeypatch):
+    # o primeiro lote enviado ao pool é esperado mesmo com o orçamento já esgotado
+    pool, lotes = reamostragem._executar_pool, []
+    monkeypatch.setattr(reamostragem, 'MINIMO_PARALELO', 0)
+    monkeypatch.setattr(reamostragem, '_executar_pool', lambda *args: lotes.append(pool(*args)) or lotes[-1])
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=50), rng.normal(size=40)
+    try:
+        r = permutacao(a, b, n=100 * LOTES_MINIMOS, orcamento_s=0.0, processos=2)
+    finally:
+        reamostragem._descartar_pool()
+    assert len(lotes) == 1 and len(lotes[0]) >= 1
+    assert 1 <= r.reamostras < r.solicitadas and r.reamostras % 100 == 0
+
+
+def test_entradas_invalidas():
+    with pytest.raises(ValueError):
+        permutacao([1.0, 2.0], [1.0], processos=1)
+    with pytest.raises(ValueError):
+        bootstrap([1.0, 2.0, 3.0], [1.0, np.nan, 2.0], n=0, processos=1)